@@ -0,0 +1,64 @@
+"""Micro-benchmark for single-row credit scoring.
+
+Compares the original per-call path (``scaler.transform`` + ``model.predict``)
+with the fast path used by ``CreditScoringModel.predict_credit_score`` and
+checks that both, and ``predict_credit_score`` itself, return the same score.
+The parity tests live in tests/test_ai_models.py.
+
+Run from the project root:  python -m backend.benchmarks.bench_inference
+"""
+import argparse
+import time
+import numpy as np
+
+from ..services.ai_models import CreditScoringModel
+
+SAMPLE_USER = {
+    'monthly_income': 5200, 'monthly_expenses': 3100, 'savings_balance': 12000,
+    'credit_card_balance': 1800, 'credit_card_limit': 8000, 'loan_balance': 15000,
+    'late_payments': 1, 'missed_payments': 0, 'years_experience': 6, 'salary': 62000,
+    'job_stability_score': 0.7, 'housing_status': 'renting', 'monthly_rent': 1400,
+    'mortgage_payment': 0, 'property_value': 0, 'education_level': 'bachelors',
+    'age': 34, 'social_score': 0.6,
+}
+
+def _time_per_call(fn, iterations: int) -> float:
+    """Return the mean wall time of ``fn()`` in microseconds"""
+    for _ in range(min(100, iterations)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    
+    credit_model = CreditScoringModel()
+    credit_model.load_models()
+    features = credit_model._prepare_features(SAMPLE_USER)
+    
+    def legacy():
+        return float(credit_model.model.predict(credit_model.scaler.transform([features]))[0])
+    
+    def fast():
+        return credit_model._score_features(features)
+    
+    # The served score is clipped to 300-850
+    served = credit_model.predict_credit_score(SAMPLE_USER)['credit_score']
+    assert served == float(np.clip(legacy(), 300, 850)), f"score mismatch: {served} != {legacy()}"
+    assert legacy() == fast(), f"score mismatch: {legacy()} != {fast()}"
+    
+    legacy_us = _time_per_call(legacy, args.iterations)
+    fast_us = _time_per_call(fast, args.iterations)
+    
+    print(f"legacy  scaler.transform + model.predict: {legacy_us:9.1f} us/call")
+    print(f"fast    buffer + booster.inplace_predict: {fast_us:9.1f} us/call")
+    print(f"speedup: {legacy_us / fast_us:.1f}x (score {fast():.4f})")
+
+if __name__ == "__main__":
+    import warnings
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark for batch scoring on each CreditScoringModel scoring backend.
+
+Scores the same synthetic applicants through ``score_feature_matrix`` (raw
+batch scoring) and ``predict_credit_scores_batch`` (full predictions with
+explanations, as batch assessment and rescoring use) on the default
+"xgboost" backend, whose multi-threaded inplace_predict is the baseline, the
+in-process "numpy" TreeEnsemble, and the "process" backend with inference
+pools of increasing size. Raw scoring is measured for one large batch and
+for several concurrent callers (as the scoring executor produces under
+load). Every backend's scores are checked against the baseline first.
+Speedup is bounded by the physical cores available.
+
+Run from the project root:  python -m backend.benchmarks.bench_inference_pool
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from ..services.ai_models import EDUCATION_LEVEL_CODES, FEATURE_NAMES, HOUSING_STATUS_CODES, CreditScoringModel
+
+HOUSING_STATUS_LABELS = {code: label for label, code in HOUSING_STATUS_CODES.items()}
+EDUCATION_LEVEL_LABELS = {code: label for label, code in EDUCATION_LEVEL_CODES.items()}
+
+def _rows_per_second(fn: Callable[[], Any], n_rows: int, repeats: int) -> float:
+    """Best-of-``repeats`` throughput of ``fn()``, which scores ``n_rows`` rows"""
+    fn()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return n_rows / best
+
+def _concurrently(score: Callable[[np.ndarray], np.ndarray], batches: List[np.ndarray]) -> Callable[[], None]:
+    def run():
+        with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+            list(executor.map(score, batches))
+    return run
+
+def _load(backend: str, workers: int = 1, slot_rows: int = 4096) -> CreditScoringModel:
+    credit_model = CreditScoringModel()
+    credit_model.scoring_backend = backend
+    credit_model.inference_pool_workers = workers
+    credit_model.inference_pool_slot_rows = slot_rows
+    credit_model.load_models()
+    return credit_model
+
+def _users(features: np.ndarray) -> List[Dict[str, Any]]:
+    """User dicts that prepare back into the given synthetic feature rows"""
+    users = []
+    for row in features:
+        user_data = dict(zip(FEATURE_NAMES, row.tolist()))
+        user_data['housing_status'] = HOUSING_STATUS_LABELS[int(user_data.pop('housing_status_encoded'))]
+        user_data['education_level'] = EDUCATION_LEVEL_LABELS[int(user_data.pop('education_level_encoded'))]
+        users.append(user_data)
+    return users
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000, help="rows per score_feature_matrix call")
+    parser.add_argument("--users", type=int, default=10000, help="users per predict_credit_scores_batch call")
+    parser.add_argument("--callers", type=int, default=4, help="concurrent score_feature_matrix callers")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({w for w in (1, 2, 4, 8, 16, cpu_count) if w <= cpu_count}))
+    parser.add_argument("--slot-rows", type=int, default=4096)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    baseline = _load("xgboost")
+
+    # Realistic inputs: synthetic applicants drawn like the training data, tiled up to --rows
+    synthetic, _ = baseline._generate_synthetic_data()
+    features = np.resize(synthetic[FEATURE_NAMES].to_numpy(dtype=np.float64), (args.rows, len(FEATURE_NAMES)))
+    batches = np.array_split(features, args.callers)
+    users = _users(features[:args.users])
+    expected = baseline.score_feature_matrix(features)
+
+    def measure(credit_model: CreditScoringModel):
+        def predict_users():
+            credit_model.prediction_cache.clear()
+            return credit_model.predict_credit_scores_batch(users)
+        return (
+            _rows_per_second(lambda: credit_model.score_feature_matrix(features), args.rows, args.repeats),
+            _rows_per_second(_concurrently(credit_model.score_feature_matrix, batches), args.rows, args.repeats),
+            _rows_per_second(predict_users, len(users), args.repeats),
+        )
+
+    print(f"{args.rows} rows, {len(users)} users, {cpu_count} CPUs; throughput relative to the xgboost backend")
+    print(f"{'backend':>18} {'one batch':>18} {f'{args.callers} callers':>18} {'predictions':>18}")
+    base = measure(baseline)
+    baseline.close()
+
+    def report(name: str, results):
+        cells = [f"{value:>8.0f} r/s {value / reference:>5.2f}x" for value, reference in zip(results, base)]
+        print(f"{name:>18} " + " ".join(f"{cell:>18}" for cell in cells))
+
+    report("xgboost", base)
+    backends = [("numpy", "numpy", 1)] + [(f"process, {w} workers", "process", w) for w in args.workers]
+    for name, backend, workers in backends:
+        credit_model = _load(backend, workers, args.slot_rows)
+        try:
+            actual = credit_model.score_feature_matrix(features)
+            assert np.allclose(expected, actual, atol=1e-3), f"{name} disagrees with the xgboost backend"
+            predicted = [p['credit_score'] for p in credit_model.predict_credit_scores_batch(users)]
+            assert np.allclose(expected[:len(users)], predicted, atol=1e-3), f"{name} predictions disagree"
+            report(name, measure(credit_model))
+        finally:
+            credit_model.close()
+
+if __name__ == "__main__":
+    main()
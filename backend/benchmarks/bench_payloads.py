@@ -0,0 +1,148 @@
+"""Benchmark for content-addressed assessment payload storage.
+
+Seeds a file-backed SQLite database with assessments whose breakdown,
+recommendations and risk factors come from the scoring model's own
+templates (each user is assessed several times, as repeat assessments and
+rescoring runs do), then measures database size and the assessment listing
+query (select a page, resolve payloads, render with orjson) before and after
+``migrate_payloads``, checking that the listing returns the same documents.
+
+Run from the project root:  python -m backend.benchmarks.bench_payloads
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+import orjson
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from ..database import Base
+from ..models import credit_models
+from ..models.payload_models import AssessmentPayload
+from ..schemas.credit_schemas import CreditAssessmentResponse
+from ..services.ai_models import CONTRIBUTION_COLUMNS, CreditScoringModel
+from ..services.assessment_payloads import database_size_bytes, expand_payloads_sync, migrate_payloads, payload_cache
+from ..utils.serialization import FastJSONResponse, schema_columns, serialize_rows
+
+PAGE_SIZE = 200
+
+def _seed(db, n_users: int, per_user: int):
+    rng = np.random.default_rng(7)
+    credit_model = CreditScoringModel()
+    start = datetime(2020, 1, 1)
+    rows = []
+    for user_id in range(1, n_users + 1):
+        user_data = {
+            'monthly_income': float(rng.integers(2000, 12000)),
+            'monthly_expenses': float(rng.integers(1000, 9000)),
+            'savings_balance': float(rng.integers(0, 50000)),
+            'credit_card_balance': float(rng.integers(0, 8000)),
+            'credit_card_limit': float(rng.integers(1000, 15000)),
+            'late_payments': int(rng.integers(0, 4)),
+            'missed_payments': int(rng.integers(0, 3)),
+            'years_experience': int(rng.integers(0, 30)),
+            'salary': float(rng.integers(25000, 150000)),
+            'job_stability_score': 0.5,
+            'housing_status': str(rng.choice(['renting', 'owning', 'living_with_family'])),
+            'property_value': 0.0,
+            'education_level': str(rng.choice(['high_school', 'bachelors', 'masters'])),
+            'age': int(rng.integers(21, 70)),
+            'social_score': 0.5,
+        }
+        factor_scores = credit_model._calculate_factor_scores(user_data)
+        explanations = credit_model._generate_explanations(user_data, factor_scores)
+        explanations['score_contributions'] = credit_model._contribution_breakdown(rng.normal(0, 15, len(CONTRIBUTION_COLUMNS)))
+        for i in range(per_user):
+            rows.append({
+                'user_id': user_id,
+                'credit_score': 650.0,
+                'risk_category': 'fair',
+                'confidence_score': 0.85,
+                'financial_score': factor_scores['financial'],
+                'career_score': factor_scores['career'],
+                'housing_score': factor_scores['housing'],
+                'social_score': factor_scores['social'],
+                'factor_breakdown': explanations,
+                'recommendations': credit_model._generate_recommendations(user_data, factor_scores),
+                'risk_factors': credit_model._identify_risk_factors(user_data, factor_scores),
+                'assessment_date': start + timedelta(days=i),
+                'model_version': '1.0.0',
+            })
+    for offset in range(0, len(rows), 5000):
+        db.execute(insert(credit_models.CreditAssessment), rows[offset:offset + 5000])
+    db.commit()
+
+def _list_pages(db, user_ids: List[int]) -> List[bytes]:
+    bodies = []
+    for user_id in user_ids:
+        rows = db.execute(
+            select(*schema_columns(CreditAssessmentResponse, credit_models.CreditAssessment)).where(
+                credit_models.CreditAssessment.user_id == user_id
+            ).order_by(credit_models.CreditAssessment.assessment_date.desc()).limit(PAGE_SIZE)
+        ).all()
+        bodies.append(FastJSONResponse(expand_payloads_sync(db, serialize_rows(rows))).body)
+    return bodies
+
+def _best_of(fn, repeats: int) -> float:
+    times: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def _vacuum(engine):
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("VACUUM"))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--per-user", type=int, default=20)
+    parser.add_argument("--list-users", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        Base.metadata.create_all(bind=engine, tables=[
+            credit_models.CreditAssessment.__table__, AssessmentPayload.__table__
+        ])
+        db = sessionmaker(bind=engine)()
+        _seed(db, args.users, args.per_user)
+        _vacuum(engine)
+        list_users = list(range(1, min(args.users, args.list_users) + 1))
+
+        size_before = database_size_bytes(db)
+        before = _list_pages(db, list_users)
+        before_ms = _best_of(lambda: _list_pages(db, list_users), args.repeats)
+
+        start = time.perf_counter()
+        summary = migrate_payloads(db)
+        migrate_s = time.perf_counter() - start
+        _vacuum(engine)
+        size_after = database_size_bytes(db)
+
+        payload_cache.clear()
+        start = time.perf_counter()
+        after = _list_pages(db, list_users)
+        cold_ms = (time.perf_counter() - start) * 1000
+        after_ms = _best_of(lambda: _list_pages(db, list_users), args.repeats)
+        db.close()
+        engine.dispose()
+
+    assert [orjson.loads(body) for body in before] == [orjson.loads(body) for body in after], "listings differ"
+
+    rows = summary['scanned']
+    print(f"{rows} assessments ({args.users} users x {args.per_user}), {summary['payloads']} distinct payloads")
+    print(f"migration: {migrate_s:.1f} s ({rows / migrate_s:.0f} rows/s)")
+    print(f"database size  inline: {size_before / 1e6:8.1f} MB   deduplicated: {size_after / 1e6:8.1f} MB  ({size_before / size_after:.1f}x smaller)")
+    print(f"list {len(list_users)} pages inline: {before_ms:8.1f} ms   deduplicated: {after_ms:8.1f} ms  (cold cache {cold_ms:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
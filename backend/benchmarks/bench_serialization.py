@@ -0,0 +1,98 @@
+"""Benchmark for serializing a long credit assessment history.
+
+Compares the old list-endpoint path (ORM rows -> hand-built
+``CreditAssessmentResponse`` -> FastAPI response_model validation and JSON
+encoding) with the fast path (Core column select -> dicts -> orjson) on an
+in-memory SQLite table, and checks that both produce the same JSON document.
+
+Run from the project root:  python -m backend.benchmarks.bench_serialization
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from typing import List
+
+from ..database import Base
+from ..models import credit_models
+from ..schemas.credit_schemas import CreditAssessmentResponse
+from ..utils.serialization import FastJSONResponse, schema_columns, serialize_rows
+
+def _seed(db, n_rows: int):
+    start = datetime(2020, 1, 1)
+    db.execute(insert(credit_models.CreditAssessment), [
+        {
+            'user_id': 1,
+            'credit_score': 600 + (i % 250),
+            'risk_category': 'good',
+            'confidence_score': 0.85,
+            'financial_score': 71.5,
+            'career_score': 64.0,
+            'housing_score': 55.25,
+            'social_score': 60.0,
+            'factor_breakdown': {'financial_health': 71.5, 'career_stability': 64.0, 'housing_stability': 55.25},
+            'recommendations': ['Reduce credit card utilization', 'Build emergency savings'],
+            'risk_factors': ['High credit utilization'],
+            'assessment_date': start + timedelta(hours=i),
+            'model_version': '1.0.0',
+        }
+        for i in range(n_rows)
+    ])
+    db.commit()
+
+def _legacy(db) -> bytes:
+    assessments = db.query(credit_models.CreditAssessment).filter(
+        credit_models.CreditAssessment.user_id == 1
+    ).order_by(credit_models.CreditAssessment.assessment_date.desc()).all()
+    items = [
+        CreditAssessmentResponse(**{name: getattr(a, name) for name in CreditAssessmentResponse.model_fields})
+        for a in assessments
+    ]
+    # What FastAPI does with a response_model: validate, dump, then encode
+    validated = [CreditAssessmentResponse.model_validate(item) for item in items]
+    content = jsonable_encoder([item.model_dump(mode='json') for item in validated])
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+def _fast(db) -> bytes:
+    rows = db.execute(
+        select(*schema_columns(CreditAssessmentResponse, credit_models.CreditAssessment)).where(
+            credit_models.CreditAssessment.user_id == 1
+        ).order_by(credit_models.CreditAssessment.assessment_date.desc())
+    ).all()
+    return FastJSONResponse(serialize_rows(rows)).body
+
+def _best_of(fn, repeats: int) -> float:
+    times: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    _seed(db, args.rows)
+
+    assert json.loads(_legacy(db)) == json.loads(_fast(db)), "serialized payloads differ"
+
+    legacy_ms = _best_of(lambda: (_legacy(db), db.expunge_all()), args.repeats)
+    fast_ms = _best_of(lambda: _fast(db), args.repeats)
+
+    print(f"{args.rows} assessment rows")
+    print(f"legacy  ORM + Pydantic response_model: {legacy_ms:8.1f} ms  ({args.rows / legacy_ms * 1000:10.0f} rows/s)")
+    print(f"fast    Core columns + orjson:         {fast_ms:8.1f} ms  ({args.rows / fast_ms * 1000:10.0f} rows/s)")
+    print(f"speedup: {legacy_ms / fast_ms:.1f}x")
+
+if __name__ == "__main__":
+    main()
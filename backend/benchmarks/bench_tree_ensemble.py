@@ -0,0 +1,65 @@
+"""Benchmark and parity check for the array-backed TreeEnsemble scorer.
+
+Exports the trained booster, memory-maps the export, checks it against
+``model.predict`` and times both at several batch sizes.
+
+Run from the project root:  python -m backend.benchmarks.bench_tree_ensemble
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+from ..services.ai_models import CreditScoringModel
+from ..services.tree_ensemble import TreeEnsemble
+
+# Scores are float32 sums of 100 leaves around ~700, so allow a few ULPs
+PARITY_TOLERANCE = 1e-3
+
+def _time_per_call(fn, iterations: int) -> float:
+    """Return the mean wall time of ``fn()`` in microseconds"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 10000])
+    parser.add_argument("--rows", type=int, default=10000, help="rows used for the parity check")
+    args = parser.parse_args()
+    
+    credit_model = CreditScoringModel()
+    credit_model.load_models()
+    
+    # Realistic inputs: scaled synthetic applicants drawn like the training data
+    features, _ = credit_model._generate_synthetic_data()
+    features_scaled = credit_model.scaler.transform(features.iloc[:max(args.rows, max(args.batch_sizes))])
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "credit_model_trees.npy")
+        TreeEnsemble.from_booster(credit_model.model.get_booster()).save(path)
+        tree_ensemble = TreeEnsemble.load(path, mmap=True)
+        
+        expected = credit_model.model.predict(features_scaled[:args.rows])
+        actual = tree_ensemble.predict(features_scaled[:args.rows])
+        max_error = float(np.max(np.abs(expected - actual)))
+        assert max_error <= PARITY_TOLERANCE, f"parity check failed: max |diff| = {max_error}"
+        print(f"parity: {args.rows} rows, max |diff| = {max_error:.2e}")
+        print(f"trees: {tree_ensemble.n_trees}, depth: {tree_ensemble.max_depth}, "
+              f"table: {tree_ensemble.table.nbytes / 1024:.0f} KiB (memory-mapped)")
+        print(f"{'batch':>8} {'model.predict':>16} {'inplace_predict':>16} {'TreeEnsemble':>16}")
+        
+        booster = credit_model.model.get_booster()
+        for batch_size in args.batch_sizes:
+            batch = features_scaled[:batch_size]
+            iterations = max(5, 20000 // batch_size)
+            sklearn_us = _time_per_call(lambda: credit_model.model.predict(batch), iterations)
+            inplace_us = _time_per_call(lambda: booster.inplace_predict(batch), iterations)
+            ensemble_us = _time_per_call(lambda: tree_ensemble.predict(batch), iterations)
+            print(f"{batch_size:>8} {sklearn_us:>13.1f} us {inplace_us:>13.1f} us {ensemble_us:>13.1f} us")
+
+if __name__ == "__main__":
+    main()
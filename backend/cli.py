@@ -0,0 +1,194 @@
+"""Command line entry points for the AI Credit Assessment backend.
+
+Run from the project root, e.g.:
+
+    python -m backend.cli build-models
+    python -m backend.cli import-time --budget-ms 1500
+    python -m backend.cli rebuild-rollups
+    python -m backend.cli rebuild-features
+    python -m backend.cli rescore --model-version 1.1.0 --workers 4
+    python -m backend.cli migrate-payloads --vacuum
+"""
+import argparse
+import logging
+import os
+import sys
+
+logger = logging.getLogger("ai_credit_assessment.cli")
+
+def build_models(args) -> int:
+    """Train (or reuse) the model artifacts, then validate them from disk"""
+    from .services.ai_models import CreditScoringModel
+    
+    if args.models_dir:
+        os.environ["MODELS_DIR"] = args.models_dir
+    
+    credit_model = CreditScoringModel()
+    model_path = os.path.join(credit_model.models_dir, "credit_model.pkl")
+    scaler_path = os.path.join(credit_model.models_dir, "scaler.pkl")
+    
+    if args.force or not (os.path.exists(model_path) and os.path.exists(scaler_path)):
+        logger.info(f"Training model artifacts into {credit_model.models_dir}")
+        credit_model._train_models()
+    else:
+        logger.info(f"Reusing existing model artifacts in {credit_model.models_dir}")
+        credit_model.load_models(train_if_missing=False)
+    
+    credit_model.export_tree_ensemble()
+    
+    # Validate exactly what the server will load: artifacts only, never retrain
+    loaded = CreditScoringModel()
+    loaded.load_models(train_if_missing=False)
+    score = loaded.warm_up()
+    
+    expected = credit_model.warm_up()
+    if abs(score - expected) > 1e-6:
+        logger.error(f"Validation failed: loaded model scored {score:.4f}, trained model {expected:.4f}")
+        return 1
+    
+    logger.info(f"Model artifacts validated (warm-up score {score:.1f}, version {loaded.model_version})")
+    return 0
+
+def import_time(args) -> int:
+    """Report per-module import time and fail when over budget or importing training-only packages"""
+    from .utils.import_time import DEFAULT_FORBIDDEN_MODULES, import_time_report
+    
+    forbidden = DEFAULT_FORBIDDEN_MODULES if args.forbid is None else args.forbid
+    return 0 if import_time_report(args.module, args.budget_ms, forbidden, top=args.top) else 1
+
+def rebuild_rollups(args) -> int:
+    """Recompute the per-user monthly transaction rollups from raw transactions"""
+    from .database import Base, SessionLocal, engine
+    from .models import credit_models
+    from .models.rollup_models import TransactionRollup
+    from .services.transaction_rollups import rebuild_rollups as rebuild
+    
+    Base.metadata.create_all(bind=engine, tables=[TransactionRollup.__table__])
+    db = SessionLocal()
+    try:
+        rows = rebuild(db, user_id=args.user_id)
+    finally:
+        db.close()
+    
+    scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+    logger.info(f"Rebuilt {rows} transaction rollup rows for {scope}")
+    return 0
+
+def rebuild_features(args) -> int:
+    """Materialize every user's feature vector and write the feature store file"""
+    import asyncio
+    from sqlalchemy import select
+    from .database import AsyncSessionLocal, async_engine
+    from .models import user_models
+    from .services.feature_store import feature_store, load_users_data
+    
+    async def rebuild() -> int:
+        feature_store.clear()
+        async with AsyncSessionLocal() as db:
+            user_ids = (await db.execute(select(user_models.UserProfile.user_id))).scalars().all()
+            for start in range(0, len(user_ids), args.batch_size):
+                await load_users_data(db, user_ids[start:start + args.batch_size])
+        await async_engine.dispose()
+        return len(user_ids)
+    
+    count = asyncio.run(rebuild())
+    feature_store.save()
+    logger.info(f"Materialized features for {count} users into {feature_store.path}")
+    return 0
+
+def rescore(args) -> int:
+    """Score every user with the current artifacts and store the assessments under a new model version"""
+    from .services.rescoring import rescore_portfolio
+    
+    summary = rescore_portfolio(
+        args.model_version,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        restart=args.restart,
+        models_dir=args.models_dir
+    )
+    logger.info(
+        f"Rescore {summary['model_version']}: wrote {summary['rows_written']} assessments "
+        f"at {summary['rows_per_second']} rows/s (resumed after user {summary['resumed_from']})"
+    )
+    return 0
+
+def migrate_payloads(args) -> int:
+    """Deduplicate the JSON payloads of existing assessments into assessment_payloads"""
+    from sqlalchemy import text
+    from .database import Base, SessionLocal, engine
+    from .models.payload_models import AssessmentPayload
+    from .services.assessment_payloads import database_size_bytes, migrate_payloads as migrate
+    
+    Base.metadata.create_all(bind=engine, tables=[AssessmentPayload.__table__])
+    db = SessionLocal()
+    try:
+        size_before = database_size_bytes(db)
+        summary = migrate(db, batch_size=args.batch_size)
+        if args.vacuum:
+            # Freed pages only leave the file once the database is rewritten
+            db.commit()
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.execute(text("VACUUM"))
+        size_after = database_size_bytes(db)
+    finally:
+        db.close()
+    
+    logger.info(
+        f"Compacted {summary['updated']} of {summary['scanned']} assessments "
+        f"into {summary['payloads']} distinct payloads"
+    )
+    if size_before is not None:
+        logger.info(f"Database size: {size_before / 1e6:.1f} MB before, {size_after / 1e6:.1f} MB after")
+    return 0
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    parser = argparse.ArgumentParser(prog="python -m backend.cli", description="AI Credit Assessment backend tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    build = subparsers.add_parser("build-models", help="build and validate model artifacts ahead of time")
+    build.add_argument("--models-dir", help="artifact directory (default: $MODELS_DIR or ./models)")
+    build.add_argument("--force", action="store_true", help="retrain even if artifacts already exist")
+    build.set_defaults(func=build_models)
+    
+    timing = subparsers.add_parser("import-time", help="check cold-start import time against a budget")
+    timing.add_argument("--module", default="backend.main")
+    timing.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500")))
+    timing.add_argument("--forbid", nargs="*", help="modules that must not be imported (default: training/analysis packages)")
+    timing.add_argument("--top", type=int, default=15)
+    timing.set_defaults(func=import_time)
+    
+    rollups = subparsers.add_parser("rebuild-rollups", help="recompute transaction rollups from scratch")
+    rollups.add_argument("--user-id", type=int, help="only rebuild this user's rollups")
+    rollups.set_defaults(func=rebuild_rollups)
+    
+    features = subparsers.add_parser(
+        "rebuild-features",
+        help="rebuild the persisted feature store that API workers load at startup (its only writer)"
+    )
+    features.add_argument("--batch-size", type=int, default=1000)
+    features.set_defaults(func=rebuild_features)
+    
+    rescoring = subparsers.add_parser(
+        "rescore",
+        help="rescore the whole portfolio in resumable chunks (rerun the same command to resume)"
+    )
+    rescoring.add_argument("--model-version", required=True, help="model_version recorded on the new assessments and checkpoint")
+    rescoring.add_argument("--models-dir", help="artifact directory (default: $MODELS_DIR or ./models)")
+    rescoring.add_argument("--chunk-size", type=int, default=1000)
+    rescoring.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="scoring processes (0 scores in-process)")
+    rescoring.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and rescore everyone")
+    rescoring.set_defaults(func=rescore)
+    
+    payloads = subparsers.add_parser("migrate-payloads", help="move repeated assessment JSON into the payload table")
+    payloads.add_argument("--batch-size", type=int, default=1000)
+    payloads.add_argument("--vacuum", action="store_true", help="VACUUM afterwards so freed space is returned to the filesystem")
+    payloads.set_defaults(func=migrate_payloads)
+    
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
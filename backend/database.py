@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
 from dotenv import load_dotenv
 
@@ -15,9 +17,58 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 )
 
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL so readers don't block the writer, and one fsync per checkpoint rather than per commit"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')}")
+    cursor.execute(f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))}")
+    cursor.execute(f"PRAGMA busy_timeout={int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+if DATABASE_URL.startswith("sqlite"):
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _async_database_url(url: str) -> str:
+    """Map a sync database URL to its async driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_database_url(DATABASE_URL))
+
+def _async_engine_options(url: str) -> dict:
+    """Explicit pool sizing; in-memory SQLite keeps its single static connection"""
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {}
+    return {
+        # aiosqlite would otherwise default to NullPool and reconnect per request
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
+# Create async engine and session factory for async route handlers
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_engine_options(ASYNC_DATABASE_URL))
+
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Create Base class
 Base = declarative_base()
 
@@ -28,3 +79,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,39 @@
+from sqlalchemy import Index
+from sqlalchemy.engine import Engine
+import logging
+
+from .models import credit_models
+
+logger = logging.getLogger(__name__)
+
+# Composite indexes backing the keyset-paginated per-user listings: each one
+# matches the listing's (user_id, sort column, id) order so a page is a single
+# index range scan no matter how deep the cursor is.
+LISTING_INDEXES = [
+    Index(
+        "ix_credit_assessments_user_date_id",
+        credit_models.CreditAssessment.user_id,
+        credit_models.CreditAssessment.assessment_date,
+        credit_models.CreditAssessment.id
+    ),
+    Index(
+        "ix_transactions_user_date_id",
+        credit_models.Transaction.user_id,
+        credit_models.Transaction.transaction_date,
+        credit_models.Transaction.id
+    ),
+    Index(
+        "ix_simulations_user_created_id",
+        credit_models.Simulation.user_id,
+        credit_models.Simulation.created_at,
+        credit_models.Simulation.id
+    ),
+]
+
+def ensure_indexes(engine: Engine):
+    """Create any listing index missing from an existing database"""
+    for index in LISTING_INDEXES:
+        try:
+            index.create(bind=engine, checkfirst=True)
+        except Exception as e:
+            logger.error(f"Could not create index {index.name}: {e}")
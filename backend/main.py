@@ -1,15 +1,22 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-import uvicorn
+import asyncio
 import os
 from dotenv import load_dotenv
 
-from .database import engine, Base
-from .models import credit_models, user_models
+from .database import engine, async_engine, Base
+from .models import credit_models, user_models, rollup_models, job_models, payload_models
+from .indexes import ensure_indexes
 from .routers import credit, users, simulation, recommendations
-from .services.ai_models import CreditScoringModel
+from .services.feature_store import FEATURE_STORE_ENABLED, feature_store
+from .services.micro_batcher import MICRO_BATCH_ENABLED, micro_batcher
+from .services.model_registry import model_registry
+from .services.monte_carlo import monte_carlo_pool
+from .services.write_behind import WRITE_BEHIND_ENABLED, assessment_writer
+from .utils.executor import scoring_executor
 from .utils.logger import setup_logger
 
 # Load environment variables
@@ -25,19 +32,52 @@ async def lifespan(app: FastAPI):
     
     # Create database tables
     Base.metadata.create_all(bind=engine)
+    ensure_indexes(engine)
     
-    # Initialize AI models
-    try:
-        credit_model = CreditScoringModel()
-        credit_model.load_models()
-        logger.info("AI models loaded successfully")
-    except Exception as e:
-        logger.error(f"Failed to load AI models: {e}")
+    # Start from the vectors written by rebuild-features; stale rows are rebuilt on read
+    if FEATURE_STORE_ENABLED:
+        feature_store.load()
+    
+    # Initialize AI models once for the whole process. In "background" mode the
+    # server starts accepting requests immediately and /ready flips once the
+    # model is loaded and warmed up; "eager" blocks startup until then.
+    model_loading = os.getenv("MODEL_LOADING", "background")
+    train_if_missing = os.getenv("MODEL_TRAIN_IF_MISSING", "true").lower() == "true"
+    model_loader = None
+    
+    if model_loading == "eager":
+        _load_models(train_if_missing)
+    else:
+        model_loader = asyncio.create_task(asyncio.to_thread(_load_models, train_if_missing))
+    
+    # Group-commit assessment and simulation inserts when enabled
+    if WRITE_BEHIND_ENABLED:
+        assessment_writer.start()
+    
+    # Coalesce concurrent single-user predictions into batched model calls when enabled
+    if MICRO_BATCH_ENABLED:
+        micro_batcher.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down AI Credit Assessment Platform...")
+    if model_loader is not None and not model_loader.done():
+        logger.info("Model loading still in progress at shutdown")
+    await micro_batcher.stop()
+    await assessment_writer.stop()
+    scoring_executor.shutdown()
+    monte_carlo_pool.shutdown()
+    if model_registry.model is not None:
+        model_registry.model.close()
+    await async_engine.dispose()
+
+def _load_models(train_if_missing: bool):
+    try:
+        model_registry.load(train_if_missing=train_if_missing)
+        logger.info("AI models loaded successfully")
+    except Exception as e:
+        logger.error(f"Failed to load AI models: {e}")
 
 # Create FastAPI app
 app = FastAPI(
@@ -62,11 +102,35 @@ app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
 app.include_router(simulation.router, prefix="/api/v1/simulation", tags=["Simulation"])
 app.include_router(recommendations.router, prefix="/api/v1/recommendations", tags=["Recommendations"])
 
-# Health check endpoint
+# Health check endpoint (liveness)
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "AI Credit Assessment Platform"}
 
+# Readiness endpoint: 503 until the model is loaded and warmed up
+@app.get("/ready")
+async def readiness_check():
+    model_status = model_registry.status()
+    if not model_status["ready"]:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "not_ready", **model_status}
+        )
+    return {"status": "ready", **model_status}
+
+# Runtime metrics for tuning caches and inference
+@app.get("/metrics")
+async def metrics():
+    credit_model = model_registry.model
+    return {
+        "model_version": credit_model.model_version if credit_model else None,
+        "prediction_cache": credit_model.prediction_cache.stats() if credit_model else None,
+        "scoring_executor": scoring_executor.stats(),
+        "micro_batcher": micro_batcher.stats(),
+        "write_behind": assessment_writer.stats(),
+        "feature_store": feature_store.stats(),
+    }
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -78,6 +142,8 @@ async def root():
     }
 
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
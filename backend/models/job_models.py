@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from ..database import Base
+
+class RescoreCheckpoint(Base):
+    """Progress of a portfolio rescoring run, committed with each chunk of assessments"""
+    __tablename__ = "rescore_checkpoints"
+
+    model_version = Column(String, primary_key=True)
+    last_user_id = Column(Integer, nullable=False, default=0)
+    rows_written = Column(Integer, nullable=False, default=0)
+    status = Column(String, nullable=False, default="running")  # running / completed
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
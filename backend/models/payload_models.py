@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy.sql import func
+from ..database import Base
+
+class AssessmentPayload(Base):
+    """Content-addressed JSON payload shared by every assessment that references its hash"""
+    __tablename__ = "assessment_payloads"
+
+    hash = Column(String, primary_key=True)
+    payload = Column(Text, nullable=False)  # JSON text
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from ..database import Base
+
+class TransactionRollup(Base):
+    """Running totals of a user's transactions per month, type and category"""
+    __tablename__ = "transaction_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "month", "transaction_type", "category", name="uq_transaction_rollups_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    month = Column(String(7), nullable=False)  # YYYY-MM
+    transaction_type = Column(String, nullable=False)
+    category = Column(String, nullable=False)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,91 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from datetime import datetime
 import logging
 
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..schemas.credit_schemas import (
-    CreditAssessmentRequest, CreditAssessmentResponse,
-    TransactionCreate, TransactionResponse,
+    CreditAssessmentRequest, CreditAssessmentResponse, CreditAssessmentPage,
+    BatchCreditAssessmentRequest, BatchCreditAssessmentResponse,
+    ModelReloadRequest, ModelReloadResponse,
+    TransactionCreate, TransactionResponse, TransactionPage, TransactionIngestResponse,
     UserProfileCreate, UserProfileResponse
 )
 from ..services.ai_models import CreditScoringModel
+from ..services.assessment_payloads import compact_assessments, expand_payloads
+from ..services.micro_batcher import predict_credit_score
+from ..services.model_registry import get_credit_model, model_registry
+from ..services.transaction_ingest import ingest_format, ingest_transactions
+from ..services.feature_store import feature_store, load_users_data
+from ..services.transaction_rollups import apply_rollups
+from ..services.write_behind import save_row
 from ..models import credit_models, user_models
+from ..utils.admin import require_admin_token
+from ..utils.executor import run_blocking
 from ..utils.logger import setup_logger
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page_query, page, split_page
+from ..utils.serialization import FastJSONResponse, schema_columns, serialize_row, serialize_rows
 
 logger = setup_logger(__name__)
 router = APIRouter()
 
-# Initialize AI model
-credit_model = CreditScoringModel()
-
 @router.post("/assess", response_model=CreditAssessmentResponse)
 async def assess_credit(
     request: CreditAssessmentRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    credit_model: CreditScoringModel = Depends(get_credit_model)
 ):
     """Perform credit assessment for a user"""
     try:
         logger.info(f"Starting credit assessment for user {request.user_id}")
         
-        # Get user profile
-        user_profile = db.query(user_models.UserProfile).filter(
-            user_models.UserProfile.user_id == request.user_id
-        ).first()
+        # Materialized features for the user (profile, credit history and cash flow)
+        user_data = (await load_users_data(db, [request.user_id])).get(request.user_id)
         
-        if not user_profile:
+        if user_data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User profile not found"
             )
         
-        # Get user's credit history
-        credit_history = db.query(credit_models.CreditHistory).filter(
-            credit_models.CreditHistory.user_id == request.user_id
-        ).first()
-        
-        # Prepare user data for AI model
-        user_data = {
-            'monthly_income': user_profile.monthly_income or 0,
-            'monthly_expenses': user_profile.monthly_expenses or 0,
-            'savings_balance': user_profile.savings_balance or 0,
-            'investment_balance': user_profile.investment_balance or 0,
-            'age': user_profile.age or 30,
-            'education_level': 'bachelors',  # Default for demo
-            'job_title': user_profile.job_title or '',
-            'industry': user_profile.industry or '',
-            'years_experience': user_profile.years_experience or 0,
-            'salary': user_profile.salary or 0,
-            'employment_status': user_profile.employment_status or 'full_time',
-            'housing_status': user_profile.housing_status or 'renting',
-            'monthly_rent': user_profile.monthly_rent or 0,
-            'mortgage_payment': user_profile.mortgage_payment or 0,
-            'property_value': user_profile.property_value or 0,
-            'job_stability_score': 0.7,  # Default for demo
-            'social_score': 0.6,  # Default for demo
-        }
-        
-        # Add credit history data if available
-        if credit_history:
-            user_data.update({
-                'credit_card_balance': credit_history.credit_card_balance or 0,
-                'credit_card_limit': credit_history.credit_card_limit or 1,
-                'loan_balance': credit_history.loan_balance or 0,
-                'late_payments': credit_history.late_payments or 0,
-                'missed_payments': credit_history.missed_payments or 0,
-            })
-        else:
-            # Default credit values
-            user_data.update({
-                'credit_card_balance': 0,
-                'credit_card_limit': 5000,
-                'loan_balance': 0,
-                'late_payments': 0,
-                'missed_payments': 0,
-            })
-        
-        # Get AI prediction
-        prediction = credit_model.predict_credit_score(user_data)
+        # Get AI prediction off the event loop
+        prediction = await predict_credit_score(credit_model, user_data, request.include_score_contributions)
         
         # Save assessment to database
         assessment = credit_models.CreditAssessment(
@@ -103,29 +70,18 @@ async def assess_credit(
             model_version=prediction['model_version']
         )
         
-        db.add(assessment)
-        db.commit()
-        db.refresh(assessment)
+        assessment = await save_row(db, assessment)
         
         logger.info(f"Credit assessment completed for user {request.user_id}")
         
-        return CreditAssessmentResponse(
-            id=assessment.id,
-            user_id=assessment.user_id,
-            credit_score=assessment.credit_score,
-            risk_category=assessment.risk_category,
-            confidence_score=assessment.confidence_score,
-            financial_score=assessment.financial_score,
-            career_score=assessment.career_score,
-            housing_score=assessment.housing_score,
-            social_score=assessment.social_score,
-            factor_breakdown=assessment.factor_breakdown,
-            recommendations=assessment.recommendations,
-            risk_factors=assessment.risk_factors,
-            assessment_date=assessment.assessment_date,
-            model_version=assessment.model_version
-        )
+        # Payloads are stored by reference; answer with the full documents
+        response = serialize_row(assessment, CreditAssessmentResponse)
+        await expand_payloads(db, [response])
+        
+        return FastJSONResponse(response)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in credit assessment: {e}")
         raise HTTPException(
@@ -133,37 +89,128 @@ async def assess_credit(
             detail=f"Error performing credit assessment: {str(e)}"
         )
 
-@router.get("/assessments/{user_id}", response_model=List[CreditAssessmentResponse])
+@router.post("/assess/batch", response_model=BatchCreditAssessmentResponse)
+async def assess_credit_batch(
+    request: BatchCreditAssessmentRequest,
+    db: AsyncSession = Depends(get_async_db),
+    credit_model: CreditScoringModel = Depends(get_credit_model)
+):
+    """Perform credit assessments for many users with one batched model call"""
+    try:
+        user_ids = list(dict.fromkeys(request.user_ids))
+        logger.info(f"Starting batch credit assessment for {len(user_ids)} users")
+        
+        # Feature-store hits need no queries; misses are loaded together in one pass
+        users_data = await load_users_data(db, user_ids)
+        
+        found_user_ids = [user_id for user_id in user_ids if user_id in users_data]
+        missing_user_ids = [user_id for user_id in user_ids if user_id not in users_data]
+        
+        # Get AI predictions for the whole batch off the event loop
+        predictions = await run_blocking(
+            credit_model.predict_credit_scores_batch,
+            [users_data[user_id] for user_id in found_user_ids],
+            request.include_score_contributions
+        )
+        
+        # Save all assessments in one bulk insert
+        assessments = [
+            credit_models.CreditAssessment(
+                user_id=user_id,
+                credit_score=prediction['credit_score'],
+                risk_category=prediction['risk_category'],
+                confidence_score=prediction['confidence_score'],
+                financial_score=prediction['financial_score'],
+                career_score=prediction['career_score'],
+                housing_score=prediction['housing_score'],
+                social_score=prediction['social_score'],
+                factor_breakdown=prediction['factor_breakdown'],
+                recommendations=prediction['recommendations'],
+                risk_factors=prediction['risk_factors'],
+                model_version=prediction['model_version']
+            )
+            for user_id, prediction in zip(found_user_ids, predictions)
+        ]
+        
+        await compact_assessments(db, assessments)
+        db.add_all(assessments)
+        await db.flush()
+        assessment_ids = [assessment.id for assessment in assessments]
+        await db.commit()
+        
+        # Load server-generated columns with a single query instead of one refresh per row
+        saved = {
+            assessment.id: assessment
+            for assessment in (await db.execute(
+                select(credit_models.CreditAssessment).where(
+                    credit_models.CreditAssessment.id.in_(assessment_ids)
+                ).execution_options(populate_existing=True)
+            )).scalars().all()
+        }
+        
+        logger.info(f"Batch credit assessment completed for {len(assessment_ids)} users")
+        
+        return FastJSONResponse({
+            "assessments": await expand_payloads(db, [
+                serialize_row(saved[assessment_id], CreditAssessmentResponse)
+                for assessment_id in assessment_ids
+            ]),
+            "missing_user_ids": missing_user_ids
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch credit assessment: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error performing batch credit assessment: {str(e)}"
+        )
+
+@router.post("/model/reload", response_model=ModelReloadResponse, dependencies=[Depends(require_admin_token)])
+def reload_model(request: ModelReloadRequest):
+    """Hot-reload the credit model artifacts without interrupting in-flight requests"""
+    try:
+        credit_model = model_registry.reload(model_version=request.model_version)
+        return ModelReloadResponse(
+            model_version=credit_model.model_version,
+            reloaded_at=datetime.utcnow()
+        )
+        
+    except Exception as e:
+        logger.error(f"Error reloading credit model: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error reloading credit model: {str(e)}"
+        )
+
+@router.get("/assessments/{user_id}", response_model=CreditAssessmentPage)
 async def get_user_assessments(
     user_id: int,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all credit assessments for a user"""
+    """Get a user's credit assessments, newest first, one page at a time"""
     try:
-        assessments = db.query(credit_models.CreditAssessment).filter(
-            credit_models.CreditAssessment.user_id == user_id
-        ).order_by(credit_models.CreditAssessment.assessment_date.desc()).all()
-        
-        return [
-            CreditAssessmentResponse(
-                id=assessment.id,
-                user_id=assessment.user_id,
-                credit_score=assessment.credit_score,
-                risk_category=assessment.risk_category,
-                confidence_score=assessment.confidence_score,
-                financial_score=assessment.financial_score,
-                career_score=assessment.career_score,
-                housing_score=assessment.housing_score,
-                social_score=assessment.social_score,
-                factor_breakdown=assessment.factor_breakdown,
-                recommendations=assessment.recommendations,
-                risk_factors=assessment.risk_factors,
-                assessment_date=assessment.assessment_date,
-                model_version=assessment.model_version
+        rows = (await db.execute(
+            keyset_page_query(
+                select(*schema_columns(CreditAssessmentResponse, credit_models.CreditAssessment)).where(
+                    credit_models.CreditAssessment.user_id == user_id
+                ),
+                credit_models.CreditAssessment,
+                credit_models.CreditAssessment.assessment_date,
+                cursor,
+                limit
             )
-            for assessment in assessments
-        ]
+        )).all()
+        rows, next_cursor = split_page(rows, limit, credit_models.CreditAssessment.assessment_date)
+        items = await expand_payloads(db, serialize_rows(rows))
+
+        return FastJSONResponse(page(items, next_cursor))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting user assessments: {e}")
         raise HTTPException(
@@ -177,6 +224,12 @@ async def create_transaction(
     db: Session = Depends(get_db)
 ):
     """Create a new transaction"""
+    return await run_blocking(_create_transaction, transaction, db)
+
+def _create_transaction(
+    transaction: TransactionCreate,
+    db: Session
+):
     try:
         db_transaction = credit_models.Transaction(
             user_id=transaction.user_id,
@@ -189,20 +242,14 @@ async def create_transaction(
         )
         
         db.add(db_transaction)
+        apply_rollups(db, [transaction.model_dump()])
         db.commit()
         db.refresh(db_transaction)
         
-        return TransactionResponse(
-            id=db_transaction.id,
-            user_id=db_transaction.user_id,
-            amount=db_transaction.amount,
-            transaction_type=db_transaction.transaction_type,
-            category=db_transaction.category,
-            description=db_transaction.description,
-            merchant=db_transaction.merchant,
-            transaction_date=db_transaction.transaction_date,
-            created_at=db_transaction.created_at
-        )
+        # New cash flow changes the user's derived features
+        feature_store.invalidate([transaction.user_id])
+        
+        return FastJSONResponse(serialize_row(db_transaction, TransactionResponse))
         
     except Exception as e:
         logger.error(f"Error creating transaction: {e}")
@@ -211,32 +258,64 @@ async def create_transaction(
             detail=f"Error creating transaction: {str(e)}"
         )
 
-@router.get("/transactions/{user_id}", response_model=List[TransactionResponse])
+@router.post("/transactions/bulk", response_model=TransactionIngestResponse)
+async def ingest_transactions_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Bulk-load transactions from a streamed NDJSON or CSV request body"""
+    fmt = ingest_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send transactions as application/x-ndjson or text/csv"
+        )
+    
+    try:
+        summary = await ingest_transactions(request.stream(), fmt, db)
+        
+        logger.info(
+            f"Ingested {summary['inserted']} of {summary['received']} transactions "
+            f"({summary['failed']} rejected)"
+        )
+        
+        return TransactionIngestResponse(**summary)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error ingesting transactions: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error ingesting transactions: {str(e)}"
+        )
+
+@router.get("/transactions/{user_id}", response_model=TransactionPage)
 async def get_user_transactions(
     user_id: int,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all transactions for a user"""
+    """Get a user's transactions, newest first, one page at a time"""
     try:
-        transactions = db.query(credit_models.Transaction).filter(
-            credit_models.Transaction.user_id == user_id
-        ).order_by(credit_models.Transaction.transaction_date.desc()).all()
-        
-        return [
-            TransactionResponse(
-                id=transaction.id,
-                user_id=transaction.user_id,
-                amount=transaction.amount,
-                transaction_type=transaction.transaction_type,
-                category=transaction.category,
-                description=transaction.description,
-                merchant=transaction.merchant,
-                transaction_date=transaction.transaction_date,
-                created_at=transaction.created_at
+        rows = (await db.execute(
+            keyset_page_query(
+                select(*schema_columns(TransactionResponse, credit_models.Transaction)).where(
+                    credit_models.Transaction.user_id == user_id
+                ),
+                credit_models.Transaction,
+                credit_models.Transaction.transaction_date,
+                cursor,
+                limit
             )
-            for transaction in transactions
-        ]
+        )).all()
+        rows, next_cursor = split_page(rows, limit, credit_models.Transaction.transaction_date)
         
+        return FastJSONResponse(page(serialize_rows(rows), next_cursor))
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting user transactions: {e}")
         raise HTTPException(
@@ -250,6 +329,12 @@ async def create_user_profile(
     db: Session = Depends(get_db)
 ):
     """Create or update user profile"""
+    return await run_blocking(_create_user_profile, profile, db)
+
+def _create_user_profile(
+    profile: UserProfileCreate,
+    db: Session
+):
     try:
         # Check if profile already exists
         existing_profile = db.query(user_models.UserProfile).filter(
@@ -269,28 +354,10 @@ async def create_user_profile(
         db.commit()
         db.refresh(db_profile)
         
-        return UserProfileResponse(
-            id=db_profile.id,
-            user_id=db_profile.user_id,
-            age=db_profile.age,
-            education_level=db_profile.education_level,
-            degree_field=db_profile.degree_field,
-            job_title=db_profile.job_title,
-            industry=db_profile.industry,
-            years_experience=db_profile.years_experience,
-            salary=db_profile.salary,
-            employment_status=db_profile.employment_status,
-            housing_status=db_profile.housing_status,
-            monthly_rent=db_profile.monthly_rent,
-            mortgage_payment=db_profile.mortgage_payment,
-            property_value=db_profile.property_value,
-            monthly_income=db_profile.monthly_income,
-            monthly_expenses=db_profile.monthly_expenses,
-            savings_balance=db_profile.savings_balance,
-            investment_balance=db_profile.investment_balance,
-            created_at=db_profile.created_at,
-            updated_at=db_profile.updated_at
-        )
+        # Re-materialize the user's features on their next assessment
+        feature_store.invalidate([db_profile.user_id])
+        
+        return FastJSONResponse(serialize_row(db_profile, UserProfileResponse))
         
     except Exception as e:
         logger.error(f"Error creating user profile: {e}")
@@ -305,6 +372,12 @@ async def get_user_profile(
     db: Session = Depends(get_db)
 ):
     """Get user profile"""
+    return await run_blocking(_get_user_profile, user_id, db)
+
+def _get_user_profile(
+    user_id: int,
+    db: Session
+):
     try:
         profile = db.query(user_models.UserProfile).filter(
             user_models.UserProfile.user_id == user_id
@@ -316,28 +389,7 @@ async def get_user_profile(
                 detail="User profile not found"
             )
         
-        return UserProfileResponse(
-            id=profile.id,
-            user_id=profile.user_id,
-            age=profile.age,
-            education_level=profile.education_level,
-            degree_field=profile.degree_field,
-            job_title=profile.job_title,
-            industry=profile.industry,
-            years_experience=profile.years_experience,
-            salary=profile.salary,
-            employment_status=profile.employment_status,
-            housing_status=profile.housing_status,
-            monthly_rent=profile.monthly_rent,
-            mortgage_payment=profile.mortgage_payment,
-            property_value=profile.property_value,
-            monthly_income=profile.monthly_income,
-            monthly_expenses=profile.monthly_expenses,
-            savings_balance=profile.savings_balance,
-            investment_balance=profile.investment_balance,
-            created_at=profile.created_at,
-            updated_at=profile.updated_at
-        )
+        return FastJSONResponse(serialize_row(profile, UserProfileResponse))
         
     except HTTPException:
         raise
@@ -1,11 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any, Optional
 import logging
 
-from ..database import get_db
+import numpy as np
+
+from ..database import get_async_db
 from ..models import credit_models, user_models
+from ..schemas.credit_schemas import CounterfactualResponse, TrajectoryRequest, TrajectoryResponse
+from ..services.ai_models import CreditScoringModel
+from ..services.assessment_payloads import expand_payloads
+from ..services.counterfactuals import (
+    COUNTERFACTUAL_BUDGET_MS, counterfactual_cache, counterfactual_cache_key, search_counterfactual
+)
+from ..services.feature_store import load_users_data
+from ..services.model_registry import get_credit_model
+from ..services.trajectories import TRAJECTORY_ACTIONS, plan_from_changes, project_trajectories
+from ..utils.executor import run_blocking
 from ..utils.logger import setup_logger
+from ..utils.serialization import FastJSONResponse
 
 logger = setup_logger(__name__)
 router = APIRouter()
@@ -13,14 +27,16 @@ router = APIRouter()
 @router.get("/{user_id}")
 async def get_recommendations(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get personalized recommendations for a user"""
     try:
         # Get user's latest assessment
-        assessment = db.query(credit_models.CreditAssessment).filter(
-            credit_models.CreditAssessment.user_id == user_id
-        ).order_by(credit_models.CreditAssessment.assessment_date.desc()).first()
+        assessment = (await db.execute(
+            select(credit_models.CreditAssessment).where(
+                credit_models.CreditAssessment.user_id == user_id
+            ).order_by(credit_models.CreditAssessment.assessment_date.desc())
+        )).scalars().first()
         
         if not assessment:
             raise HTTPException(
@@ -29,9 +45,11 @@ async def get_recommendations(
             )
         
         # Get user profile
-        profile = db.query(user_models.UserProfile).filter(
-            user_models.UserProfile.user_id == user_id
-        ).first()
+        profile = (await db.execute(
+            select(user_models.UserProfile).where(
+                user_models.UserProfile.user_id == user_id
+            )
+        )).scalars().first()
         
         # Generate comprehensive recommendations
         recommendations = {
@@ -131,13 +149,19 @@ async def get_recommendations(
             "Start emergency fund"
         ]
         
+        # Stored payloads may be references into assessment_payloads
+        payloads = (await expand_payloads(db, [{
+            "recommendations": assessment.recommendations,
+            "risk_factors": assessment.risk_factors
+        }]))[0]
+        
         # Add specific recommendations from assessment
-        if assessment.recommendations:
-            recommendations["specific_recommendations"] = assessment.recommendations
+        if payloads["recommendations"]:
+            recommendations["specific_recommendations"] = payloads["recommendations"]
         
         # Add risk factors
-        if assessment.risk_factors:
-            recommendations["risk_factors"] = assessment.risk_factors
+        if payloads["risk_factors"]:
+            recommendations["risk_factors"] = payloads["risk_factors"]
         
         return recommendations
         
@@ -153,14 +177,17 @@ async def get_recommendations(
 @router.get("/{user_id}/improvement-plan")
 async def get_improvement_plan(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    credit_model: CreditScoringModel = Depends(get_credit_model)
 ):
     """Get a detailed improvement plan for the user"""
     try:
         # Get user's latest assessment
-        assessment = db.query(credit_models.CreditAssessment).filter(
-            credit_models.CreditAssessment.user_id == user_id
-        ).order_by(credit_models.CreditAssessment.assessment_date.desc()).first()
+        assessment = (await db.execute(
+            select(credit_models.CreditAssessment).where(
+                credit_models.CreditAssessment.user_id == user_id
+            ).order_by(credit_models.CreditAssessment.assessment_date.desc())
+        )).scalars().first()
         
         if not assessment:
             raise HTTPException(
@@ -182,6 +209,22 @@ async def get_improvement_plan(
             "success_metrics": {}
         }
         
+        # Project the cheapest change set that reaches the target, carried out as a 12-month plan
+        projected_scores = [None] * 12
+        user_data = (await load_users_data(db, [user_id])).get(user_id)
+        if user_data is not None:
+            base_features = np.asarray(CreditScoringModel._prepare_features(user_data), dtype=np.float64)
+            counterfactual, _ = await _counterfactual(credit_model, user_id, base_features, target_score)
+            steps = plan_from_changes(counterfactual["changes"], months=12)
+            projection = await run_blocking(project_trajectories, credit_model, base_features, [steps], 12)
+            projected_scores = np.round(projection["scores"][0], 2).tolist()
+            improvement_plan["projection"] = {
+                "changes": counterfactual["changes"],
+                "steps": steps,
+                "reaches_target": projected_scores[-1] >= target_score,
+                "final_state": projection["final_states"][0],
+            }
+        
         # Monthly goals
         points_per_month = improvement_plan["points_needed"] / 12
         
@@ -190,6 +233,7 @@ async def get_improvement_plan(
             improvement_plan["monthly_goals"].append({
                 "month": month,
                 "target_score": min(target_score, target_monthly_score),
+                "projected_score": projected_scores[month - 1],
                 "focus_areas": get_focus_areas_for_month(month, assessment)
             })
         
@@ -199,6 +243,7 @@ async def get_improvement_plan(
             improvement_plan["quarterly_milestones"].append({
                 "quarter": quarter,
                 "target_score": min(target_score, target_quarterly_score),
+                "projected_score": projected_scores[quarter * 3 - 1],
                 "key_actions": get_quarterly_actions(quarter, assessment)
             })
         
@@ -221,6 +266,116 @@ async def get_improvement_plan(
             detail=f"Error generating improvement plan: {str(e)}"
         )
 
+async def _counterfactual(
+    credit_model: CreditScoringModel,
+    user_id: int,
+    base_features: np.ndarray,
+    target_score: float,
+    budget_ms: float = COUNTERFACTUAL_BUDGET_MS
+):
+    """Cached counterfactual search result and whether it came from the cache"""
+    cache_key = counterfactual_cache_key(credit_model, user_id, base_features, target_score)
+    cached = counterfactual_cache.get(cache_key)
+    if cached is not None:
+        return cached, True
+    
+    search = await run_blocking(search_counterfactual, credit_model, base_features, target_score, budget_ms=budget_ms)
+    result = {"user_id": user_id, "model_version": credit_model.model_version, **search}
+    
+    # A search cut short by its budget may have missed a cheaper answer; let the next request retry
+    if search["complete"]:
+        counterfactual_cache.put(cache_key, result)
+    return result, False
+
+@router.get("/{user_id}/counterfactual", response_model=CounterfactualResponse)
+async def get_counterfactual(
+    user_id: int,
+    target_score: float = Query(750, ge=300, le=850),
+    budget_ms: Optional[float] = Query(None, gt=0, le=2000),
+    db: AsyncSession = Depends(get_async_db),
+    credit_model: CreditScoringModel = Depends(get_credit_model)
+):
+    """Find the least-effort set of actionable changes that reaches the target score"""
+    try:
+        user_data = (await load_users_data(db, [user_id])).get(user_id)
+        
+        if user_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User profile not found"
+            )
+        
+        base_features = np.asarray(CreditScoringModel._prepare_features(user_data), dtype=np.float64)
+        result, cached = await _counterfactual(
+            credit_model, user_id, base_features, target_score, budget_ms or COUNTERFACTUAL_BUDGET_MS
+        )
+        
+        return FastJSONResponse({**result, "cached": cached})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in counterfactual search: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching for counterfactual: {str(e)}"
+        )
+
+@router.post("/{user_id}/trajectory", response_model=TrajectoryResponse)
+async def project_trajectory(
+    user_id: int,
+    request: TrajectoryRequest,
+    db: AsyncSession = Depends(get_async_db),
+    credit_model: CreditScoringModel = Depends(get_credit_model)
+):
+    """Project monthly score curves for alternative action plans, all scored in one batch"""
+    try:
+        invalid = sorted({step.action for plan in request.plans for step in plan.steps} - set(TRAJECTORY_ACTIONS))
+        if invalid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown plan actions: {', '.join(invalid)}; expected among: {', '.join(TRAJECTORY_ACTIONS)}"
+            )
+        
+        user_data = (await load_users_data(db, [user_id])).get(user_id)
+        
+        if user_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User profile not found"
+            )
+        
+        base_features = np.asarray(CreditScoringModel._prepare_features(user_data), dtype=np.float64)
+        plans = [[step.model_dump() for step in plan.steps] for plan in request.plans]
+        projection = await run_blocking(project_trajectories, credit_model, base_features, plans, request.months)
+        
+        current_score = projection["current_score"]
+        return FastJSONResponse({
+            "user_id": user_id,
+            "model_version": credit_model.model_version,
+            "current_score": current_score,
+            "months": list(range(1, request.months + 1)),
+            "plans": [
+                {
+                    "name": plan.name,
+                    "scores": np.round(scores, 2).tolist(),
+                    "final_score": round(float(scores[-1]), 2),
+                    "score_change": round(float(scores[-1] - current_score), 2),
+                    "final_state": final_state,
+                }
+                for plan, scores, final_state in zip(request.plans, projection["scores"], projection["final_states"])
+            ],
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error projecting trajectories: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error projecting trajectories: {str(e)}"
+        )
+
 def get_focus_areas_for_month(month: int, assessment) -> List[str]:
     """Get focus areas for a specific month"""
     if month <= 3:
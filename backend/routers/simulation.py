@@ -1,49 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional
+import asyncio
 import logging
 
-from ..database import get_db
-from ..schemas.credit_schemas import SimulationRequest, SimulationResponse
+import numpy as np
+import orjson
+
+from ..database import get_async_db
+from ..schemas.credit_schemas import (
+    SimulationRequest, SimulationResponse,
+    MultiScenarioRequest, MultiScenarioResponse, ScenarioSpec,
+    SweepRequest, SweepResponse, MonteCarloRequest
+)
 from ..services.ai_models import CreditScoringModel
+from ..services.micro_batcher import predict_credit_score
+from ..services.model_registry import get_credit_model
+from ..services.feature_store import load_users_data
+from ..services.monte_carlo import run_monte_carlo
+from ..services.scenarios import (
+    SCENARIO_TYPES, SWEEP_PARAMETERS, apply_scenario, apply_scenarios, scenario_feature_matrix,
+    scenario_recommendations, sweep_cache, sweep_grid
+)
+from ..services.write_behind import save_row
 from ..models import credit_models, user_models
+from ..utils.executor import run_blocking
 from ..utils.logger import setup_logger
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page_query, page, split_page
+from ..utils.serialization import FastJSONResponse, serialize_row, serialize_rows
 
 logger = setup_logger(__name__)
 router = APIRouter()
 
-# Initialize AI model
-credit_model = CreditScoringModel()
+SIMULATION_HISTORY_COLUMNS = [
+    credit_models.Simulation.id,
+    credit_models.Simulation.scenario_type,
+    credit_models.Simulation.parameters,
+    credit_models.Simulation.original_score,
+    credit_models.Simulation.simulated_score,
+    credit_models.Simulation.score_change,
+    credit_models.Simulation.factor_changes,
+    credit_models.Simulation.recommendations,
+    credit_models.Simulation.created_at,
+]
 
 @router.post("/scenario", response_model=SimulationResponse)
 async def run_simulation(
     request: SimulationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    credit_model: CreditScoringModel = Depends(get_credit_model)
 ):
     """Run a scenario simulation for a user"""
     try:
         logger.info(f"Starting simulation for user {request.user_id}, scenario: {request.scenario_type}")
         
-        # Get user profile
-        user_profile = db.query(user_models.UserProfile).filter(
-            user_models.UserProfile.user_id == request.user_id
-        ).first()
+        # Materialized features for the user (profile, credit history and cash flow)
+        user_data = (await load_users_data(db, [request.user_id])).get(request.user_id)
         
-        if not user_profile:
+        if user_data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User profile not found"
             )
         
-        # Get user's credit history
-        credit_history = db.query(credit_models.CreditHistory).filter(
-            credit_models.CreditHistory.user_id == request.user_id
-        ).first()
-        
         # Get current assessment
-        current_assessment = db.query(credit_models.CreditAssessment).filter(
-            credit_models.CreditAssessment.user_id == request.user_id
-        ).order_by(credit_models.CreditAssessment.assessment_date.desc()).first()
+        current_assessment = (await db.execute(
+            select(credit_models.CreditAssessment).where(
+                credit_models.CreditAssessment.user_id == request.user_id
+            ).order_by(credit_models.CreditAssessment.assessment_date.desc())
+        )).scalars().first()
         
         if not current_assessment:
             raise HTTPException(
@@ -51,101 +79,24 @@ async def run_simulation(
                 detail="No credit assessment found for user"
             )
         
-        # Prepare base user data
-        user_data = {
-            'monthly_income': user_profile.monthly_income or 0,
-            'monthly_expenses': user_profile.monthly_expenses or 0,
-            'savings_balance': user_profile.savings_balance or 0,
-            'investment_balance': user_profile.investment_balance or 0,
-            'age': user_profile.age or 30,
-            'education_level': 'bachelors',
-            'job_title': user_profile.job_title or '',
-            'industry': user_profile.industry or '',
-            'years_experience': user_profile.years_experience or 0,
-            'salary': user_profile.salary or 0,
-            'employment_status': user_profile.employment_status or 'full_time',
-            'housing_status': user_profile.housing_status or 'renting',
-            'monthly_rent': user_profile.monthly_rent or 0,
-            'mortgage_payment': user_profile.mortgage_payment or 0,
-            'property_value': user_profile.property_value or 0,
-            'job_stability_score': 0.7,
-            'social_score': 0.6,
-        }
-        
-        # Add credit history data
-        if credit_history:
-            user_data.update({
-                'credit_card_balance': credit_history.credit_card_balance or 0,
-                'credit_card_limit': credit_history.credit_card_limit or 1,
-                'loan_balance': credit_history.loan_balance or 0,
-                'late_payments': credit_history.late_payments or 0,
-                'missed_payments': credit_history.missed_payments or 0,
-            })
-        else:
-            user_data.update({
-                'credit_card_balance': 0,
-                'credit_card_limit': 5000,
-                'loan_balance': 0,
-                'late_payments': 0,
-                'missed_payments': 0,
-            })
+        # Industry isn't a model feature, so only job changes need it from the profile
+        if request.scenario_type == "job_change":
+            user_data['industry'] = (await db.execute(
+                select(user_models.UserProfile.industry).where(
+                    user_models.UserProfile.user_id == request.user_id
+                )
+            )).scalar() or ''
         
         # Apply scenario modifications
-        modified_data = user_data.copy()
-        factor_changes = {}
-        
-        if request.scenario_type == "salary_increase":
-            salary_increase = request.parameters.get('salary_increase', 0)
-            modified_data['salary'] += salary_increase
-            modified_data['monthly_income'] += salary_increase / 12
-            factor_changes['salary'] = f"+${salary_increase:,.0f}"
-            factor_changes['monthly_income'] = f"+${salary_increase/12:,.0f}"
-            
-        elif request.scenario_type == "job_change":
-            new_salary = request.parameters.get('new_salary', user_data['salary'])
-            new_industry = request.parameters.get('new_industry', user_data['industry'])
-            modified_data['salary'] = new_salary
-            modified_data['monthly_income'] = new_salary / 12
-            modified_data['industry'] = new_industry
-            factor_changes['salary'] = f"${new_salary:,.0f} (was ${user_data['salary']:,.0f})"
-            factor_changes['industry'] = f"{new_industry} (was {user_data['industry']})"
-            
-        elif request.scenario_type == "house_purchase":
-            property_value = request.parameters.get('property_value', 300000)
-            down_payment = request.parameters.get('down_payment', 60000)
-            mortgage_amount = property_value - down_payment
-            monthly_payment = request.parameters.get('monthly_payment', 1500)
-            
-            modified_data['housing_status'] = 'mortgaged'
-            modified_data['property_value'] = property_value
-            modified_data['mortgage_payment'] = monthly_payment
-            modified_data['savings_balance'] -= down_payment
-            
-            factor_changes['housing_status'] = "mortgaged (was renting)"
-            factor_changes['property_value'] = f"${property_value:,.0f}"
-            factor_changes['monthly_expenses'] = f"+${monthly_payment:,.0f} mortgage"
-            factor_changes['savings_balance'] = f"-${down_payment:,.0f} down payment"
-            
-        elif request.scenario_type == "debt_reduction":
-            debt_reduction = request.parameters.get('debt_reduction', 0)
-            modified_data['credit_card_balance'] = max(0, user_data['credit_card_balance'] - debt_reduction)
-            modified_data['savings_balance'] -= debt_reduction
-            factor_changes['credit_card_balance'] = f"-${debt_reduction:,.0f}"
-            factor_changes['savings_balance'] = f"-${debt_reduction:,.0f}"
-            
-        elif request.scenario_type == "expense_reduction":
-            expense_reduction = request.parameters.get('expense_reduction', 0)
-            modified_data['monthly_expenses'] = max(0, user_data['monthly_expenses'] - expense_reduction)
-            factor_changes['monthly_expenses'] = f"-${expense_reduction:,.0f}"
-            
-        else:
+        if request.scenario_type not in SCENARIO_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Unknown scenario type: {request.scenario_type}"
             )
+        modified_data, factor_changes = apply_scenario(user_data, request.scenario_type, request.parameters)
         
         # Get simulated prediction
-        simulated_prediction = credit_model.predict_credit_score(modified_data)
+        simulated_prediction = await predict_credit_score(credit_model, modified_data)
         
         # Calculate score change
         original_score = current_assessment.credit_score
@@ -153,24 +104,7 @@ async def run_simulation(
         score_change = simulated_score - original_score
         
         # Generate recommendations based on simulation
-        recommendations = []
-        if score_change > 0:
-            recommendations.append(f"This scenario would improve your credit score by {score_change:.0f} points")
-        elif score_change < 0:
-            recommendations.append(f"This scenario would decrease your credit score by {abs(score_change):.0f} points")
-        else:
-            recommendations.append("This scenario would have minimal impact on your credit score")
-        
-        # Add scenario-specific recommendations
-        if request.scenario_type == "salary_increase":
-            recommendations.append("Higher income typically improves creditworthiness and borrowing capacity")
-        elif request.scenario_type == "house_purchase":
-            if score_change > 0:
-                recommendations.append("Homeownership can improve credit scores through consistent mortgage payments")
-            else:
-                recommendations.append("Consider the impact of additional debt on your overall financial health")
-        elif request.scenario_type == "debt_reduction":
-            recommendations.append("Reducing debt improves your debt-to-income ratio and credit utilization")
+        recommendations = scenario_recommendations([request.scenario_type], score_change)
         
         # Save simulation to database
         simulation = credit_models.Simulation(
@@ -185,25 +119,11 @@ async def run_simulation(
             model_version=credit_model.model_version
         )
         
-        db.add(simulation)
-        db.commit()
-        db.refresh(simulation)
+        simulation = await save_row(db, simulation)
         
         logger.info(f"Simulation completed for user {request.user_id}")
         
-        return SimulationResponse(
-            id=simulation.id,
-            user_id=simulation.user_id,
-            scenario_type=simulation.scenario_type,
-            parameters=simulation.parameters,
-            original_score=simulation.original_score,
-            simulated_score=simulation.simulated_score,
-            score_change=simulation.score_change,
-            factor_changes=simulation.factor_changes,
-            recommendations=simulation.recommendations,
-            created_at=simulation.created_at,
-            model_version=simulation.model_version
-        )
+        return FastJSONResponse(serialize_row(simulation, SimulationResponse))
         
     except HTTPException:
         raise
@@ -214,32 +134,298 @@ async def run_simulation(
             detail=f"Error running simulation: {str(e)}"
         )
 
+def _scenario_parameters(scenario: ScenarioSpec) -> Dict[str, Any]:
+    """Parameters as stored on a Simulation row; chained scenarios keep every step"""
+    if len(scenario.steps) == 1:
+        return scenario.steps[0].parameters
+    return {"steps": [step.model_dump() for step in scenario.steps]}
+
+@router.post("/scenarios", response_model=MultiScenarioResponse)
+async def run_simulations(
+    request: MultiScenarioRequest,
+    db: AsyncSession = Depends(get_async_db),
+    credit_model: CreditScoringModel = Depends(get_credit_model)
+):
+    """Run several, optionally chained, scenarios for a user with one batched model call"""
+    try:
+        logger.info(f"Starting {len(request.scenarios)} simulations for user {request.user_id}")
+        
+        scenario_types = {step.scenario_type for scenario in request.scenarios for step in scenario.steps}
+        unknown = sorted(scenario_types - set(SCENARIO_TYPES))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown scenario type: {', '.join(unknown)}"
+            )
+        
+        # Base inputs and current assessment are loaded once for every scenario
+        user_data = (await load_users_data(db, [request.user_id])).get(request.user_id)
+        
+        if user_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User profile not found"
+            )
+        
+        current_assessment = (await db.execute(
+            select(credit_models.CreditAssessment.credit_score).where(
+                credit_models.CreditAssessment.user_id == request.user_id
+            ).order_by(credit_models.CreditAssessment.assessment_date.desc()).limit(1)
+        )).first()
+        
+        if not current_assessment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No credit assessment found for user"
+            )
+        
+        if "job_change" in scenario_types:
+            user_data['industry'] = (await db.execute(
+                select(user_models.UserProfile.industry).where(
+                    user_models.UserProfile.user_id == request.user_id
+                )
+            )).scalar() or ''
+        
+        # Every scenario starts from the same base inputs; all of them are scored in one batch
+        applied = [
+            apply_scenarios(user_data, [(step.scenario_type, step.parameters) for step in scenario.steps])
+            for scenario in request.scenarios
+        ]
+        predictions = await run_blocking(
+            credit_model.predict_credit_scores_batch,
+            [modified_data for modified_data, _ in applied]
+        )
+        
+        original_score = current_assessment.credit_score
+        results = []
+        for scenario, (_, factor_changes), prediction in zip(request.scenarios, applied, predictions):
+            steps = [step.scenario_type for step in scenario.steps]
+            score_change = prediction['credit_score'] - original_score
+            results.append({
+                "id": None,
+                "name": scenario.name,
+                "scenario_type": "+".join(steps),
+                "parameters": _scenario_parameters(scenario),
+                "simulated_score": prediction['credit_score'],
+                "score_change": score_change,
+                "factor_changes": factor_changes,
+                "recommendations": scenario_recommendations(steps, score_change),
+                "created_at": None,
+            })
+        
+        if request.persist:
+            # Save every simulation in one bulk insert
+            simulations = [
+                credit_models.Simulation(
+                    user_id=request.user_id,
+                    scenario_type=result["scenario_type"],
+                    parameters=result["parameters"],
+                    original_score=original_score,
+                    simulated_score=result["simulated_score"],
+                    score_change=result["score_change"],
+                    factor_changes=result["factor_changes"],
+                    recommendations=result["recommendations"],
+                    model_version=credit_model.model_version
+                )
+                for result in results
+            ]
+            db.add_all(simulations)
+            await db.flush()
+            simulation_ids = [simulation.id for simulation in simulations]
+            await db.commit()
+            
+            created_at = dict((await db.execute(
+                select(credit_models.Simulation.id, credit_models.Simulation.created_at).where(
+                    credit_models.Simulation.id.in_(simulation_ids)
+                )
+            )).all())
+            for result, simulation_id in zip(results, simulation_ids):
+                result["id"] = simulation_id
+                result["created_at"] = created_at.get(simulation_id)
+        
+        logger.info(f"{len(results)} simulations completed for user {request.user_id}")
+        
+        return FastJSONResponse({
+            "user_id": request.user_id,
+            "original_score": original_score,
+            "model_version": credit_model.model_version,
+            "results": results
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in multi-scenario simulation: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error running simulations: {str(e)}"
+        )
+
+@router.post("/sweep", response_model=SweepResponse)
+async def run_sweep(
+    request: SweepRequest,
+    db: AsyncSession = Depends(get_async_db),
+    credit_model: CreditScoringModel = Depends(get_credit_model)
+):
+    """Score a scenario over a grid of one or two parameters without persisting any rows"""
+    try:
+        sweepable = SWEEP_PARAMETERS.get(request.scenario_type)
+        if sweepable is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown scenario type: {request.scenario_type}"
+            )
+        
+        axis_names = [axis.parameter for axis in request.axes]
+        invalid = [name for name in axis_names + list(request.parameters) if name not in sweepable]
+        if invalid or len(set(axis_names)) != len(axis_names):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{request.scenario_type} sweeps take distinct parameters among: {', '.join(sweepable)}"
+            )
+        
+        user_data = (await load_users_data(db, [request.user_id])).get(request.user_id)
+        
+        if user_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User profile not found"
+            )
+        
+        base_features = np.asarray(CreditScoringModel._prepare_features(user_data), dtype=np.float64)
+        axes = [(axis.parameter, axis.start, axis.stop, axis.steps) for axis in request.axes]
+        
+        # Keyed on the base features too, so a changed profile never serves an old curve
+        cache_key = (
+            request.user_id, credit_model.version_key, request.scenario_type, tuple(axes),
+            tuple(sorted(request.parameters.items())), base_features.tobytes()
+        )
+        cached = sweep_cache.get(cache_key)
+        if cached is not None:
+            return FastJSONResponse({**cached, "cached": True})
+        
+        axis_values, grid = sweep_grid(axes)
+        parameters = {
+            name: user_data['salary'] if default is None else default
+            for name, default in sweepable.items()
+        }
+        parameters.update(request.parameters)
+        parameters.update(grid)
+        
+        # Every grid point plus the unmodified base row, scored in one call
+        features = np.vstack([scenario_feature_matrix(base_features, request.scenario_type, parameters), base_features])
+        scores = await run_blocking(credit_model.score_feature_matrix, features)
+        
+        result = {
+            "user_id": request.user_id,
+            "scenario_type": request.scenario_type,
+            "model_version": credit_model.model_version,
+            "base_score": float(scores[-1]),
+            "axes": [{"parameter": name, "values": values.tolist()} for name, values in zip(axis_names, axis_values)],
+            "scores": scores[:-1].reshape([len(values) for values in axis_values]).tolist(),
+        }
+        sweep_cache.put(cache_key, result)
+        
+        return FastJSONResponse({**result, "cached": False})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in parameter sweep: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error running parameter sweep: {str(e)}"
+        )
+
+# Request fields that parameterize the life-event model itself
+MONTE_CARLO_CONFIG_FIELDS = {
+    'months', 'threshold', 'job_loss_probability', 'reemployment_probability',
+    'rate_shock_probability', 'rate_shock_expense_increase', 'income_volatility'
+}
+
+@router.post("/monte-carlo")
+async def run_monte_carlo_simulation(
+    request: MonteCarloRequest,
+    db: AsyncSession = Depends(get_async_db),
+    credit_model: CreditScoringModel = Depends(get_credit_model)
+):
+    """Stream score distributions over sampled life-event paths as NDJSON.
+    
+    Each line summarizes every path simulated so far: per-month percentile
+    bands, mean score, share of paths at or above the threshold, and share
+    that stayed above it for the whole horizon. The last line has "done": true.
+    """
+    try:
+        user_data = (await load_users_data(db, [request.user_id])).get(request.user_id)
+        
+        if user_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User profile not found"
+            )
+        
+        base_features = np.asarray(CreditScoringModel._prepare_features(user_data), dtype=np.float64)
+        config = request.model_dump(include=MONTE_CARLO_CONFIG_FIELDS)
+        logger.info(f"Starting Monte Carlo run of {request.n_paths} paths for user {request.user_id}")
+        
+        async def stream():
+            try:
+                async for snapshot in run_monte_carlo(
+                    credit_model, base_features, config, request.n_paths, request.chunk_size, request.seed
+                ):
+                    yield orjson.dumps(snapshot) + b"\n"
+                logger.info(f"Monte Carlo run completed for user {request.user_id}")
+            # Headers are already sent, so failures are reported in-band
+            except asyncio.CancelledError:
+                # Cancelling this response (client gone) propagates; a cancelled chunk fails the run
+                if asyncio.current_task().cancelling():
+                    raise
+                logger.error("Monte Carlo simulation chunk was cancelled")
+                yield orjson.dumps({"error": "Simulation chunk was cancelled", "done": True}) + b"\n"
+            except BrokenProcessPool as e:
+                logger.error(f"Monte Carlo scoring pool failed: {e}")
+                yield orjson.dumps({"error": f"Scoring worker pool failed: {e}", "done": True}) + b"\n"
+            except Exception as e:
+                logger.error(f"Error in Monte Carlo simulation: {e}")
+                yield orjson.dumps({"error": str(e), "done": True}) + b"\n"
+        
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting Monte Carlo simulation: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error running Monte Carlo simulation: {str(e)}"
+        )
+
 @router.get("/history/{user_id}")
 async def get_simulation_history(
     user_id: int,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get simulation history for a user"""
+    """Get a user's simulation history, newest first, one page at a time"""
     try:
-        simulations = db.query(credit_models.Simulation).filter(
-            credit_models.Simulation.user_id == user_id
-        ).order_by(credit_models.Simulation.created_at.desc()).all()
-        
-        return [
-            {
-                "id": sim.id,
-                "scenario_type": sim.scenario_type,
-                "parameters": sim.parameters,
-                "original_score": sim.original_score,
-                "simulated_score": sim.simulated_score,
-                "score_change": sim.score_change,
-                "factor_changes": sim.factor_changes,
-                "recommendations": sim.recommendations,
-                "created_at": sim.created_at
-            }
-            for sim in simulations
-        ]
+        rows = (await db.execute(
+            keyset_page_query(
+                select(*SIMULATION_HISTORY_COLUMNS).where(
+                    credit_models.Simulation.user_id == user_id
+                ),
+                credit_models.Simulation,
+                credit_models.Simulation.created_at,
+                cursor,
+                limit
+            )
+        )).all()
+        rows, next_cursor = split_page(rows, limit, credit_models.Simulation.created_at)
         
+        return FastJSONResponse(page(serialize_rows(rows), next_cursor))
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting simulation history: {e}")
         raise HTTPException(
@@ -1,31 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 import logging
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import user_models
 from ..utils.logger import setup_logger
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page_query, page, split_page
+from ..utils.serialization import FastJSONResponse, serialize_rows
 
 logger = setup_logger(__name__)
 router = APIRouter()
 
+USER_COLUMNS = [
+    user_models.User.id,
+    user_models.User.email,
+    user_models.User.username,
+    user_models.User.full_name,
+    user_models.User.is_active,
+    user_models.User.created_at,
+]
+
 @router.get("/")
-async def get_users(db: Session = Depends(get_db)):
-    """Get all users (for demo purposes)"""
+async def get_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get users in id order, one page at a time (for demo purposes)"""
     try:
-        users = db.query(user_models.User).all()
-        return [
-            {
-                "id": user.id,
-                "email": user.email,
-                "username": user.username,
-                "full_name": user.full_name,
-                "is_active": user.is_active,
-                "created_at": user.created_at
-            }
-            for user in users
-        ]
+        rows = (await db.execute(
+            keyset_page_query(
+                select(*USER_COLUMNS),
+                user_models.User,
+                user_models.User.id,
+                cursor,
+                limit,
+                descending=False
+            )
+        )).all()
+        rows, next_cursor = split_page(rows, limit, user_models.User.id)
+        
+        return FastJSONResponse(page(serialize_rows(rows), next_cursor))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting users: {e}")
         raise HTTPException(
@@ -34,10 +53,12 @@ async def get_users(db: Session = Depends(get_db)):
         )
 
 @router.get("/{user_id}")
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific user"""
     try:
-        user = db.query(user_models.User).filter(user_models.User.id == user_id).first()
+        user = (await db.execute(
+            select(*USER_COLUMNS).where(user_models.User.id == user_id)
+        )).first()
         
         if not user:
             raise HTTPException(
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -31,6 +31,8 @@ class CreditAssessmentRequest(BaseModel):
     include_social_signals: bool = False
     include_career_analysis: bool = True
     include_housing_analysis: bool = True
+    # Per-factor score attribution in factor_breakdown, from a slower booster contribution pass
+    include_score_contributions: bool = False
 
 class CreditAssessmentResponse(BaseModel):
     id: int
@@ -54,6 +56,25 @@ class CreditAssessmentResponse(BaseModel):
     assessment_date: datetime
     model_version: str
 
+class CreditAssessmentPage(BaseModel):
+    items: List[CreditAssessmentResponse]
+    next_cursor: Optional[str] = None
+
+class BatchCreditAssessmentRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    include_score_contributions: bool = False
+
+class BatchCreditAssessmentResponse(BaseModel):
+    assessments: List[CreditAssessmentResponse]
+    missing_user_ids: List[int]
+
+class ModelReloadRequest(BaseModel):
+    model_version: Optional[str] = None
+
+class ModelReloadResponse(BaseModel):
+    model_version: str
+    reloaded_at: datetime
+
 class TransactionCreate(BaseModel):
     user_id: int
     amount: float
@@ -63,6 +84,17 @@ class TransactionCreate(BaseModel):
     merchant: Optional[str] = None
     transaction_date: datetime
 
+class TransactionIngestError(BaseModel):
+    line: int
+    error: str
+
+class TransactionIngestResponse(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: List[TransactionIngestError]
+    errors_truncated: int = 0
+
 class TransactionResponse(BaseModel):
     id: int
     user_id: int
@@ -74,6 +106,10 @@ class TransactionResponse(BaseModel):
     transaction_date: datetime
     created_at: datetime
 
+class TransactionPage(BaseModel):
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None
+
 class UserProfileCreate(BaseModel):
     user_id: int
     age: Optional[int] = Field(None, ge=18, le=100)
@@ -138,3 +174,141 @@ class SimulationResponse(BaseModel):
     recommendations: List[str]
     created_at: datetime
     model_version: str
+
+class ScenarioStep(BaseModel):
+    scenario_type: str
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+
+class ScenarioSpec(BaseModel):
+    # Steps are applied in order, e.g. house_purchase then salary_increase
+    name: Optional[str] = None
+    steps: List[ScenarioStep] = Field(..., min_length=1, max_length=10)
+
+class MultiScenarioRequest(BaseModel):
+    user_id: int
+    scenarios: List[ScenarioSpec] = Field(..., min_length=1, max_length=100)
+    persist: bool = False
+
+class ScenarioResult(BaseModel):
+    id: Optional[int] = None
+    name: Optional[str]
+    scenario_type: str
+    parameters: Dict[str, Any]
+    simulated_score: float
+    score_change: float
+    factor_changes: Dict[str, Any]
+    recommendations: List[str]
+    created_at: Optional[datetime] = None
+
+class MultiScenarioResponse(BaseModel):
+    user_id: int
+    original_score: float
+    model_version: str
+    results: List[ScenarioResult]
+
+class SweepAxis(BaseModel):
+    parameter: str
+    start: float
+    stop: float
+    steps: int = Field(..., ge=2, le=200)
+
+class SweepRequest(BaseModel):
+    user_id: int
+    scenario_type: str
+    # One axis gives a curve, two give a heatmap; parameters fixes the scenario's other inputs
+    axes: List[SweepAxis] = Field(..., min_length=1, max_length=2)
+    parameters: Dict[str, float] = Field(default_factory=dict)
+
+class SweepAxisValues(BaseModel):
+    parameter: str
+    values: List[float]
+
+class SweepResponse(BaseModel):
+    user_id: int
+    scenario_type: str
+    model_version: str
+    base_score: float
+    axes: List[SweepAxisValues]
+    # scores[i] for a curve, scores[i][j] (axis 0 value i, axis 1 value j) for a heatmap
+    scores: List[Any]
+    cached: bool
+
+# A chunk holds every (month, path) feature row before scoring: 22 float64s,
+# about 176 MB at this many path-months, with several chunks in flight
+MONTE_CARLO_MAX_CHUNK_PATH_MONTHS = 1_000_000
+
+class MonteCarloRequest(BaseModel):
+    user_id: int
+    n_paths: int = Field(5000, ge=100, le=1_000_000)
+    months: int = Field(24, ge=1, le=120)
+    threshold: float = Field(650, ge=300, le=850)
+    # Monthly event probabilities and sizes
+    job_loss_probability: float = Field(0.01, ge=0, le=1)
+    reemployment_probability: float = Field(0.25, ge=0, le=1)
+    rate_shock_probability: float = Field(0.02, ge=0, le=1)
+    rate_shock_expense_increase: float = Field(0.10, ge=0, le=2)
+    income_volatility: float = Field(0.02, ge=0, le=0.5)
+    chunk_size: int = Field(2000, ge=100, le=50000)
+    # Seeds round-trip through JSON.parse in the browser, exact only below 2**53
+    seed: Optional[int] = Field(None, ge=0, lt=2 ** 53)
+
+    @model_validator(mode="after")
+    def check_chunk_path_months(self) -> "MonteCarloRequest":
+        if self.months * self.chunk_size > MONTE_CARLO_MAX_CHUNK_PATH_MONTHS:
+            raise ValueError(
+                f"months * chunk_size must be at most {MONTE_CARLO_MAX_CHUNK_PATH_MONTHS}; "
+                f"use chunk_size <= {MONTE_CARLO_MAX_CHUNK_PATH_MONTHS // self.months} for {self.months} months"
+            )
+        return self
+
+class CounterfactualChange(BaseModel):
+    lever: str
+    amount: float
+    description: str
+
+class CounterfactualResponse(BaseModel):
+    user_id: int
+    model_version: str
+    current_score: float
+    target_score: float
+    # reached: the change set scores at or above target; complete: the search
+    # finished within its budget, so no cheaper change set reaches the target
+    reached: bool
+    complete: bool
+    projected_score: float
+    effort: float
+    changes: List[CounterfactualChange]
+    candidates_scored: int
+    search_space: int
+    elapsed_ms: float
+    cached: bool
+
+class PlanStep(BaseModel):
+    action: str
+    # Dollars per month, applied in months start_month..end_month (inclusive, 1-based)
+    amount: float = Field(..., ge=0)
+    start_month: int = Field(1, ge=1)
+    end_month: Optional[int] = Field(None, ge=1)
+
+class ActionPlan(BaseModel):
+    name: Optional[str] = None
+    # No steps projects the user's current course
+    steps: List[PlanStep] = Field(default_factory=list, max_length=20)
+
+class TrajectoryRequest(BaseModel):
+    months: int = Field(12, ge=1, le=60)
+    plans: List[ActionPlan] = Field(..., min_length=1, max_length=100)
+
+class TrajectoryResult(BaseModel):
+    name: Optional[str]
+    scores: List[float]
+    final_score: float
+    score_change: float
+    final_state: Dict[str, float]
+
+class TrajectoryResponse(BaseModel):
+    user_id: int
+    model_version: str
+    current_score: float
+    months: List[int]
+    plans: List[TrajectoryResult]
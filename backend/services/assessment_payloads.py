@@ -0,0 +1,219 @@
+import hashlib
+import os
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import credit_models
+from ..models.payload_models import AssessmentPayload
+from .prediction_cache import PredictionCache
+
+logger = logging.getLogger(__name__)
+
+# Assessment columns whose JSON is stored once in assessment_payloads and referenced by hash
+PAYLOAD_COLUMNS = ('factor_breakdown', 'recommendations', 'risk_factors')
+
+PAYLOAD_DEDUP_ENABLED = os.getenv("ASSESSMENT_PAYLOAD_DEDUP", "true").lower() == "true"
+# Values whose JSON is shorter than this stay inline; a reference would not be smaller
+PAYLOAD_MIN_BYTES = int(os.getenv("ASSESSMENT_PAYLOAD_MIN_BYTES", "64"))
+
+REF_KEY = "$ref"
+
+# Decoded payloads by hash; content-addressed entries never go stale, the TTL only bounds residency
+payload_cache = PredictionCache(
+    max_size=int(os.getenv("ASSESSMENT_PAYLOAD_CACHE_SIZE", "65536")),
+    ttl_seconds=float(os.getenv("ASSESSMENT_PAYLOAD_CACHE_TTL_SECONDS", "3600"))
+)
+
+def _is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and REF_KEY in value
+
+def compact_payload(value: Any, blobs: Dict[str, bytes]) -> Any:
+    """Replace a payload with ``{"$ref": hash}``, adding its JSON to ``blobs`` under that hash.
+
+    Short values stay inline, and already-compacted values are returned unchanged.
+    """
+    if value is None or _is_ref(value):
+        return value
+    encoded = orjson.dumps(value)
+    if len(encoded) < PAYLOAD_MIN_BYTES:
+        return value
+    digest = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+    blobs[digest] = encoded
+    payload_cache.put(digest, value)
+    return {REF_KEY: digest}
+
+def _referenced_hashes(rows: Iterable[Dict[str, Any]]) -> set:
+    return {
+        row[column][REF_KEY]
+        for row in rows
+        for column in PAYLOAD_COLUMNS
+        if _is_ref(row.get(column))
+    }
+
+def _insert_payloads(dialect_name: str):
+    """INSERT ... ON CONFLICT DO NOTHING, executed with one parameter set per new payload, or None on other dialects"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert(AssessmentPayload).on_conflict_do_nothing(index_elements=["hash"])
+
+def _payload_params(blobs: Dict[str, bytes]) -> List[Dict[str, str]]:
+    return [{"hash": digest, "payload": encoded.decode()} for digest, encoded in blobs.items()]
+
+def _insert_new_payloads(db: Session, blobs: Dict[str, bytes]):
+    """Portable ``_insert_payloads``: skip the hashes already stored and insert the rest.
+
+    Unlike ON CONFLICT this is not atomic; a concurrent insert of the same
+    payload fails one of the transactions on the primary key.
+    """
+    stored = set(db.execute(select(AssessmentPayload.hash).where(AssessmentPayload.hash.in_(list(blobs)))).scalars())
+    new_blobs = {digest: encoded for digest, encoded in blobs.items() if digest not in stored}
+    if new_blobs:
+        db.execute(insert(AssessmentPayload), _payload_params(new_blobs))
+
+def _store_payloads(db: Session, blobs: Dict[str, bytes]):
+    stmt = _insert_payloads(db.get_bind().dialect.name)
+    if stmt is None:
+        _insert_new_payloads(db, blobs)
+    else:
+        db.execute(stmt, _payload_params(blobs))
+
+def _compact_objects(objects: Iterable[Any]) -> Dict[str, bytes]:
+    blobs: Dict[str, bytes] = {}
+    for obj in objects:
+        if isinstance(obj, credit_models.CreditAssessment):
+            for column in PAYLOAD_COLUMNS:
+                setattr(obj, column, compact_payload(getattr(obj, column), blobs))
+    return blobs
+
+def _compact_dicts(rows: Iterable[Dict[str, Any]]) -> Dict[str, bytes]:
+    blobs: Dict[str, bytes] = {}
+    for row in rows:
+        for column in PAYLOAD_COLUMNS:
+            if column in row:
+                row[column] = compact_payload(row[column], blobs)
+    return blobs
+
+async def compact_assessments(db: AsyncSession, objects: Iterable[Any]):
+    """Swap the payloads of unsaved CreditAssessment objects for references.
+
+    The referenced payloads are inserted in the caller's transaction, so they
+    commit together with the rows that point at them. Other objects are left
+    alone.
+    """
+    if not PAYLOAD_DEDUP_ENABLED:
+        return
+    blobs = _compact_objects(objects)
+    if blobs:
+        connection = await db.connection()
+        stmt = _insert_payloads(connection.dialect.name)
+        if stmt is None:
+            await db.run_sync(_insert_new_payloads, blobs)
+        else:
+            await db.execute(stmt, _payload_params(blobs))
+
+def compact_assessment_rows(db: Session, rows: Iterable[Dict[str, Any]]):
+    """``compact_assessments`` for CreditAssessment row dicts headed for a Core insert or update"""
+    if not PAYLOAD_DEDUP_ENABLED:
+        return
+    blobs = _compact_dicts(rows)
+    if blobs:
+        _store_payloads(db, blobs)
+
+def _resolve(rows: List[Dict[str, Any]], payloads: Dict[str, Any], loaded: Dict[str, str]) -> List[Dict[str, Any]]:
+    for digest, encoded in loaded.items():
+        payloads[digest] = orjson.loads(encoded)
+        payload_cache.put(digest, payloads[digest])
+    unresolved = [digest for digest, value in payloads.items() if value is None]
+    if unresolved:
+        logger.error(f"Assessment payloads missing from storage: {unresolved[:5]}")
+        for digest in unresolved:
+            del payloads[digest]
+    for row in rows:
+        for column in PAYLOAD_COLUMNS:
+            value = row.get(column)
+            if _is_ref(value):
+                row[column] = payloads.get(value[REF_KEY], value)
+    return rows
+
+def _select_payloads(missing: List[str]):
+    return select(AssessmentPayload.hash, AssessmentPayload.payload).where(AssessmentPayload.hash.in_(missing))
+
+async def expand_payloads(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Resolve payload references in serialized assessment rows, in place.
+
+    Hashes are served from the in-process cache; the rest are fetched with one
+    query. Rows stored before deduplication pass through untouched.
+    """
+    payloads = {digest: payload_cache.get(digest) for digest in _referenced_hashes(rows)}
+    if not payloads:
+        return rows
+    missing = [digest for digest, value in payloads.items() if value is None]
+    loaded = dict((await db.execute(_select_payloads(missing))).all()) if missing else {}
+    return _resolve(rows, payloads, loaded)
+
+def expand_payloads_sync(db: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """``expand_payloads`` for a sync Session"""
+    payloads = {digest: payload_cache.get(digest) for digest in _referenced_hashes(rows)}
+    if not payloads:
+        return rows
+    missing = [digest for digest, value in payloads.items() if value is None]
+    loaded = dict(db.execute(_select_payloads(missing)).all()) if missing else {}
+    return _resolve(rows, payloads, loaded)
+
+def migrate_payloads(db: Session, batch_size: int = 1000) -> Dict[str, int]:
+    """Move the payloads of existing assessments into assessment_payloads.
+
+    Walks credit_assessments in id order and commits every batch, so it can be
+    interrupted and rerun; rows that are already compacted are skipped.
+    """
+    assessments = credit_models.CreditAssessment
+    scanned = updated = 0
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(assessments.id, *(getattr(assessments, column) for column in PAYLOAD_COLUMNS)).where(
+                assessments.id > last_id
+            ).order_by(assessments.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        scanned += len(rows)
+
+        changed = []
+        blobs: Dict[str, bytes] = {}
+        for row in rows:
+            row_blobs: Dict[str, bytes] = {}
+            compacted = {column: compact_payload(getattr(row, column), row_blobs) for column in PAYLOAD_COLUMNS}
+            if row_blobs:
+                changed.append({"id": row.id, **compacted})
+                blobs.update(row_blobs)
+        if changed:
+            _store_payloads(db, blobs)
+            db.execute(update(assessments), changed)
+            updated += len(changed)
+        db.commit()
+        logger.info(f"Compacted payloads of {updated}/{scanned} assessments (through id {last_id})")
+
+    stored = db.execute(select(func.count()).select_from(AssessmentPayload)).scalar()
+    return {"scanned": scanned, "updated": updated, "payloads": stored}
+
+def database_size_bytes(db: Session) -> Optional[int]:
+    """On-disk size of the database, or None where it can't be measured"""
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "sqlite":
+        page_count = db.execute(text("PRAGMA page_count")).scalar()
+        page_size = db.execute(text("PRAGMA page_size")).scalar()
+        return page_count * page_size
+    if dialect_name == "postgresql":
+        return db.execute(text("SELECT pg_database_size(current_database())")).scalar()
+    return None
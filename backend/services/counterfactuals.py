@@ -0,0 +1,189 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .ai_models import FEATURE_INDEX, CreditScoringModel, refresh_derived_features
+from .prediction_cache import PredictionCache
+
+# Actionable changes the search combines, each offered at a ladder of levels:
+#   pay_down_card        share of the card balance paid off from savings (at most all savings)
+#   cut_expenses         share of monthly expenses cut
+#   raise_income         raise as a share of current income
+#   avoid_late_payments  late payments avoided (levels 0..current count)
+LEVER_LEVELS = {
+    'pay_down_card': np.linspace(0, 1, 11),
+    'cut_expenses': np.linspace(0, 0.3, 11),
+    'raise_income': np.linspace(0, 0.3, 11),
+}
+
+# Effort units per lever: 1 per month of income paid toward the card, per 10% of
+# expenses cut, per 5% raise and per late payment avoided
+EFFORT_WEIGHTS = {
+    'pay_down_card': 1.0,
+    'cut_expenses': 10.0,
+    'raise_income': 20.0,
+    'avoid_late_payments': 1.0,
+}
+
+COUNTERFACTUAL_BATCH_SIZE = int(os.getenv("COUNTERFACTUAL_BATCH_SIZE", "512"))
+COUNTERFACTUAL_BUDGET_MS = float(os.getenv("COUNTERFACTUAL_BUDGET_MS", "250"))
+
+# Search results by (user_id, model version key, target, base features)
+counterfactual_cache = PredictionCache(
+    max_size=int(os.getenv("COUNTERFACTUAL_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("COUNTERFACTUAL_CACHE_TTL_SECONDS", "300"))
+)
+
+def counterfactual_cache_key(
+    credit_model: CreditScoringModel,
+    user_id: int,
+    base_features: np.ndarray,
+    target_score: float
+) -> tuple:
+    """Cache key for a search; keyed on the base features too, so a changed profile never serves an old answer"""
+    return (user_id, credit_model.version_key, target_score, base_features.tobytes())
+
+def _lever_ladders(base_features: np.ndarray, weights: Dict[str, float]) -> Dict[str, Dict[str, np.ndarray]]:
+    """Per-lever level amounts (in feature units) and the effort of each level.
+
+    Levers that cannot move this user's features (no card balance or no
+    savings to pay it from, no late payments) collapse to their zero level so
+    they add no duplicate candidates.
+    """
+    value = lambda name: float(base_features[FEATURE_INDEX[name]])
+    monthly_income = max(value('monthly_income'), 1.0)
+    monthly_expenses = max(value('monthly_expenses'), 1.0)
+
+    # A pay-down comes out of savings, so it can't exceed them
+    payable = min(max(value('credit_card_balance'), 0.0), max(value('savings_balance'), 0.0))
+    pay_down = np.unique(LEVER_LEVELS['pay_down_card'] * payable)
+    cut = np.unique(LEVER_LEVELS['cut_expenses'] * max(value('monthly_expenses'), 0.0))
+    raise_income = np.unique(LEVER_LEVELS['raise_income'] * max(value('monthly_income'), 0.0))
+    avoided = np.arange(int(max(value('late_payments'), 0)) + 1, dtype=np.float64)
+
+    return {
+        'pay_down_card': {'amounts': pay_down, 'effort': weights['pay_down_card'] * pay_down / monthly_income},
+        'cut_expenses': {'amounts': cut, 'effort': weights['cut_expenses'] * cut / monthly_expenses},
+        'raise_income': {'amounts': raise_income, 'effort': weights['raise_income'] * raise_income / monthly_income},
+        'avoid_late_payments': {'amounts': avoided, 'effort': weights['avoid_late_payments'] * avoided},
+    }
+
+def counterfactual_feature_matrix(base_features: np.ndarray, changes: Dict[str, np.ndarray]) -> np.ndarray:
+    """Apply per-row lever amounts (one array per lever) to tiled copies of the base vector"""
+    n_rows = len(next(iter(changes.values())))
+    features = np.tile(np.asarray(base_features, dtype=np.float64), (n_rows, 1))
+    col = lambda name: features[:, FEATURE_INDEX[name]]
+
+    col('credit_card_balance')[:] -= changes['pay_down_card']
+    col('savings_balance')[:] -= changes['pay_down_card']
+    col('monthly_expenses')[:] -= changes['cut_expenses']
+    income_ratio = 1 + changes['raise_income'] / np.maximum(col('monthly_income'), 1.0)
+    col('monthly_income')[:] += changes['raise_income']
+    col('salary')[:] *= income_ratio
+    col('late_payments')[:] -= changes['avoid_late_payments']
+
+    return refresh_derived_features(features)
+
+def _describe(changes: Dict[str, float], base_features: np.ndarray) -> List[Dict[str, Any]]:
+    value = lambda name: float(base_features[FEATURE_INDEX[name]])
+    described = []
+    if changes['pay_down_card'] > 0:
+        described.append({
+            "lever": "pay_down_card",
+            "amount": round(changes['pay_down_card'], 2),
+            "description": f"Pay ${changes['pay_down_card']:,.0f} toward your credit card balance "
+                           f"(${value('credit_card_balance'):,.0f} now)"
+        })
+    if changes['cut_expenses'] > 0:
+        described.append({
+            "lever": "cut_expenses",
+            "amount": round(changes['cut_expenses'], 2),
+            "description": f"Cut monthly expenses by ${changes['cut_expenses']:,.0f} "
+                           f"({changes['cut_expenses'] / max(value('monthly_expenses'), 1.0) * 100:.0f}%)"
+        })
+    if changes['raise_income'] > 0:
+        described.append({
+            "lever": "raise_income",
+            "amount": round(changes['raise_income'], 2),
+            "description": f"Raise monthly income by ${changes['raise_income']:,.0f} "
+                           f"({changes['raise_income'] / max(value('monthly_income'), 1.0) * 100:.0f}%)"
+        })
+    if changes['avoid_late_payments'] > 0:
+        described.append({
+            "lever": "avoid_late_payments",
+            "amount": changes['avoid_late_payments'],
+            "description": f"Avoid {changes['avoid_late_payments']:.0f} of your "
+                           f"{value('late_payments'):.0f} late payments"
+        })
+    return described
+
+def search_counterfactual(
+    credit_model: CreditScoringModel,
+    base_features: np.ndarray,
+    target_score: float,
+    weights: Optional[Dict[str, float]] = None,
+    budget_ms: float = COUNTERFACTUAL_BUDGET_MS,
+    batch_size: int = COUNTERFACTUAL_BATCH_SIZE
+) -> Dict[str, Any]:
+    """Find the least-effort combination of lever levels that reaches ``target_score``.
+
+    Every combination of lever levels is ranked by total effort up front, then
+    scored a batch at a time in that order; the first batch with a candidate
+    at or above the target holds the cheapest one, since everything cheaper
+    has already been scored. The search stops there or when ``budget_ms``
+    runs out, in which case the best-scoring candidate seen is returned with
+    ``complete`` false.
+    """
+    started = time.perf_counter()
+    deadline = started + budget_ms / 1000
+    ladders = _lever_ladders(base_features, {**EFFORT_WEIGHTS, **(weights or {})})
+    names = list(ladders)
+
+    grids = np.meshgrid(*[np.arange(len(ladders[name]['amounts'])) for name in names], indexing='ij')
+    levels = np.stack([grid.ravel() for grid in grids], axis=1)
+    effort = sum(ladders[name]['effort'][levels[:, i]] for i, name in enumerate(names))
+    order = np.argsort(effort, kind='stable')
+
+    base_score = float(credit_model.score_feature_matrix(base_features[None, :])[0])
+    best, best_score, reached, scored = 0, base_score, base_score >= target_score, 0
+    complete = True
+
+    if not reached:
+        for offset in range(0, len(order), batch_size):
+            if time.perf_counter() >= deadline:
+                complete = False
+                break
+
+            batch = order[offset:offset + batch_size]
+            changes = {name: ladders[name]['amounts'][levels[batch, i]] for i, name in enumerate(names)}
+            scores = credit_model.score_feature_matrix(counterfactual_feature_matrix(base_features, changes))
+            scored += len(batch)
+
+            hits = np.flatnonzero(scores >= target_score)
+            if len(hits):
+                # Cheapest hit, breaking effort ties by the higher score
+                cheapest = effort[batch[hits]]
+                tied = hits[cheapest == cheapest.min()]
+                winner = tied[np.argmax(scores[tied])]
+                best, best_score, reached = batch[winner], float(scores[winner]), True
+                break
+
+            closest = int(np.argmax(scores))
+            if scores[closest] > best_score:
+                best, best_score = batch[closest], float(scores[closest])
+
+    changes = {name: float(ladders[name]['amounts'][levels[best, i]]) for i, name in enumerate(names)}
+    return {
+        "current_score": base_score,
+        "target_score": target_score,
+        "reached": bool(reached),
+        "complete": complete,
+        "projected_score": best_score,
+        "effort": round(float(effort[best]), 3),
+        "changes": _describe(changes, base_features),
+        "candidates_scored": scored,
+        "search_space": int(len(order)),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
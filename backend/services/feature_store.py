@@ -0,0 +1,300 @@
+import hashlib
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import credit_models, user_models
+from ..models.rollup_models import TransactionRollup
+from .ai_models import CreditScoringModel, EDUCATION_LEVEL_CODES, FEATURE_INDEX, FEATURE_NAMES, HOUSING_STATUS_CODES
+from .transaction_rollups import cash_flow_features
+from .user_data import apply_cash_flow, build_user_data
+
+logger = logging.getLogger(__name__)
+
+HOUSING_STATUS_LABELS = {code: label for label, code in HOUSING_STATUS_CODES.items()}
+EDUCATION_LEVEL_LABELS = {code: label for label, code in EDUCATION_LEVEL_CODES.items()}
+
+# Raw inputs that appear verbatim in the feature vector (the rest are encoded or derived)
+_RAW_FEATURES = [
+    'monthly_income', 'monthly_expenses', 'savings_balance', 'credit_card_balance',
+    'credit_card_limit', 'loan_balance', 'late_payments', 'missed_payments',
+    'years_experience', 'salary', 'job_stability_score', 'monthly_rent',
+    'mortgage_payment', 'property_value', 'age', 'social_score'
+]
+
+# Integer inputs that explanation and risk-factor text print as-is
+_COUNT_FEATURES = ['late_payments', 'missed_payments', 'years_experience', 'age']
+
+def user_data_from_features(features: np.ndarray) -> Dict[str, Any]:
+    """Rebuild the model input dict from a stored feature vector.
+
+    Every key the scoring model reads is recovered, so
+    ``_prepare_features(user_data_from_features(v))`` reproduces ``v``.
+    """
+    user_data = {name: features[FEATURE_INDEX[name]].item() for name in _RAW_FEATURES}
+    for name in _COUNT_FEATURES:
+        if user_data[name].is_integer():
+            user_data[name] = int(user_data[name])
+    user_data['housing_status'] = HOUSING_STATUS_LABELS[int(features[FEATURE_INDEX['housing_status_encoded']])]
+    user_data['education_level'] = EDUCATION_LEVEL_LABELS[int(features[FEATURE_INDEX['education_level_encoded']])]
+    return user_data
+
+class FeatureStore:
+    """Materialized model feature vectors keyed by user_id.
+
+    Vectors live in one preallocated float64 matrix; a dict maps user_id to
+    its row, so a lookup is a hash probe plus a row copy. Each row carries
+    the version of the inputs it was built from (see ``source_versions``) and
+    is only served while the database still reports that version, so writes
+    made by other processes, or outside the API, are never served stale.
+    ``invalidate`` drops rows as soon as this process changes a user's inputs
+    and keeps loads already in flight from writing the old vector back. The
+    store is loaded from ``path`` at startup; only ``save`` (run by the
+    rebuild-features command) writes it.
+    """
+
+    def __init__(self, path: str, initial_capacity: int = 1024):
+        self.path = path
+        self._lock = threading.Lock()
+        self._rows: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._vectors = np.zeros((initial_capacity, len(FEATURE_NAMES)), dtype=np.float64)
+        self._versions = np.zeros(initial_capacity, dtype=np.int64)
+        self._size = 0
+        # Invalidations since the oldest load in flight, by user_id
+        self._generation = 0
+        self._invalidated: Dict[int, int] = {}
+        self._loads_in_flight = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, user_id: int, version: int) -> Optional[np.ndarray]:
+        """Copy of the user's feature vector, or None if not materialized at ``version``"""
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None or self._versions[row] != version:
+                self.misses += 1
+                self.stale += row is not None
+                return None
+            self.hits += 1
+            return self._vectors[row].copy()
+
+    @contextmanager
+    def loading(self) -> Iterator[int]:
+        """Bracket reading users' inputs from the database; yields the generation to ``put`` with"""
+        with self._lock:
+            self._loads_in_flight += 1
+            generation = self._generation
+        try:
+            yield generation
+        finally:
+            with self._lock:
+                self._loads_in_flight -= 1
+                if not self._loads_in_flight:
+                    self._invalidated.clear()
+
+    def put(self, user_id: int, features: Iterable[float], version: int, generation: int):
+        """Store (or replace) a user's feature vector read within ``loading()``.
+
+        Skipped if the user was invalidated after the load began, since the
+        vector may predate the change.
+        """
+        with self._lock:
+            if self._invalidated.get(user_id, -1) >= generation:
+                return
+            row = self._rows.get(user_id)
+            if row is None:
+                row = self._allocate_row()
+                self._rows[user_id] = row
+            self._vectors[row] = features
+            self._versions[row] = version
+
+    def invalidate(self, user_ids: Iterable[int]):
+        """Drop the vectors of users whose inputs changed"""
+        with self._lock:
+            for user_id in user_ids:
+                if self._loads_in_flight:
+                    self._invalidated[user_id] = self._generation
+                row = self._rows.pop(user_id, None)
+                if row is not None:
+                    self._free.append(row)
+                    self.invalidations += 1
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+            self._free.clear()
+            self._size = 0
+
+    def _allocate_row(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._size == len(self._vectors):
+            grown = np.zeros((2 * len(self._vectors), len(FEATURE_NAMES)), dtype=np.float64)
+            grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+            self._versions = np.resize(self._versions, len(grown))
+        self._size += 1
+        return self._size - 1
+
+    def save(self):
+        """Write the live rows and their versions to disk atomically"""
+        with self._lock:
+            user_ids = np.fromiter(self._rows.keys(), dtype=np.int64, count=len(self._rows))
+            rows = np.fromiter(self._rows.values(), dtype=np.intp, count=len(self._rows))
+            vectors, versions = self._vectors[rows], self._versions[rows]
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp.npz"
+        np.savez(tmp_path, user_ids=user_ids, vectors=vectors, versions=versions, feature_names=np.array(FEATURE_NAMES))
+        os.replace(tmp_path, self.path)
+        logger.info(f"Saved {len(user_ids)} feature vectors to {self.path}")
+
+    def load(self) -> bool:
+        """Load a persisted store; a file built for another feature layout is ignored"""
+        if not os.path.exists(self.path):
+            return False
+        with np.load(self.path, allow_pickle=False) as data:
+            if list(data['feature_names']) != FEATURE_NAMES or 'versions' not in data:
+                logger.warning(f"Ignoring feature store {self.path}: feature layout changed")
+                return False
+            user_ids, vectors, versions = data['user_ids'], data['vectors'], data['versions']
+        with self._lock:
+            capacity = max(len(self._vectors), len(user_ids))
+            self._vectors = np.zeros((capacity, len(FEATURE_NAMES)), dtype=np.float64)
+            self._vectors[:len(user_ids)] = vectors
+            self._versions = np.zeros(capacity, dtype=np.int64)
+            self._versions[:len(user_ids)] = versions
+            self._rows = {int(user_id): row for row, user_id in enumerate(user_ids)}
+            self._free = []
+            self._size = len(user_ids)
+        logger.info(f"Loaded {len(user_ids)} feature vectors from {self.path}")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "users": len(self._rows),
+                "capacity": len(self._vectors),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+FEATURE_STORE_ENABLED = os.getenv("FEATURE_STORE", "true").lower() == "true"
+
+feature_store = FeatureStore(os.getenv("FEATURE_STORE_PATH", "data/feature_store.npz"))
+
+def _source_versions_query(user_ids: List[int]):
+    """Everything a user's feature vector depends on, per user with a profile.
+
+    Profile edits move updated_at; credit history has no version column, so
+    its model inputs are compared directly; new transactions raise the
+    rollup count and rollup rebuilds move their updated_at.
+    """
+    history = credit_models.CreditHistory
+    rollups = select(
+        TransactionRollup.user_id,
+        func.sum(TransactionRollup.transaction_count).label("transactions"),
+        func.max(TransactionRollup.updated_at).label("updated_at"),
+    ).where(
+        TransactionRollup.user_id.in_(user_ids)
+    ).group_by(TransactionRollup.user_id).subquery()
+    return select(
+        user_models.UserProfile.user_id,
+        user_models.UserProfile.updated_at,
+        history.credit_card_balance,
+        history.credit_card_limit,
+        history.loan_balance,
+        history.late_payments,
+        history.missed_payments,
+        rollups.c.transactions,
+        rollups.c.updated_at,
+    ).outerjoin(
+        history, history.user_id == user_models.UserProfile.user_id
+    ).outerjoin(
+        rollups, rollups.c.user_id == user_models.UserProfile.user_id
+    ).where(
+        user_models.UserProfile.user_id.in_(user_ids)
+    )
+
+async def source_versions(db: AsyncSession, user_ids: List[int]) -> Dict[int, int]:
+    """64-bit version of each user's feature inputs; users without a profile are absent"""
+    versions = {}
+    for user_id, *inputs in (await db.execute(_source_versions_query(user_ids))).all():
+        digest = hashlib.blake2b(repr(inputs).encode(), digest_size=8).digest()
+        versions[user_id] = int.from_bytes(digest, "little", signed=True)
+    return versions
+
+async def load_users_data(db: AsyncSession, user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Model input dicts for ``user_ids``, served from the feature store where possible.
+
+    One query reads the current version of every user's inputs; stored
+    vectors at that version are served as-is. The rest are read from their
+    profile, credit history and transaction rollups in one pass and then
+    materialized. Users without a profile are absent from the result.
+    """
+    if not FEATURE_STORE_ENABLED:
+        return await _read_users_data(db, user_ids)
+
+    with feature_store.loading() as generation:
+        versions = await source_versions(db, user_ids)
+        users_data = {}
+        missing = []
+        for user_id, version in versions.items():
+            features = feature_store.get(user_id, version)
+            if features is None:
+                missing.append(user_id)
+            else:
+                users_data[user_id] = user_data_from_features(features)
+
+        if missing:
+            for user_id, features in (await _read_users_features(db, missing)).items():
+                # The version was read first, so a change landing in between only forces another reload
+                feature_store.put(user_id, features, versions[user_id], generation)
+                users_data[user_id] = user_data_from_features(features)
+
+    return users_data
+
+async def _read_users_data(db: AsyncSession, user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    return {
+        user_id: user_data_from_features(features)
+        for user_id, features in (await _read_users_features(db, user_ids)).items()
+    }
+
+async def _read_users_features(db: AsyncSession, user_ids: List[int]) -> Dict[int, np.ndarray]:
+    """Feature vectors built from the database, in one pass for all ``user_ids``"""
+    rows = (await db.execute(
+        select(user_models.UserProfile, credit_models.CreditHistory).outerjoin(
+            credit_models.CreditHistory,
+            credit_models.CreditHistory.user_id == user_models.UserProfile.user_id
+        ).where(
+            user_models.UserProfile.user_id.in_(user_ids)
+        )
+    )).all()
+    cash_flow = await cash_flow_features(db, user_ids)
+
+    # Both paths serve user_data_from_features() of the vector, so misses and hits render identically
+    features = {}
+    for user_profile, credit_history in rows:
+        if user_profile.user_id in features:
+            continue
+        user_data = apply_cash_flow(build_user_data(user_profile, credit_history), cash_flow.get(user_profile.user_id))
+        features[user_profile.user_id] = np.asarray(CreditScoringModel._prepare_features(user_data), dtype=np.float64)
+    return features
@@ -0,0 +1,211 @@
+import multiprocessing
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .tree_ensemble import TreeEnsemble
+
+logger = logging.getLogger(__name__)
+
+def _slot_arrays(buffer, n_slots: int, slot_rows: int, n_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Input (n_slots, slot_rows, n_features) and output (n_slots, slot_rows) views of the ring buffer"""
+    inputs = np.ndarray((n_slots, slot_rows, n_features), dtype=np.float32, buffer=buffer)
+    outputs = np.ndarray((n_slots, slot_rows), dtype=np.float32, buffer=buffer, offset=inputs.nbytes)
+    return inputs, outputs
+
+def _worker_main(ensemble_path: str, shm_name: str, n_slots: int, slot_rows: int, tasks, results):
+    """Score ring-buffer slots until told to stop.
+
+    The ensemble table is memory-mapped, so every worker reads the same
+    page-cache copy; only (slot, n_rows) messages cross the task queue.
+    """
+    ensemble = TreeEnsemble.load(ensemble_path, mmap=True)
+    shm = SharedMemory(name=shm_name)
+    inputs = outputs = None
+    try:
+        inputs, outputs = _slot_arrays(shm.buf, n_slots, slot_rows, ensemble.n_features)
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            slot, n_rows = task
+            try:
+                outputs[slot, :n_rows] = ensemble.predict(inputs[slot, :n_rows])
+                results.put((slot, None))
+            except Exception as e:
+                results.put((slot, repr(e)))
+    finally:
+        # Views into the block must go before it can be closed
+        inputs = outputs = None
+        shm.close()
+
+class InferencePool:
+    """Worker processes scoring scaled feature rows through shared-memory ring slots.
+
+    One SharedMemory block holds ``n_slots`` input/output slots of
+    ``slot_rows`` rows each. ``predict`` splits a matrix across free slots,
+    copies each piece in and posts ``(slot, n_rows)`` to the workers; a
+    collector thread copies each finished slot's scores straight into the
+    caller's result and frees the slot, so callers never hold slots while
+    waiting and large batches spread over every worker. Workers are spawned
+    (the server process runs threads) and memory-map the exported
+    TreeEnsemble instead of loading their own model.
+    """
+
+    def __init__(self, ensemble_path: str, workers: int, slot_rows: int = 4096, n_slots: Optional[int] = None):
+        self.ensemble_path = ensemble_path
+        self.workers = workers
+        self.slot_rows = slot_rows
+        self.n_slots = n_slots or 2 * workers
+        self.n_features = TreeEnsemble.load(ensemble_path, mmap=True).n_features
+        self.broken: Optional[str] = None
+        self._shm: Optional[SharedMemory] = None
+        self._processes = []
+        self._collector: Optional[threading.Thread] = None
+        self._pending: Dict[int, Tuple[np.ndarray, Future]] = {}
+        self._pending_lock = threading.Lock()
+        self._free_slots: "queue.Queue[int]" = queue.Queue()
+
+    @property
+    def running(self) -> bool:
+        return self._shm is not None and self.broken is None
+
+    def start(self):
+        slot_bytes = self.slot_rows * (self.n_features + 1) * np.dtype(np.float32).itemsize
+        self._shm = SharedMemory(create=True, size=self.n_slots * slot_bytes)
+        self._inputs, self._outputs = _slot_arrays(self._shm.buf, self.n_slots, self.slot_rows, self.n_features)
+        for slot in range(self.n_slots):
+            self._free_slots.put(slot)
+
+        context = multiprocessing.get_context("spawn")
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        self._processes = [
+            context.Process(
+                target=_worker_main,
+                args=(self.ensemble_path, self._shm.name, self.n_slots, self.slot_rows, self._tasks, self._results),
+                daemon=True
+            )
+            for _ in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._collector = threading.Thread(target=self._collect, name="inference-pool-collector", daemon=True)
+        self._collector.start()
+        logger.info(f"Inference pool started: {self.workers} workers, {self.n_slots} slots of {self.slot_rows} rows")
+
+    def predict(self, features_scaled: np.ndarray) -> np.ndarray:
+        """Raw model output for scaled feature rows, scored across the workers"""
+        if not self.running:
+            raise RuntimeError(f"Inference pool is not running: {self.broken or 'not started'}")
+
+        n_rows = len(features_scaled)
+        scores = np.empty(n_rows, dtype=np.float32)
+        # Even pieces so a single large batch keeps every worker busy
+        piece = min(self.slot_rows, max(1, -(-n_rows // self.workers)))
+        futures = []
+        try:
+            for start in range(0, n_rows, piece):
+                rows = features_scaled[start:start + piece]
+                futures.append(self._post(rows, scores[start:start + len(rows)]))
+        except Exception:
+            # Pieces already posted still occupy their slots until the collector (or _fail)
+            # settles them; wait so this call leaves nothing in flight
+            for future in futures:
+                try:
+                    future.result()
+                except Exception:
+                    pass
+            raise
+        for future in futures:
+            future.result()
+        return scores
+    
+    def _post(self, rows: np.ndarray, destination: np.ndarray) -> Future:
+        """Copy rows into a free slot and hand it to the workers; the slot is freed again on failure"""
+        slot = self._acquire_slot()
+        future = Future()
+        try:
+            self._inputs[slot, :len(rows)] = rows
+            with self._pending_lock:
+                # _fail marks the pool broken before it takes the lock, so no entry is missed
+                if self.broken is not None:
+                    raise RuntimeError(f"Inference pool is not running: {self.broken}")
+                self._pending[slot] = (destination, future)
+        except Exception:
+            self._free_slots.put(slot)
+            raise
+        self._tasks.put((slot, len(rows)))
+        return future
+
+    def _acquire_slot(self) -> int:
+        while True:
+            try:
+                return self._free_slots.get(timeout=1.0)
+            except queue.Empty:
+                if not self.running:
+                    raise RuntimeError(f"Inference pool is not running: {self.broken or 'closed'}")
+
+    def _collect(self):
+        while True:
+            try:
+                message = self._results.get(timeout=1.0)
+            except queue.Empty:
+                if self._shm is None:
+                    return
+                dead = [process.pid for process in self._processes if not process.is_alive()]
+                if dead:
+                    self._fail(f"worker processes {dead} exited")
+                    return
+                continue
+            if message is None:
+                return
+
+            slot, error = message
+            with self._pending_lock:
+                entry = self._pending.pop(slot, None)
+            if entry is None:
+                # Already failed by _fail; the caller has moved on, so only the slot is left to free
+                self._free_slots.put(slot)
+                continue
+            destination, future = entry
+            if error is None:
+                destination[:] = self._outputs[slot, :len(destination)]
+            self._free_slots.put(slot)
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(RuntimeError(f"Inference worker failed: {error}"))
+
+    def _fail(self, reason: str):
+        self.broken = reason
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            logger.error(f"Inference pool failing {len(pending)} pending slots: {reason}")
+        for _, future in pending.values():
+            future.set_exception(RuntimeError(f"Inference pool broken: {reason}"))
+
+    def close(self):
+        """Stop the workers and release the shared memory"""
+        if self._shm is None:
+            return
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._results.put(None)
+        self._collector.join(timeout=5)
+        self._fail("pool closed")
+        self._inputs = self._outputs = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+        self._processes = []
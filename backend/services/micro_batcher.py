@@ -0,0 +1,204 @@
+import asyncio
+import os
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from .ai_models import CreditScoringModel
+from ..utils.executor import run_blocking
+from ..utils.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+QUEUE_DELAY_MS_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100)
+
+class MicroBatcher:
+    """Coalesces concurrent single-user predictions into batched model calls.
+
+    Handlers ``submit`` a user's data and await the prediction; a background
+    task takes everything queued within ``max_wait_ms`` of the oldest waiting
+    request (or until ``max_batch`` are waiting), runs them through
+    ``predict_credit_scores_batch`` on the scoring executor and resolves each
+    caller's future. Up to ``max_in_flight`` batches run at once; while they
+    do, new requests keep queueing, so batches grow with load.
+    """
+
+    def __init__(self, max_batch: int, max_wait_ms: float, max_in_flight: int):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_in_flight = max_in_flight
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._flushes: set = set()
+        self.batches = 0
+        self.predictions = 0
+        self.failed_batches = 0
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_delay_ms = Histogram(QUEUE_DELAY_MS_BUCKETS)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the scheduler on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Predict whatever is queued, wait for running batches and stop the scheduler"""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+        self._task = None
+
+    async def submit(
+        self,
+        credit_model: CreditScoringModel,
+        user_data: Dict[str, Any],
+        include_contributions: bool = False
+    ) -> Dict[str, Any]:
+        """Queue one prediction and wait for the batch that carries it"""
+        if not self.running:
+            raise RuntimeError("Micro-batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((credit_model, user_data, future, time.perf_counter(), include_contributions))
+        return await future
+
+    async def _run(self):
+        while True:
+            await self._slots.acquire()
+            item = await self._queue.get()
+            if item is None:
+                self._slots.release()
+                return
+            batch = [item]
+            # With no batch running the model is idle, so take only what is already queued;
+            # otherwise wait up to max_wait from the oldest request, which bounds queue delay
+            idle = len(self._flushes) == 0
+            deadline = item[3] + (0 if idle else self.max_wait)
+            stopping = False
+
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    item = self._queue.get_nowait()
+                else:
+                    timeout = deadline - time.perf_counter()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if stopping:
+                # Requests queued behind the stop marker still get answered
+                while not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if item is not None:
+                        batch.append(item)
+
+            flush = asyncio.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[Tuple[CreditScoringModel, Dict[str, Any], asyncio.Future, float, bool]]):
+        started = time.perf_counter()
+        self.batches += 1
+        self.batch_size.observe(len(batch))
+        for _, _, _, enqueued_at, _ in batch:
+            self.queue_delay_ms.observe((started - enqueued_at) * 1000)
+
+        try:
+            # A model reload can leave requests for two models in one window, and only some requests
+            # ask for contributions; batch each model and explanation level separately
+            by_model: Dict[Tuple[int, bool], List[int]] = {}
+            for i, (credit_model, _, _, _, include_contributions) in enumerate(batch):
+                by_model.setdefault((id(credit_model), include_contributions), []).append(i)
+
+            for (_, include_contributions), indexes in by_model.items():
+                credit_model = batch[indexes[0]][0]
+                try:
+                    predictions = await run_blocking(
+                        credit_model.predict_credit_scores_batch, [batch[i][1] for i in indexes], include_contributions
+                    )
+                except Exception as e:
+                    self.failed_batches += 1
+                    logger.error(f"Micro-batch of {len(indexes)} predictions failed: {e}")
+                    await self._predict_each(credit_model, [batch[i] for i in indexes], e)
+                    continue
+
+                self.predictions += len(indexes)
+                for i, prediction in zip(indexes, predictions):
+                    future = batch[i][2]
+                    if not future.done():
+                        future.set_result(prediction)
+        finally:
+            self._slots.release()
+
+    async def _predict_each(self, credit_model: CreditScoringModel, items: list, error: Exception):
+        """Retry a failed batch one request at a time so one bad row fails only its own caller"""
+        # A busy executor (503) would turn every retry away too
+        if len(items) == 1 or isinstance(error, HTTPException):
+            for _, _, future, _, _ in items:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for _, user_data, future, _, include_contributions in items:
+            try:
+                prediction = await run_blocking(credit_model.predict_credit_score, user_data, include_contributions)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            self.predictions += 1
+            if not future.done():
+                future.set_result(prediction)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "predictions": self.predictions,
+            "failed_batches": self.failed_batches,
+            "batch_size": self.batch_size.stats(),
+            "queue_delay_ms": self.queue_delay_ms.stats(),
+        }
+
+MICRO_BATCH_ENABLED = os.getenv("MICRO_BATCH", "false").lower() == "true"
+
+micro_batcher = MicroBatcher(
+    max_batch=int(os.getenv("MICRO_BATCH_MAX_SIZE", "64")),
+    max_wait_ms=float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2")),
+    max_in_flight=int(os.getenv("MICRO_BATCH_MAX_IN_FLIGHT", "2"))
+)
+
+async def predict_credit_score(
+    credit_model: CreditScoringModel,
+    user_data: Dict[str, Any],
+    include_contributions: bool = False
+) -> Dict[str, Any]:
+    """Predict one user's score, through the micro-batcher when it is enabled"""
+    if micro_batcher.running:
+        return await micro_batcher.submit(credit_model, user_data, include_contributions)
+    return await run_blocking(credit_model.predict_credit_score, user_data, include_contributions)
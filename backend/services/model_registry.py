@@ -0,0 +1,102 @@
+import threading
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any
+from fastapi import HTTPException, status
+
+from .ai_models import CreditScoringModel
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """Process-wide holder of the active CreditScoringModel.
+
+    Requests take a reference to the current model once, so swapping in a
+    reloaded model never affects requests that are already in flight; the old
+    model is released when the last of them finishes.
+    """
+    
+    def __init__(self):
+        self._model: Optional[CreditScoringModel] = None
+        self._lock = threading.Lock()
+        self.loading = False
+        self.load_error: Optional[str] = None
+        self.ready_since: Optional[datetime] = None
+    
+    @property
+    def model(self) -> Optional[CreditScoringModel]:
+        return self._model
+    
+    @property
+    def ready(self) -> bool:
+        """True once a model is loaded and has served a warm-up prediction"""
+        return self.ready_since is not None
+    
+    def load(self, train_if_missing: bool = True) -> CreditScoringModel:
+        """Load and warm up the model once; later calls return the already loaded model"""
+        with self._lock:
+            if self._model is None:
+                self.loading = True
+                try:
+                    credit_model = CreditScoringModel()
+                    credit_model.load_models(train_if_missing=train_if_missing)
+                    warm_up_score = credit_model.warm_up()
+                    self._model = credit_model
+                    self.load_error = None
+                    self.ready_since = datetime.utcnow()
+                    logger.info(
+                        f"Credit model {credit_model.model_version} registered (warm-up score {warm_up_score:.1f})"
+                    )
+                except Exception as e:
+                    self.load_error = str(e)
+                    raise
+                finally:
+                    self.loading = False
+            return self._model
+    
+    def reload(self, model_version: Optional[str] = None) -> CreditScoringModel:
+        """Load the current artifacts from disk into a new model and swap it in atomically"""
+        credit_model = CreditScoringModel()
+        if model_version:
+            credit_model.model_version = model_version
+        
+        # Build and warm up the replacement outside the lock; a failed reload keeps the current model
+        credit_model.load_models(train_if_missing=False)
+        credit_model.warm_up()
+        
+        with self._lock:
+            previous = self._model
+            self._model = credit_model
+            self.ready_since = datetime.utcnow()
+        
+        # Requests still holding the previous model fall back to scoring in process
+        if previous is not None:
+            previous.close()
+        
+        logger.info(
+            f"Credit model reloaded: {previous.model_version if previous else None} -> {credit_model.model_version}"
+        )
+        return credit_model
+    
+    def status(self) -> Dict[str, Any]:
+        """Readiness details for the /ready endpoint"""
+        return {
+            "ready": self.ready,
+            "loading": self.loading,
+            "model_version": self._model.model_version if self._model else None,
+            "ready_since": self.ready_since.isoformat() if self.ready_since else None,
+            "error": self.load_error,
+        }
+
+# Single registry shared by every router in the process
+model_registry = ModelRegistry()
+
+def get_credit_model() -> CreditScoringModel:
+    """FastAPI dependency returning the active credit scoring model"""
+    credit_model = model_registry.model
+    if credit_model is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Credit scoring model is not loaded"
+        )
+    return credit_model
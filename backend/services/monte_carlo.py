@@ -0,0 +1,198 @@
+import asyncio
+import os
+import logging
+import secrets
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Optional
+
+import numpy as np
+
+from .ai_models import FEATURE_INDEX, FEATURE_NAMES, CreditScoringModel, refresh_derived_features
+from .scoring_workers import ScoringProcessPool, worker_model
+from ..utils.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Scores are clipped to 300-850; distributions are kept as 1-point histograms per month
+SCORE_MIN, SCORE_MAX = 300, 850
+N_BINS = SCORE_MAX - SCORE_MIN
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Share of monthly income that continues while unemployed (benefits, other household income)
+UNEMPLOYED_INCOME_SHARE = 0.3
+
+# Runs of at least MONTE_CARLO_POOL_MIN_PATHS go to a process pool when MONTE_CARLO_WORKERS > 0
+MONTE_CARLO_WORKERS = int(os.getenv("MONTE_CARLO_WORKERS", "0"))
+MONTE_CARLO_POOL_MIN_PATHS = int(os.getenv("MONTE_CARLO_POOL_MIN_PATHS", "20000"))
+
+monte_carlo_pool = ScoringProcessPool(MONTE_CARLO_WORKERS)
+
+def simulate_chunk(
+    credit_model: CreditScoringModel,
+    base_features: np.ndarray,
+    config: Dict[str, Any],
+    n_paths: int,
+    seed: np.random.SeedSequence
+) -> Dict[str, Any]:
+    """Advance ``n_paths`` life-event paths month by month and score every path-month.
+
+    All paths move together as columns of one feature matrix. Each month a
+    path can lose or regain its job, take an expense shock (rate rise) and
+    see income drift; the monthly surplus or deficit flows through savings
+    and, once savings run out, onto the credit card, where a balance over the
+    limit counts as a late payment. The (months x n_paths) scores are scored
+    in one call and returned as per-month histograms and threshold counts.
+    """
+    rng = np.random.default_rng(seed)
+    months = config['months']
+    features = np.tile(np.asarray(base_features, dtype=np.float64), (n_paths, 1))
+    col = lambda name: features[:, FEATURE_INDEX[name]]
+
+    base_income = col('monthly_income').copy()
+    base_expenses = col('monthly_expenses').copy()
+    base_salary = col('salary').copy()
+    base_stability = col('job_stability_score').copy()
+
+    employed = np.ones(n_paths, dtype=bool)
+    income_factor = np.ones(n_paths)
+    expense_factor = np.ones(n_paths)
+    volatility = config['income_volatility']
+    path_months = np.empty((months, n_paths, len(FEATURE_NAMES)))
+
+    for month in range(months):
+        lose_job = employed & (rng.random(n_paths) < config['job_loss_probability'])
+        find_job = ~employed & (rng.random(n_paths) < config['reemployment_probability'])
+        employed = (employed & ~lose_job) | find_job
+
+        rate_shock = rng.random(n_paths) < config['rate_shock_probability']
+        expense_factor[rate_shock] *= 1 + config['rate_shock_expense_increase']
+        income_factor *= rng.lognormal(-volatility ** 2 / 2, volatility, n_paths)
+
+        income = base_income * income_factor * np.where(employed, 1.0, UNEMPLOYED_INCOME_SHARE)
+        expenses = base_expenses * expense_factor
+        col('monthly_income')[:] = income
+        col('monthly_expenses')[:] = expenses
+        col('salary')[:] = np.where(employed, base_salary * income_factor, 0.0)
+        col('job_stability_score')[:] = np.where(employed, base_stability, 0.0)
+
+        savings = col('savings_balance') + income - expenses
+        col('credit_card_balance')[:] += np.maximum(0, -savings)
+        col('savings_balance')[:] = np.maximum(0, savings)
+        col('late_payments')[:] += col('credit_card_balance') > col('credit_card_limit')
+
+        path_months[month] = refresh_derived_features(features)
+
+    scores = credit_model.score_feature_matrix(path_months.reshape(-1, len(FEATURE_NAMES))).reshape(months, n_paths)
+
+    bins = np.clip((scores - SCORE_MIN).astype(np.int64), 0, N_BINS - 1) + np.arange(months)[:, None] * N_BINS
+    threshold = config['threshold']
+    return {
+        "paths": n_paths,
+        "histogram": np.bincount(bins.ravel(), minlength=months * N_BINS).reshape(months, N_BINS),
+        "score_sum": scores.sum(axis=1),
+        "above": (scores >= threshold).sum(axis=1),
+        "stays_above": int((scores.min(axis=0) >= threshold).sum()),
+    }
+
+def _pool_simulate_chunk(base_features: np.ndarray, config: Dict[str, Any], n_paths: int, seed: np.random.SeedSequence) -> Dict[str, Any]:
+    return simulate_chunk(worker_model(), base_features, config, n_paths, seed)
+
+def histogram_percentiles(histogram: np.ndarray, percentiles=PERCENTILES) -> Dict[str, np.ndarray]:
+    """Per-row percentiles of 1-point score histograms, interpolated within the bin"""
+    cumulative = np.cumsum(histogram, axis=1)
+    rows = np.arange(len(histogram))
+    bands = {}
+    for q in percentiles:
+        target = q / 100 * cumulative[:, -1]
+        index = np.minimum((cumulative < target[:, None]).sum(axis=1), N_BINS - 1)
+        below = np.where(index > 0, cumulative[rows, index - 1], 0)
+        count = histogram[rows, index]
+        fraction = np.divide(target - below, count, out=np.zeros(len(histogram)), where=count > 0)
+        bands[f"p{q}"] = SCORE_MIN + index + fraction
+    return bands
+
+class ScoreDistribution:
+    """Running per-month score distribution over every path simulated so far.
+
+    Memory is a fixed (months x 550) histogram plus a few counters, however
+    many paths are added.
+    """
+
+    def __init__(self, months: int, threshold: float):
+        self.threshold = threshold
+        self.paths = 0
+        self.histogram = np.zeros((months, N_BINS), dtype=np.int64)
+        self.score_sum = np.zeros(months)
+        self.above = np.zeros(months, dtype=np.int64)
+        self.stays_above = 0
+
+    def add(self, chunk: Dict[str, Any]):
+        self.paths += chunk["paths"]
+        self.histogram += chunk["histogram"]
+        self.score_sum += chunk["score_sum"]
+        self.above += chunk["above"]
+        self.stays_above += chunk["stays_above"]
+
+    def snapshot(self) -> Dict[str, Any]:
+        bands = histogram_percentiles(self.histogram)
+        return {
+            "paths": self.paths,
+            "months": list(range(1, len(self.histogram) + 1)),
+            "percentiles": {name: np.round(values, 2).tolist() for name, values in bands.items()},
+            "mean": np.round(self.score_sum / self.paths, 2).tolist(),
+            "prob_above_threshold": np.round(self.above / self.paths, 4).tolist(),
+            "prob_stays_above_threshold": round(self.stays_above / self.paths, 4),
+        }
+
+async def run_monte_carlo(
+    credit_model: CreditScoringModel,
+    base_features: np.ndarray,
+    config: Dict[str, Any],
+    n_paths: int,
+    chunk_size: int,
+    seed: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Simulate ``n_paths`` in chunks and yield a distribution snapshot as each chunk lands.
+
+    Each chunk draws from its own child of one SeedSequence, so a given seed
+    reproduces the same distribution whether chunks run inline or on the
+    process pool, in any order. Only a bounded number of chunks is in flight.
+    Without a seed one is drawn (53 bits, so JavaScript numbers hold it exactly)
+    and reported in every snapshot so the run can be reproduced.
+    """
+    if seed is None:
+        seed = secrets.randbits(53)
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    chunks = deque(zip(sizes, seed_sequence.spawn(len(sizes))))
+    distribution = ScoreDistribution(config['months'], config['threshold'])
+
+    if monte_carlo_pool.enabled and n_paths >= MONTE_CARLO_POOL_MIN_PATHS:
+        executor = monte_carlo_pool.executor(credit_model)
+        loop = asyncio.get_running_loop()
+        submit = lambda size, chunk_seed: loop.run_in_executor(
+            executor, _pool_simulate_chunk, base_features, config, size, chunk_seed
+        )
+        max_in_flight = 2 * monte_carlo_pool.max_workers
+    else:
+        submit = lambda size, chunk_seed: asyncio.ensure_future(
+            run_blocking(simulate_chunk, credit_model, base_features, config, size, chunk_seed)
+        )
+        max_in_flight = 1
+
+    pending = set()
+    try:
+        while chunks or pending:
+            while chunks and len(pending) < max_in_flight:
+                pending.add(submit(*chunks.popleft()))
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                distribution.add(task.result())
+            yield {
+                **distribution.snapshot(),
+                "seed": seed,
+                "done": not chunks and not pending,
+            }
+    finally:
+        for task in pending:
+            task.cancel()
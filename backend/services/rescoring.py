@@ -0,0 +1,154 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+
+from ..database import Base, SessionLocal, engine
+from ..models import credit_models, user_models
+from ..models.job_models import RescoreCheckpoint
+from .assessment_payloads import compact_assessment_rows
+from .scoring_workers import init_worker, worker_model
+from .transaction_rollups import cash_flow_features_sync
+from .user_data import apply_cash_flow, build_user_data
+
+logger = logging.getLogger(__name__)
+
+def _score_chunk(users: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Batch-score one chunk and return CreditAssessment rows ready for a bulk insert"""
+    predictions = worker_model().predict_credit_scores_batch([user_data for _, user_data in users])
+    return [
+        {
+            'user_id': user_id,
+            'credit_score': prediction['credit_score'],
+            'risk_category': prediction['risk_category'],
+            'confidence_score': prediction['confidence_score'],
+            'financial_score': prediction['financial_score'],
+            'career_score': prediction['career_score'],
+            'housing_score': prediction['housing_score'],
+            'social_score': prediction['social_score'],
+            'factor_breakdown': prediction['factor_breakdown'],
+            'recommendations': prediction['recommendations'],
+            'risk_factors': prediction['risk_factors'],
+            'model_version': prediction['model_version'],
+        }
+        for (user_id, _), prediction in zip(users, predictions)
+    ]
+
+def rescore_portfolio(
+    model_version: str,
+    chunk_size: int = 1000,
+    workers: int = 0,
+    restart: bool = False,
+    models_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """Write a new CreditAssessment for every user under ``model_version``.
+
+    Users are streamed in user_id order through a server-side cursor, one
+    chunk at a time, and scored on ``workers`` processes (0 scores in this
+    process). At most two chunks per worker are in flight, so memory does not
+    grow with the portfolio. Each chunk's assessments are bulk-inserted in
+    the same transaction that advances the run's checkpoint, so a killed run
+    resumes after the last committed user without duplicating rows.
+    """
+    Base.metadata.create_all(bind=engine, tables=[RescoreCheckpoint.__table__])
+    reader = SessionLocal()
+    writer = SessionLocal()
+    pool: Optional[ProcessPoolExecutor] = None
+
+    try:
+        checkpoint = writer.get(RescoreCheckpoint, model_version)
+        if checkpoint is None:
+            checkpoint = RescoreCheckpoint(model_version=model_version, last_user_id=0, rows_written=0, status="running")
+            writer.add(checkpoint)
+        elif restart:
+            checkpoint.last_user_id, checkpoint.rows_written, checkpoint.status = 0, 0, "running"
+        elif checkpoint.status == "completed":
+            logger.info(f"Rescore for {model_version} already completed ({checkpoint.rows_written} rows); use restart to run again")
+            return {"model_version": model_version, "rows_written": 0, "resumed_from": checkpoint.last_user_id, "rows_per_second": 0.0}
+        writer.commit()
+
+        resumed_from = checkpoint.last_user_id
+        if resumed_from:
+            logger.info(f"Resuming rescore for {model_version} after user {resumed_from}")
+
+        if workers > 0:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(models_dir, model_version))
+        else:
+            init_worker(models_dir, model_version)
+
+        in_flight: "deque[Tuple[Future, int]]" = deque()
+        max_in_flight = max(1, 2 * workers)
+        written = 0
+        started = time.perf_counter()
+
+        def commit_oldest():
+            nonlocal written
+            future, last_user_id = in_flight.popleft()
+            rows = future.result()
+            if rows:
+                compact_assessment_rows(writer, rows)
+                writer.execute(insert(credit_models.CreditAssessment), rows)
+            checkpoint.last_user_id = last_user_id
+            checkpoint.rows_written += len(rows)
+            writer.commit()
+            written += len(rows)
+            elapsed = time.perf_counter() - started
+            logger.info(f"Rescored {written} users through user {last_user_id} ({written / elapsed:.0f} rows/s)")
+
+        stream = reader.execute(
+            select(user_models.UserProfile, credit_models.CreditHistory).outerjoin(
+                credit_models.CreditHistory,
+                credit_models.CreditHistory.user_id == user_models.UserProfile.user_id
+            ).where(
+                user_models.UserProfile.user_id > resumed_from
+            ).order_by(
+                user_models.UserProfile.user_id
+            ).execution_options(yield_per=chunk_size)
+        )
+
+        last_seen = None
+        for partition in stream.partitions():
+            users = []
+            for user_profile, credit_history in partition:
+                # A user with several credit history rows appears more than once; keep the first
+                if user_profile.user_id == last_seen:
+                    continue
+                last_seen = user_profile.user_id
+                users.append((user_profile.user_id, build_user_data(user_profile, credit_history)))
+            if not users:
+                continue
+
+            cash_flow = cash_flow_features_sync(writer, [user_id for user_id, _ in users])
+            for user_id, user_data in users:
+                apply_cash_flow(user_data, cash_flow.get(user_id))
+
+            if pool is not None:
+                in_flight.append((pool.submit(_score_chunk, users), users[-1][0]))
+            else:
+                future = Future()
+                future.set_result(_score_chunk(users))
+                in_flight.append((future, users[-1][0]))
+
+            while len(in_flight) >= max_in_flight:
+                commit_oldest()
+
+        while in_flight:
+            commit_oldest()
+
+        checkpoint.status = "completed"
+        writer.commit()
+
+        elapsed = time.perf_counter() - started
+        rate = written / elapsed if elapsed > 0 else 0.0
+        logger.info(f"Rescore for {model_version} completed: {written} rows in {elapsed:.1f}s ({rate:.0f} rows/s)")
+        return {"model_version": model_version, "rows_written": written, "resumed_from": resumed_from, "rows_per_second": round(rate, 1)}
+
+    finally:
+        # A failed chunk or commit must not leave workers scoring chunks nobody will commit
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        reader.close()
+        writer.close()
@@ -0,0 +1,163 @@
+import os
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .ai_models import FEATURE_INDEX, HOUSING_STATUS_CODES, refresh_derived_features
+from .prediction_cache import PredictionCache
+
+SCENARIO_TYPES = ("salary_increase", "job_change", "house_purchase", "debt_reduction", "expense_reduction")
+
+# Numeric parameters a sweep can vary per scenario type, with the defaults apply_scenario uses
+# (job_change's None stands for the user's current salary)
+SWEEP_PARAMETERS = {
+    "salary_increase": {"salary_increase": 0},
+    "job_change": {"new_salary": None},
+    "house_purchase": {"property_value": 300000, "down_payment": 60000, "monthly_payment": 1500},
+    "debt_reduction": {"debt_reduction": 0},
+    "expense_reduction": {"expense_reduction": 0},
+}
+
+# Sweep results by (user_id, model version key, grid, base features)
+sweep_cache = PredictionCache(
+    max_size=int(os.getenv("SWEEP_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("SWEEP_CACHE_TTL_SECONDS", "300"))
+)
+
+def apply_scenario(user_data: Dict[str, Any], scenario_type: str, parameters: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Return a modified copy of ``user_data`` and a description of each changed factor.
+
+    ``user_data`` is not mutated, so a chained scenario is the result of one
+    step fed into the next. Raises ValueError for an unknown scenario type.
+    """
+    modified_data = user_data.copy()
+    factor_changes = {}
+
+    if scenario_type == "salary_increase":
+        salary_increase = parameters.get('salary_increase', 0)
+        modified_data['salary'] += salary_increase
+        modified_data['monthly_income'] += salary_increase / 12
+        factor_changes['salary'] = f"+${salary_increase:,.0f}"
+        factor_changes['monthly_income'] = f"+${salary_increase/12:,.0f}"
+
+    elif scenario_type == "job_change":
+        new_salary = parameters.get('new_salary', user_data['salary'])
+        new_industry = parameters.get('new_industry', user_data['industry'])
+        modified_data['salary'] = new_salary
+        modified_data['monthly_income'] = new_salary / 12
+        modified_data['industry'] = new_industry
+        factor_changes['salary'] = f"${new_salary:,.0f} (was ${user_data['salary']:,.0f})"
+        factor_changes['industry'] = f"{new_industry} (was {user_data['industry']})"
+
+    elif scenario_type == "house_purchase":
+        property_value = parameters.get('property_value', 300000)
+        down_payment = parameters.get('down_payment', 60000)
+        monthly_payment = parameters.get('monthly_payment', 1500)
+
+        modified_data['housing_status'] = 'mortgaged'
+        modified_data['property_value'] = property_value
+        modified_data['mortgage_payment'] = monthly_payment
+        modified_data['savings_balance'] -= down_payment
+
+        factor_changes['housing_status'] = "mortgaged (was renting)"
+        factor_changes['property_value'] = f"${property_value:,.0f}"
+        factor_changes['monthly_expenses'] = f"+${monthly_payment:,.0f} mortgage"
+        factor_changes['savings_balance'] = f"-${down_payment:,.0f} down payment"
+
+    elif scenario_type == "debt_reduction":
+        debt_reduction = parameters.get('debt_reduction', 0)
+        modified_data['credit_card_balance'] = max(0, user_data['credit_card_balance'] - debt_reduction)
+        modified_data['savings_balance'] -= debt_reduction
+        factor_changes['credit_card_balance'] = f"-${debt_reduction:,.0f}"
+        factor_changes['savings_balance'] = f"-${debt_reduction:,.0f}"
+
+    elif scenario_type == "expense_reduction":
+        expense_reduction = parameters.get('expense_reduction', 0)
+        modified_data['monthly_expenses'] = max(0, user_data['monthly_expenses'] - expense_reduction)
+        factor_changes['monthly_expenses'] = f"-${expense_reduction:,.0f}"
+
+    else:
+        raise ValueError(f"Unknown scenario type: {scenario_type}")
+
+    return modified_data, factor_changes
+
+def apply_scenarios(user_data: Dict[str, Any], steps: Iterable[Tuple[str, Dict[str, Any]]]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Apply (scenario_type, parameters) steps in order, merging their factor changes"""
+    factor_changes: Dict[str, str] = {}
+    for scenario_type, parameters in steps:
+        user_data, step_changes = apply_scenario(user_data, scenario_type, parameters)
+        for factor, change in step_changes.items():
+            factor_changes[factor] = f"{factor_changes[factor]}; {change}" if factor in factor_changes else change
+    return user_data, factor_changes
+
+def scenario_recommendations(scenario_types: Iterable[str], score_change: float) -> List[str]:
+    """Recommendations for a simulated score change and the scenario steps behind it"""
+    recommendations = []
+    if score_change > 0:
+        recommendations.append(f"This scenario would improve your credit score by {score_change:.0f} points")
+    elif score_change < 0:
+        recommendations.append(f"This scenario would decrease your credit score by {abs(score_change):.0f} points")
+    else:
+        recommendations.append("This scenario would have minimal impact on your credit score")
+
+    # Add scenario-specific recommendations
+    for scenario_type in dict.fromkeys(scenario_types):
+        if scenario_type == "salary_increase":
+            recommendations.append("Higher income typically improves creditworthiness and borrowing capacity")
+        elif scenario_type == "house_purchase":
+            if score_change > 0:
+                recommendations.append("Homeownership can improve credit scores through consistent mortgage payments")
+            else:
+                recommendations.append("Consider the impact of additional debt on your overall financial health")
+        elif scenario_type == "debt_reduction":
+            recommendations.append("Reducing debt improves your debt-to-income ratio and credit utilization")
+
+    return recommendations
+
+def scenario_feature_matrix(base_features: np.ndarray, scenario_type: str, parameters: Dict[str, Any]) -> np.ndarray:
+    """Vectorized ``apply_scenario`` over prepared feature vectors.
+
+    ``parameters`` maps each of the scenario's SWEEP_PARAMETERS to a scalar or
+    to an array with one value per output row; the base vector is tiled to the
+    common length and every row gets the scenario applied with its own values.
+    """
+    n_rows = max((np.size(value) for value in parameters.values()), default=1)
+    features = np.tile(np.asarray(base_features, dtype=np.float64), (n_rows, 1))
+    col = lambda name: features[:, FEATURE_INDEX[name]]
+    param = lambda name: np.asarray(parameters[name], dtype=np.float64)
+
+    if scenario_type == "salary_increase":
+        col('salary')[:] += param('salary_increase')
+        col('monthly_income')[:] += param('salary_increase') / 12
+
+    elif scenario_type == "job_change":
+        col('salary')[:] = param('new_salary')
+        col('monthly_income')[:] = param('new_salary') / 12
+
+    elif scenario_type == "house_purchase":
+        col('housing_status_encoded')[:] = HOUSING_STATUS_CODES['mortgaged']
+        col('property_value')[:] = param('property_value')
+        col('mortgage_payment')[:] = param('monthly_payment')
+        col('savings_balance')[:] -= param('down_payment')
+
+    elif scenario_type == "debt_reduction":
+        col('savings_balance')[:] -= param('debt_reduction')
+        col('credit_card_balance')[:] = np.maximum(0, col('credit_card_balance') - param('debt_reduction'))
+
+    elif scenario_type == "expense_reduction":
+        col('monthly_expenses')[:] = np.maximum(0, col('monthly_expenses') - param('expense_reduction'))
+
+    else:
+        raise ValueError(f"Unknown scenario type: {scenario_type}")
+
+    return refresh_derived_features(features)
+
+def sweep_grid(axes: List[Tuple[str, float, float, int]]) -> Tuple[List[np.ndarray], Dict[str, np.ndarray]]:
+    """Axis values and the flattened per-point value of each swept parameter.
+
+    Points are ordered row-major over the axes, so scores reshape to
+    ``(len(axis_0), len(axis_1))``.
+    """
+    values = [np.linspace(start, stop, steps) for _, start, stop, steps in axes]
+    mesh = np.meshgrid(*values, indexing='ij')
+    return values, {name: grid.ravel() for (name, *_), grid in zip(axes, mesh)}
@@ -0,0 +1,84 @@
+import multiprocessing
+import os
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .ai_models import CreditScoringModel
+
+logger = logging.getLogger(__name__)
+
+# Model instance owned by each pool worker (or the main process when running inline)
+_worker_model: Optional[CreditScoringModel] = None
+
+def init_worker(models_dir: Optional[str], model_version: str, artifact_digest: Optional[str] = None):
+    """Load the model artifacts once per worker process, checking they are the expected ones if given"""
+    global _worker_model
+    if models_dir:
+        os.environ["MODELS_DIR"] = models_dir
+    credit_model = CreditScoringModel()
+    credit_model.load_models(train_if_missing=False)
+    if artifact_digest is not None and credit_model.artifact_digest != artifact_digest:
+        raise RuntimeError(
+            f"Model artifacts changed on disk ({credit_model.artifact_digest}, expected {artifact_digest})"
+        )
+    credit_model.model_version = model_version
+    # Workers score many distinct rows once each, so caching predictions would only cost memory
+    credit_model.prediction_cache.max_size = 0
+    # Already one of a pool of processes; score in process rather than start a nested inference pool
+    if credit_model.scoring_backend == "process":
+        credit_model.scoring_backend = "numpy"
+    _worker_model = credit_model
+
+def worker_model() -> CreditScoringModel:
+    """The model loaded by ``init_worker`` in this process"""
+    if _worker_model is None:
+        raise RuntimeError("Scoring worker was not initialized")
+    return _worker_model
+
+class ScoringProcessPool:
+    """Lazily started process pool whose workers each hold a loaded model.
+
+    Workers are spawned rather than forked (the server process runs threads)
+    and are tied to one model (its ``version_key``): asking for another, e.g.
+    after a model reload, replaces the pool. The replaced pool finishes the
+    work already queued on it, so other callers' runs are not cut short; a
+    broken pool is replaced on the next request.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._version_key: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def executor(self, credit_model: CreditScoringModel) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is not None and getattr(self._executor, "_broken", False):
+                logger.warning(f"Replacing broken scoring process pool: {self._executor._broken}")
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._executor is not None and self._version_key != credit_model.version_key:
+                logger.info(f"Replacing scoring process pool for model {self._version_key} with {credit_model.version_key}")
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                    initargs=(None, credit_model.model_version, credit_model.artifact_digest)
+                )
+                self._version_key = credit_model.version_key
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
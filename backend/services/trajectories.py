@@ -0,0 +1,136 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .ai_models import FEATURE_INDEX, FEATURE_NAMES, CreditScoringModel, refresh_derived_features
+
+# Monthly plan actions, each an amount in dollars per month unless noted:
+#   card_payment            extra payment toward the credit card balance
+#   loan_payment            extra payment toward loan principal
+#   savings_contribution    transfer into savings
+#   expense_reduction       cut to monthly expenses
+#   income_increase         rise in monthly income (salary moves with it)
+#   late_payment_reduction  count of existing late payments kept off the record that month
+TRAJECTORY_ACTIONS = (
+    "card_payment", "loan_payment", "savings_contribution", "expense_reduction", "income_increase",
+    "late_payment_reduction"
+)
+
+# Minimum card payments and scheduled loan payments are taken to be part of
+# monthly_expenses, so untouched balances shrink by these shares each month
+CARD_MINIMUM_PAYMENT_RATE = 0.01
+LOAN_AMORTIZATION_RATE = 0.01
+
+# Feature columns reported for the last projected month of each plan
+FINAL_STATE_FEATURES = (
+    'savings_balance', 'credit_card_balance', 'loan_balance', 'late_payments',
+    'credit_utilization', 'debt_to_income'
+)
+
+def plan_amounts(steps: List[Dict[str, Any]], months: int) -> Dict[str, np.ndarray]:
+    """Per-month amount of every action for one plan.
+
+    Each step is ``{"action", "amount", "start_month", "end_month"}`` with
+    1-based inclusive months (no end month runs to the horizon); overlapping
+    steps for the same action add up. Raises ValueError for an unknown action.
+    """
+    amounts = {action: np.zeros(months) for action in TRAJECTORY_ACTIONS}
+    for step in steps:
+        if step['action'] not in amounts:
+            raise ValueError(f"Unknown plan action: {step['action']}")
+        start = max(step.get('start_month', 1), 1) - 1
+        end = step.get('end_month') or months
+        amounts[step['action']][start:end] += step['amount']
+    return amounts
+
+def plan_from_changes(changes: List[Dict[str, Any]], months: int = 12) -> List[Dict[str, Any]]:
+    """Monthly plan steps carrying out a counterfactual change set over ``months``.
+
+    A card pay-down is spread evenly over the horizon; expense cuts, income
+    raises and avoided late payments apply from the first month, so the last
+    month reflects the whole change set.
+    """
+    steps = []
+    for change in changes:
+        if change['lever'] == 'pay_down_card':
+            steps.append({"action": "card_payment", "amount": change['amount'] / months, "start_month": 1})
+        elif change['lever'] == 'cut_expenses':
+            steps.append({"action": "expense_reduction", "amount": change['amount'], "start_month": 1})
+        elif change['lever'] == 'raise_income':
+            steps.append({"action": "income_increase", "amount": change['amount'], "start_month": 1})
+        elif change['lever'] == 'avoid_late_payments':
+            steps.append({"action": "late_payment_reduction", "amount": change['amount'], "start_month": 1})
+    return steps
+
+def project_trajectories(
+    credit_model: CreditScoringModel,
+    base_features: np.ndarray,
+    plans: List[List[Dict[str, Any]]],
+    months: int
+) -> Dict[str, Any]:
+    """Roll the feature vector forward month by month under each plan and score every state.
+
+    All plans advance together as rows of one matrix. Each month the plan's
+    extra payments and savings transfers are funded from the monthly surplus,
+    then from savings, and any remaining shortfall goes onto the credit card,
+    where a balance over the limit adds a late payment; late payment
+    reductions take that many of the existing ones off the record. Balances
+    amortize, and experience and age advance a month. The (months x plans) states are
+    scored in a single call.
+    """
+    n_plans = len(plans)
+    schedule = [plan_amounts(steps, months) for steps in plans]
+    action = lambda name: np.stack([amounts[name] for amounts in schedule])
+
+    card_payment, loan_payment = action('card_payment'), action('loan_payment')
+    savings_contribution = action('savings_contribution')
+    expense_reduction, income_increase = action('expense_reduction'), action('income_increase')
+    late_payment_reduction = action('late_payment_reduction')
+
+    features = np.tile(np.asarray(base_features, dtype=np.float64), (n_plans, 1))
+    col = lambda name: features[:, FEATURE_INDEX[name]]
+    base_income = col('monthly_income').copy()
+    base_expenses = col('monthly_expenses').copy()
+    base_salary = col('salary').copy()
+    base_late_payments = col('late_payments').copy()
+    new_late_payments = np.zeros(n_plans)
+    states = np.empty((months, n_plans, len(FEATURE_NAMES)))
+
+    for month in range(months):
+        income = base_income + income_increase[:, month]
+        expenses = np.maximum(0, base_expenses - expense_reduction[:, month])
+        col('monthly_income')[:] = income
+        col('monthly_expenses')[:] = expenses
+        col('salary')[:] = base_salary + income_increase[:, month] * 12
+
+        col('credit_card_balance')[:] *= 1 - CARD_MINIMUM_PAYMENT_RATE
+        col('loan_balance')[:] *= 1 - LOAN_AMORTIZATION_RATE
+        card_paid = np.minimum(col('credit_card_balance'), card_payment[:, month])
+        loan_paid = np.minimum(col('loan_balance'), loan_payment[:, month])
+        col('credit_card_balance')[:] -= card_paid
+        col('loan_balance')[:] -= loan_paid
+
+        # Unallocated surplus is not assumed saved; a shortfall draws on savings, then the card
+        shortfall = np.minimum(0, income - expenses - card_paid - loan_paid - savings_contribution[:, month])
+        savings = col('savings_balance') + savings_contribution[:, month] + shortfall
+        col('credit_card_balance')[:] += np.maximum(0, -savings)
+        col('savings_balance')[:] = np.maximum(0, savings)
+        new_late_payments += col('credit_card_balance') > col('credit_card_limit')
+        kept = np.maximum(0, base_late_payments - late_payment_reduction[:, month])
+        col('late_payments')[:] = kept + new_late_payments
+
+        col('years_experience')[:] += 1 / 12
+        col('age')[:] += 1 / 12
+        states[month] = refresh_derived_features(features)
+
+    scores = credit_model.score_feature_matrix(
+        np.vstack([states.reshape(-1, len(FEATURE_NAMES)), base_features])
+    ).astype(np.float64)
+    return {
+        "current_score": float(scores[-1]),
+        "scores": scores[:-1].reshape(months, n_plans).T,
+        "final_states": [
+            {name: round(float(states[-1, i, FEATURE_INDEX[name]]), 4) for name in FINAL_STATE_FEATURES}
+            for i in range(n_plans)
+        ],
+    }
@@ -0,0 +1,177 @@
+import codecs
+import csv
+import json
+import os
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import credit_models
+from ..schemas.credit_schemas import TransactionCreate
+from .feature_store import feature_store
+from .transaction_rollups import apply_rollups_async
+
+logger = logging.getLogger(__name__)
+
+INGEST_CHUNK_SIZE = int(os.getenv("TRANSACTION_INGEST_CHUNK_SIZE", "1000"))
+INGEST_MAX_REPORTED_ERRORS = int(os.getenv("TRANSACTION_INGEST_MAX_ERRORS", "1000"))
+INGEST_MAX_LINE_LENGTH = int(os.getenv("TRANSACTION_INGEST_MAX_LINE_LENGTH", "65536"))
+
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines"}
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+
+def ingest_format(content_type: Optional[str]) -> Optional[str]:
+    """Map a request Content-Type to "ndjson" / "csv", or None if unsupported"""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    if media_type in CSV_CONTENT_TYPES:
+        return "csv"
+    return None
+
+async def _iter_lines(
+    stream: AsyncIterator[bytes],
+    max_line_length: int = INGEST_MAX_LINE_LENGTH
+) -> AsyncIterator[Tuple[int, str]]:
+    """Split a byte stream into numbered text lines without buffering the whole body.
+
+    Only newly arrived text is split; a partial line is kept as a list of
+    pieces until its newline comes. Raises HTTPException 413 as soon as a
+    line grows past ``max_line_length`` characters.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending: List[str] = []
+    pending_length = 0
+    line_no = 0
+
+    def too_long() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Line {line_no + 1} is longer than {max_line_length} characters"
+        )
+
+    async for chunk in stream:
+        *lines, tail = decoder.decode(chunk).split("\n")
+        if lines:
+            lines[0] = "".join(pending) + lines[0]
+            pending, pending_length = [], 0
+        for line in lines:
+            if len(line) > max_line_length:
+                raise too_long()
+            line_no += 1
+            yield line_no, line.rstrip("\r")
+        if tail:
+            pending.append(tail)
+            pending_length += len(tail)
+            if pending_length > max_line_length:
+                raise too_long()
+    pending.append(decoder.decode(b"", final=True))
+    line = "".join(pending)
+    if len(line) > max_line_length:
+        raise too_long()
+    if line:
+        yield line_no + 1, line.rstrip("\r")
+
+async def _iter_records(stream: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (line number, record dict) or (line number, error string) per data line.
+
+    CSV input needs a header row; quoted fields spanning several lines are not
+    supported since rows are parsed one line at a time.
+    """
+    header = None
+    async for line_no, line in _iter_lines(stream):
+        if not line.strip():
+            continue
+        if fmt == "ndjson":
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, "Expected a JSON object"
+                continue
+            yield line_no, record
+        else:
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield line_no, f"Expected {len(header)} columns, got {len(values)}"
+                continue
+            # Empty CSV cells mean "not provided" so optional fields fall back to None
+            yield line_no, {name: value for name, value in zip(header, values) if value != ""}
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+async def ingest_transactions(
+    stream: AsyncIterator[bytes],
+    fmt: str,
+    db: AsyncSession,
+    chunk_size: int = INGEST_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """Validate and insert a streamed NDJSON/CSV upload chunk by chunk.
+
+    Each chunk of valid rows goes in with one executemany insert, plus the
+    matching rollup increments, under its own commit, so memory stays bounded
+    by ``chunk_size`` and a bad row (or a failed chunk) is reported without
+    discarding the rest of the upload. An over-long line aborts the upload
+    with a 413; chunks committed before it stay inserted.
+    """
+    summary = {"received": 0, "inserted": 0, "failed": 0, "errors": [], "errors_truncated": 0}
+    chunk: List[Dict[str, Any]] = []
+    chunk_lines: List[int] = []
+
+    def record_error(line_no: int, message: str):
+        summary["failed"] += 1
+        if len(summary["errors"]) < INGEST_MAX_REPORTED_ERRORS:
+            summary["errors"].append({"line": line_no, "error": message})
+        else:
+            summary["errors_truncated"] += 1
+
+    async def flush():
+        if not chunk:
+            return
+        try:
+            await db.execute(insert(credit_models.Transaction), chunk)
+            await apply_rollups_async(db, chunk)
+            await db.commit()
+            summary["inserted"] += len(chunk)
+            feature_store.invalidate({row["user_id"] for row in chunk})
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Transaction ingest chunk of {len(chunk)} rows failed: {e}")
+            for line_no in chunk_lines:
+                record_error(line_no, f"Insert failed: {e}")
+        chunk.clear()
+        chunk_lines.clear()
+
+    async for line_no, record in _iter_records(stream, fmt):
+        summary["received"] += 1
+        if isinstance(record, str):
+            record_error(line_no, record)
+            continue
+        try:
+            transaction = TransactionCreate.model_validate(record)
+        except ValidationError as e:
+            record_error(line_no, _format_validation_error(e))
+            continue
+
+        row = transaction.model_dump()
+        row["transaction_type"] = transaction.transaction_type.value
+        chunk.append(row)
+        chunk_lines.append(line_no)
+        if len(chunk) >= chunk_size:
+            await flush()
+
+    await flush()
+    return summary
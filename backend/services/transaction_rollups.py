@@ -0,0 +1,221 @@
+import os
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import credit_models
+from ..models.rollup_models import TransactionRollup
+
+logger = logging.getLogger(__name__)
+
+# Scoring reads monthly income/expenses from the rollups when a user has transactions;
+# CASH_FLOW_MONTHS is how many of their most recent active months are averaged
+CASH_FLOW_FEATURES_ENABLED = os.getenv("CASH_FLOW_FEATURES", "true").lower() == "true"
+CASH_FLOW_MONTHS = int(os.getenv("CASH_FLOW_MONTHS", "3"))
+
+ROLLUP_KEY = ["user_id", "month", "transaction_type", "category"]
+
+# Rollup keys are normalized the same way whether built incrementally or rebuilt in SQL:
+# enum members store their value, and a missing or empty category is "uncategorized"
+UNCATEGORIZED = "uncategorized"
+
+def _type_value(transaction_type: Any) -> str:
+    return getattr(transaction_type, "value", transaction_type)
+
+def _category_value(category: Optional[str]) -> str:
+    return category or UNCATEGORIZED
+
+def _category_expression(column):
+    """SQL twin of ``_category_value``"""
+    return func.coalesce(func.nullif(column, ""), literal(UNCATEGORIZED))
+
+def rollup_deltas(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Collapse new transaction rows into one increment per rollup key"""
+    totals = defaultdict(lambda: [0.0, 0])
+    for row in rows:
+        key = (
+            row["user_id"],
+            row["transaction_date"].strftime("%Y-%m"),
+            _type_value(row["transaction_type"]),
+            _category_value(row.get("category")),
+        )
+        totals[key][0] += float(row["amount"])
+        totals[key][1] += 1
+    return [
+        dict(zip(ROLLUP_KEY, key), total_amount=total, transaction_count=count)
+        for key, (total, count) in totals.items()
+    ]
+
+def _upsert(dialect_name: str, deltas: List[Dict[str, Any]]):
+    """INSERT ... ON CONFLICT that adds each delta onto the existing rollup row, or None on other dialects"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(TransactionRollup).values(deltas)
+    return stmt.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={
+            "total_amount": TransactionRollup.total_amount + stmt.excluded.total_amount,
+            "transaction_count": TransactionRollup.transaction_count + stmt.excluded.transaction_count,
+            "updated_at": func.now(),
+        }
+    )
+
+def _update_or_insert(db: Session, deltas: List[Dict[str, Any]]):
+    """Portable ``_upsert``: read the affected keys, increment the rows that exist and insert the rest.
+
+    Unlike ON CONFLICT this is not atomic; a concurrent first write of the
+    same key fails one of the transactions on the unique constraint.
+    """
+    rollups = TransactionRollup.__table__
+    existing = {
+        tuple(row[:-1]): row[-1]
+        for row in db.execute(
+            select(*(rollups.c[name] for name in ROLLUP_KEY), rollups.c.id).where(
+                rollups.c.user_id.in_({delta["user_id"] for delta in deltas}),
+                rollups.c.month.in_({delta["month"] for delta in deltas})
+            )
+        )
+    }
+    increments, new_rows = [], []
+    for delta in deltas:
+        rollup_id = existing.get(tuple(delta[name] for name in ROLLUP_KEY))
+        if rollup_id is None:
+            new_rows.append(delta)
+        else:
+            increments.append({
+                "rollup_id": rollup_id,
+                "amount": delta["total_amount"],
+                "count": delta["transaction_count"],
+            })
+    if increments:
+        db.execute(
+            update(rollups).where(rollups.c.id == bindparam("rollup_id")).values(
+                total_amount=rollups.c.total_amount + bindparam("amount"),
+                transaction_count=rollups.c.transaction_count + bindparam("count"),
+                updated_at=func.now()
+            ),
+            increments
+        )
+    if new_rows:
+        db.execute(insert(rollups), new_rows)
+
+def apply_rollups(db: Session, rows: Iterable[Dict[str, Any]]):
+    """Fold new transactions into the rollups inside the caller's transaction"""
+    deltas = rollup_deltas(rows)
+    if not deltas:
+        return
+    stmt = _upsert(db.get_bind().dialect.name, deltas)
+    if stmt is None:
+        _update_or_insert(db, deltas)
+    else:
+        db.execute(stmt)
+
+async def apply_rollups_async(db: AsyncSession, rows: Iterable[Dict[str, Any]]):
+    """``apply_rollups`` for an AsyncSession"""
+    deltas = rollup_deltas(rows)
+    if not deltas:
+        return
+    connection = await db.connection()
+    stmt = _upsert(connection.dialect.name, deltas)
+    if stmt is None:
+        await db.run_sync(_update_or_insert, deltas)
+    else:
+        await db.execute(stmt)
+
+def _month_expression(dialect_name: str, column):
+    if dialect_name == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute rollups from the raw transactions (all users, or one) and commit"""
+    dialect_name = db.get_bind().dialect.name
+    transactions = credit_models.Transaction
+    month = _month_expression(dialect_name, transactions.transaction_date)
+    category = _category_expression(transactions.category)
+
+    aggregate = select(
+        transactions.user_id,
+        month,
+        transactions.transaction_type,
+        category,
+        func.sum(transactions.amount),
+        func.count(),
+    ).where(
+        transactions.transaction_date.is_not(None)
+    ).group_by(
+        transactions.user_id, month, transactions.transaction_type, category
+    )
+
+    clear = delete(TransactionRollup)
+    if user_id is not None:
+        aggregate = aggregate.where(transactions.user_id == user_id)
+        clear = clear.where(TransactionRollup.user_id == user_id)
+
+    db.execute(clear)
+    result = db.execute(
+        insert(TransactionRollup).from_select(ROLLUP_KEY + ["total_amount", "transaction_count"], aggregate)
+    )
+    db.commit()
+    return result.rowcount
+
+def _cash_flow_query(user_ids: List[int]):
+    return select(
+        TransactionRollup.user_id,
+        TransactionRollup.month,
+        TransactionRollup.transaction_type,
+        func.sum(TransactionRollup.total_amount),
+    ).where(
+        TransactionRollup.user_id.in_(user_ids)
+    ).group_by(
+        TransactionRollup.user_id, TransactionRollup.month, TransactionRollup.transaction_type
+    ).order_by(
+        TransactionRollup.user_id, TransactionRollup.month.desc()
+    )
+
+def _summarize_cash_flow(rows, months: int) -> Dict[int, Dict[str, float]]:
+    """Per-user averages over the first ``months`` months of rows ordered newest first"""
+    by_user: Dict[int, Dict[str, Dict[str, float]]] = defaultdict(dict)
+    for user_id, month, transaction_type, total in rows:
+        user_months = by_user[user_id]
+        if month not in user_months:
+            if len(user_months) >= months:
+                continue
+            user_months[month] = defaultdict(float)
+        user_months[month][transaction_type] += float(total or 0)
+
+    features = {}
+    for user_id, user_months in by_user.items():
+        n_months = len(user_months)
+        features[user_id] = {
+            'months': n_months,
+            'monthly_income': sum(m['income'] for m in user_months.values()) / n_months,
+            # Amounts may be signed either way; expenses are reported as a positive outflow
+            'monthly_expenses': abs(sum(m['expense'] for m in user_months.values())) / n_months,
+        }
+    return features
+
+async def cash_flow_features(db: AsyncSession, user_ids: List[int], months: int = CASH_FLOW_MONTHS) -> Dict[int, Dict[str, float]]:
+    """Average monthly income and expenses over each user's latest ``months`` active months.
+
+    Reads only the rollup rows (a few per user and month), never the raw
+    transactions. Users without any rollups are absent from the result.
+    """
+    if not user_ids or not CASH_FLOW_FEATURES_ENABLED:
+        return {}
+    rows = (await db.execute(_cash_flow_query(user_ids))).all()
+    return _summarize_cash_flow(rows, months)
+
+def cash_flow_features_sync(db: Session, user_ids: List[int], months: int = CASH_FLOW_MONTHS) -> Dict[int, Dict[str, float]]:
+    """``cash_flow_features`` for a sync Session (batch jobs)"""
+    if not user_ids or not CASH_FLOW_FEATURES_ENABLED:
+        return {}
+    return _summarize_cash_flow(db.execute(_cash_flow_query(user_ids)).all(), months)
@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import logging
+from typing import Any, Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Complete-tree layout grows as 2**depth; XGBoost defaults to depth 6
+MAX_SUPPORTED_DEPTH = 16
+
+class TreeEnsemble:
+    """Array-backed evaluator for an XGBoost regression tree ensemble.
+
+    Every tree is laid out as a complete binary tree of depth ``max_depth``:
+    internal slot ``i`` has children ``2i + 1`` and ``2i + 2``, and leaves that
+    sit above the last level are padded down to it. Child lookup is then pure
+    index arithmetic, so prediction advances every (row, tree) pair one level
+    per step with a handful of vectorized gathers into preallocated buffers.
+    Inputs must already be scaled the same way as the booster's training data.
+
+    All arrays live in one flat int32 table (float fields are stored as their
+    float32 bit patterns) so an exported ensemble can be memory-mapped and
+    shared read-only between worker processes.
+    """
+
+    def __init__(self, table: np.ndarray, n_trees: int, max_depth: int, n_features: int, base_score: float):
+        self.table = table
+        self.n_trees = int(n_trees)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.base_score = float(base_score)
+
+        # Segment views into the table: features, thresholds, default_left, leaf values
+        internal_per_tree = 2 ** self.max_depth - 1
+        n_internal = self.n_trees * internal_per_tree
+        n_leaves = self.n_trees * (internal_per_tree + 1)
+        self._feature = table[:n_internal]
+        self._threshold = table[n_internal:2 * n_internal].view(np.float32)
+        self._default_left = table[2 * n_internal:3 * n_internal]
+        self._leaf_value = table[3 * n_internal:3 * n_internal + n_leaves].view(np.float32)
+
+        # Slot arithmetic: global slot g descends to 2g + child_step + go_right
+        tree_base = np.arange(self.n_trees, dtype=np.intp) * internal_per_tree
+        self._tree_base = tree_base
+        self._child_step = 1 - tree_base
+        self._leaf_shift = np.arange(self.n_trees, dtype=np.intp) - internal_per_tree
+
+        self._workspaces = threading.local()
+
+    @classmethod
+    def from_booster(cls, booster) -> "TreeEnsemble":
+        """Export a trained xgboost Booster (gbtree, single target) into the flat layout"""
+        learner = json.loads(booster.save_raw('json'))['learner']
+
+        if learner['gradient_booster']['name'] != 'gbtree':
+            raise ValueError("Only gbtree boosters can be exported")
+        if int(learner['learner_model_param']['num_target']) > 1:
+            raise ValueError("Only single-target boosters can be exported")
+
+        trees = learner['gradient_booster']['model']['trees']
+        if any(any(tree['split_type']) for tree in trees):
+            raise ValueError("Categorical splits are not supported")
+
+        max_depth = max(cls._tree_depth(tree['left_children'], tree['right_children']) for tree in trees)
+        if max_depth > MAX_SUPPORTED_DEPTH:
+            raise ValueError(f"Tree depth {max_depth} exceeds supported depth {MAX_SUPPORTED_DEPTH}")
+        max_depth = max(max_depth, 1)
+
+        internal_per_tree = 2 ** max_depth - 1
+        feature = np.zeros((len(trees), internal_per_tree), dtype=np.int32)
+        threshold = np.full((len(trees), internal_per_tree), np.inf, dtype=np.float32)
+        default_left = np.ones((len(trees), internal_per_tree), dtype=np.int32)
+        leaf_value = np.zeros((len(trees), internal_per_tree + 1), dtype=np.float32)
+
+        for t, tree in enumerate(trees):
+            left, right = tree['left_children'], tree['right_children']
+            stack = [(0, 0, 0)]  # (node id, complete-tree slot, depth)
+            while stack:
+                node, slot, depth = stack.pop()
+                if depth == max_depth:
+                    leaf_value[t, slot - internal_per_tree] = tree['split_conditions'][node]
+                elif left[node] == -1:
+                    # Leaf above the last level: both padded subtrees end in the same leaf
+                    stack.append((node, 2 * slot + 1, depth + 1))
+                    stack.append((node, 2 * slot + 2, depth + 1))
+                else:
+                    feature[t, slot] = tree['split_indices'][node]
+                    threshold[t, slot] = tree['split_conditions'][node]
+                    default_left[t, slot] = tree['default_left'][node]
+                    stack.append((left[node], 2 * slot + 1, depth + 1))
+                    stack.append((right[node], 2 * slot + 2, depth + 1))
+
+        table = np.concatenate([
+            feature.ravel(),
+            threshold.ravel().view(np.int32),
+            default_left.ravel(),
+            leaf_value.ravel().view(np.int32),
+        ])
+
+        return cls(
+            table=table,
+            n_trees=len(trees),
+            max_depth=max_depth,
+            n_features=int(learner['learner_model_param']['num_feature']),
+            base_score=float(learner['learner_model_param']['base_score'])
+        )
+
+    @staticmethod
+    def _tree_depth(left: List[int], right: List[int]) -> int:
+        """Depth (number of splits on the longest root-to-leaf path) of one tree"""
+        depth = 0
+        level = [0]
+        while True:
+            level = [child for node in level if left[node] != -1 for child in (left[node], right[node])]
+            if not level:
+                return depth
+            depth += 1
+
+    def save(self, path: str):
+        """Write the flat table to ``path`` (.npy) and its metadata next to it (.json).
+
+        Each file is written under a temporary name and renamed into place, so
+        processes that have the previous table memory-mapped keep reading it.
+        """
+        meta_path = self._meta_path(path)
+        with open(meta_path + ".tmp", 'w') as f:
+            json.dump({
+                'n_trees': self.n_trees,
+                'max_depth': self.max_depth,
+                'n_features': self.n_features,
+                'base_score': self.base_score,
+            }, f)
+        with open(path + ".tmp", 'wb') as f:
+            np.save(f, self.table, allow_pickle=False)
+        os.replace(meta_path + ".tmp", meta_path)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "TreeEnsemble":
+        """Load an exported ensemble; with ``mmap`` the table is shared through the page cache"""
+        table = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+        with open(cls._meta_path(path)) as f:
+            meta: Dict[str, Any] = json.load(f)
+        return cls(table=table, **meta)
+
+    @staticmethod
+    def _meta_path(path: str) -> str:
+        return os.path.splitext(path)[0] + '.json'
+
+    def _workspace(self, n_rows: int) -> Dict[str, Any]:
+        """Per-thread scratch buffers, grown on demand and reused across calls"""
+        workspace = getattr(self._workspaces, 'buffers', None)
+        if workspace is None or workspace['capacity'] < n_rows:
+            size = n_rows * self.n_trees
+            workspace = self._workspaces.buffers = {
+                'capacity': n_rows,
+                'slot': np.empty(size, dtype=np.intp),
+                'feature': np.empty(size, dtype=np.int32),
+                'flat_index': np.empty(size, dtype=np.intp),
+                'x': np.empty(size, dtype=np.float32),
+                'threshold': np.empty(size, dtype=np.float32),
+                'go_right': np.empty(size, dtype=np.bool_),
+                'value': np.empty(size, dtype=np.float32),
+            }
+        return workspace
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Predict raw scores for a 2-D matrix of scaled feature rows"""
+        # XGBoost compares in float32, so evaluate splits at the same precision
+        rows = np.ascontiguousarray(features, dtype=np.float32)
+        if rows.ndim != 2 or rows.shape[1] != self.n_features:
+            raise ValueError(f"Expected an (n, {self.n_features}) feature matrix, got {rows.shape}")
+
+        n_rows = rows.shape[0]
+        size = n_rows * self.n_trees
+        workspace = self._workspace(n_rows)
+        slot, feature, flat_index, x, threshold, go_right, value = (
+            workspace[name][:size].reshape(n_rows, self.n_trees)
+            for name in ('slot', 'feature', 'flat_index', 'x', 'threshold', 'go_right', 'value')
+        )
+
+        flat_rows = rows.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * self.n_features)[:, None]
+        has_missing = bool(np.isnan(flat_rows).any())
+
+        slot[:] = self._tree_base
+        for _ in range(self.max_depth):
+            # Gather each (row, tree) split feature value and compare with its threshold
+            self._feature.take(slot, out=feature)
+            np.add(feature, row_offsets, out=flat_index)
+            flat_rows.take(flat_index, out=x)
+            self._threshold.take(slot, out=threshold)
+            np.greater_equal(x, threshold, out=go_right)
+            if has_missing:
+                missing = np.isnan(x)
+                go_right[missing] = self._default_left.take(slot)[missing] == 0
+
+            # Descend to child 2i + 1 (left) or 2i + 2 (right) within each tree's block
+            np.multiply(slot, 2, out=slot)
+            np.add(slot, self._child_step, out=slot)
+            np.add(slot, go_right, out=slot)
+
+        np.add(slot, self._leaf_shift, out=slot)
+        self._leaf_value.take(slot, out=value)
+        return (value.sum(axis=1, dtype=np.float64) + self.base_score).astype(np.float32)
@@ -0,0 +1,54 @@
+from typing import Dict, Any, Optional
+
+
+def build_user_data(user_profile, credit_history: Optional[Any] = None) -> Dict[str, Any]:
+    """Build the model input dict from a user's profile and credit history rows"""
+    user_data = {
+        'monthly_income': user_profile.monthly_income or 0,
+        'monthly_expenses': user_profile.monthly_expenses or 0,
+        'savings_balance': user_profile.savings_balance or 0,
+        'investment_balance': user_profile.investment_balance or 0,
+        'age': user_profile.age or 30,
+        'education_level': 'bachelors',  # Default for demo
+        'job_title': user_profile.job_title or '',
+        'industry': user_profile.industry or '',
+        'years_experience': user_profile.years_experience or 0,
+        'salary': user_profile.salary or 0,
+        'employment_status': user_profile.employment_status or 'full_time',
+        'housing_status': user_profile.housing_status or 'renting',
+        'monthly_rent': user_profile.monthly_rent or 0,
+        'mortgage_payment': user_profile.mortgage_payment or 0,
+        'property_value': user_profile.property_value or 0,
+        'job_stability_score': 0.7,  # Default for demo
+        'social_score': 0.6,  # Default for demo
+    }
+    
+    # Add credit history data if available
+    if credit_history:
+        user_data.update({
+            'credit_card_balance': credit_history.credit_card_balance or 0,
+            'credit_card_limit': credit_history.credit_card_limit or 1,
+            'loan_balance': credit_history.loan_balance or 0,
+            'late_payments': credit_history.late_payments or 0,
+            'missed_payments': credit_history.missed_payments or 0,
+        })
+    else:
+        # Default credit values
+        user_data.update({
+            'credit_card_balance': 0,
+            'credit_card_limit': 5000,
+            'loan_balance': 0,
+            'late_payments': 0,
+            'missed_payments': 0,
+        })
+    
+    return user_data
+
+def apply_cash_flow(user_data: Dict[str, Any], cash_flow: Optional[Dict[str, float]]) -> Dict[str, Any]:
+    """Prefer observed monthly income/expenses from transaction rollups over self-reported values"""
+    if cash_flow and cash_flow.get('months'):
+        if cash_flow['monthly_income'] > 0:
+            user_data['monthly_income'] = cash_flow['monthly_income']
+        if cash_flow['monthly_expenses'] > 0:
+            user_data['monthly_expenses'] = cash_flow['monthly_expenses']
+    return user_data
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..database import AsyncSessionLocal
+from .assessment_payloads import compact_assessments
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindWriter:
+    """Group-commit writer for append-only rows (assessments, simulations).
+
+    Handlers hand an unsaved ORM object to ``write`` and await it; a single
+    background task collects everything submitted within ``flush_interval_ms``
+    (or until ``max_batch`` rows are waiting), inserts the lot in one
+    transaction and resolves every waiter once that commit has returned. The
+    awaited result is the row as stored, with its id and server defaults, so a
+    handler never answers before its row is durable.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, flush_interval_ms: float, max_batch: int):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.rows_written = 0
+        self.failed_flushes = 0
+        self._last_batch_size = 0
+        self._last_commit_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the flush loop on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush whatever is queued and stop the flush loop"""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def write(self, obj: Any) -> Any:
+        """Queue ``obj`` for insertion and wait until its group commit is durable"""
+        if not self.running:
+            raise RuntimeError("Write-behind writer is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((obj, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stopping = False
+
+            # Keep collecting until the window closes or the batch is full
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if stopping:
+                # Rows queued behind the stop marker still go out with the final commit
+                while not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if item is not None:
+                        batch.append(item)
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[Tuple[Any, asyncio.Future]]):
+        started = time.perf_counter()
+        objects = [obj for obj, _ in batch]
+        try:
+            async with self.session_factory() as db:
+                await compact_assessments(db, objects)
+                db.add_all(objects)
+                await db.flush()
+                ids_by_model = defaultdict(list)
+                for obj in objects:
+                    ids_by_model[type(obj)].append(obj.id)
+                await db.commit()
+
+                # One requery per model picks up server defaults for the whole batch
+                stored = {}
+                for model, ids in ids_by_model.items():
+                    rows = (await db.execute(
+                        select(model).where(model.id.in_(ids)).execution_options(populate_existing=True)
+                    )).scalars().all()
+                    stored.update({(model, row.id): row for row in rows})
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.error(f"Write-behind flush of {len(batch)} rows failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.flushes += 1
+        self.rows_written += len(batch)
+        self._last_batch_size = len(batch)
+        self._last_commit_ms = (time.perf_counter() - started) * 1000
+        for obj, future in batch:
+            if not future.done():
+                future.set_result(stored.get((type(obj), obj.id), obj))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "failed_flushes": self.failed_flushes,
+            "avg_batch_size": round(self.rows_written / self.flushes, 2) if self.flushes else 0.0,
+            "last_batch_size": self._last_batch_size,
+            "last_commit_ms": round(self._last_commit_ms, 3),
+        }
+
+WRITE_BEHIND_ENABLED = os.getenv("DB_WRITE_BEHIND", "false").lower() == "true"
+
+assessment_writer = WriteBehindWriter(
+    AsyncSessionLocal,
+    flush_interval_ms=float(os.getenv("DB_WRITE_BEHIND_INTERVAL_MS", "5")),
+    max_batch=int(os.getenv("DB_WRITE_BEHIND_MAX_BATCH", "256"))
+)
+
+async def save_row(db: AsyncSession, obj: Any) -> Any:
+    """Persist one new row, through the group-commit writer when it is enabled"""
+    if assessment_writer.running:
+        # Hand the request's pooled connection back first so the writer can't starve for one
+        await db.close()
+        return await assessment_writer.write(obj)
+    await compact_assessments(db, [obj])
+    db.add(obj)
+    await db.commit()
+    await db.refresh(obj)
+    return obj
@@ -0,0 +1,21 @@
+import os
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+
+# Shared secret for operational endpoints; unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """FastAPI dependency admitting only requests whose X-Admin-Token header matches ADMIN_TOKEN"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them"
+        )
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing or invalid X-Admin-Token header"
+        )
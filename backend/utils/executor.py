@@ -0,0 +1,107 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, status
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when the executor's queue is full and new work is rejected"""
+
+class BoundedExecutor:
+    """Thread pool for blocking DB and CPU-bound inference work.
+
+    At most ``max_workers`` tasks run at once and at most ``max_queue`` more wait
+    for a worker; beyond that, submissions fail fast with ExecutorSaturatedError
+    instead of piling up behind the event loop. Queue depth and the time tasks
+    spend waiting for a worker are tracked for the /metrics endpoint.
+    """
+    
+    def __init__(self, max_workers: int, max_queue: int, name: str = "scoring"):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_ms = deque(maxlen=2048)
+        self._max_wait_ms = 0.0
+    
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result"""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturatedError(
+                    f"{self._pending} tasks already queued or running (limit {self.max_workers + self.max_queue})"
+                )
+            self._pending += 1
+        
+        submitted_at = time.perf_counter()
+        
+        def task():
+            wait_ms = (time.perf_counter() - submitted_at) * 1000
+            with self._lock:
+                self._running += 1
+                self._wait_ms.append(wait_ms)
+                self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self.completed += 1
+        
+        def release(_):
+            with self._lock:
+                self._pending -= 1
+        
+        # The slot is released when the task finishes, or is cancelled before it starts,
+        # not when the caller stops waiting: an abandoned task still occupies a worker
+        try:
+            future = self._pool.submit(task)
+        except BaseException:
+            release(None)
+            raise
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._wait_ms)
+            percentile = lambda q: waits[min(len(waits) - 1, int(q * len(waits)))] if waits else 0.0
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_ms_p50": round(percentile(0.50), 3),
+                "wait_ms_p99": round(percentile(0.99), 3),
+                "wait_ms_max": round(self._max_wait_ms, 3),
+            }
+    
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+# Shared executor for route handlers; sized by environment
+scoring_executor = BoundedExecutor(
+    max_workers=int(os.getenv("SCORING_EXECUTOR_WORKERS", str(min(8, (os.cpu_count() or 1) + 2)))),
+    max_queue=int(os.getenv("SCORING_EXECUTOR_QUEUE_SIZE", "64"))
+)
+
+async def run_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """Run blocking handler work on the scoring executor, mapping saturation to 503"""
+    try:
+        return await scoring_executor.run(fn, *args, **kwargs)
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Server is busy, retry shortly: {e}"
+        )
@@ -0,0 +1,49 @@
+import bisect
+from typing import Any, Dict, Sequence
+
+class Histogram:
+    """Fixed-bucket histogram for /metrics.
+
+    ``bounds`` are inclusive upper edges; observations above the last one land
+    in an overflow bucket. Reported bucket counts are cumulative, as in
+    Prometheus (``le`` = less than or equal).
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-th observation (the max if it overflowed)"""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def stats(self) -> Dict[str, Any]:
+        buckets, seen = {}, 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            buckets[f"le_{bound:g}"] = seen
+        buckets["le_inf"] = self.count
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 3) if self.count else 0.0,
+            "p50": round(self.quantile(0.50), 3),
+            "p99": round(self.quantile(0.99), 3),
+            "max": round(self.max, 3),
+            "buckets": buckets,
+        }
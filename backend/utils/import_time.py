@@ -0,0 +1,59 @@
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+# Training/analysis-only packages that must not be imported to serve predictions
+DEFAULT_FORBIDDEN_MODULES = [
+    "pandas", "sklearn", "xgboost", "shap", "matplotlib", "seaborn", "plotly",
+]
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$")
+
+def measure_import_time(module: str = "backend.main") -> List[Dict]:
+    """Import ``module`` in a fresh interpreter with ``-X importtime`` and parse the report.
+
+    Returns one entry per imported module with its self and cumulative time in
+    microseconds and its nesting depth (0 for modules imported directly).
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=project_root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=project_root
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                "module": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(indent) - 1) // 2,
+            })
+    return entries
+
+def import_time_report(module: str, budget_ms: float, forbidden: List[str], top: int = 15) -> bool:
+    """Print an import-time report for ``module``; return False if the budget or forbidden list is violated"""
+    entries = measure_import_time(module)
+    total_ms = next(e["cumulative_us"] for e in reversed(entries) if e["module"] == module) / 1000
+    
+    print(f"Import time for {module}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for entry in sorted(entries, key=lambda e: e["cumulative_us"], reverse=True)[:top]:
+        print(f"{entry['cumulative_us'] / 1000:>9.1f} ms {entry['self_us'] / 1000:>7.1f} ms  {'  ' * entry['depth']}{entry['module']}")
+    
+    imported = {e["module"] for e in entries}
+    violations = sorted(name for name in forbidden if name in imported)
+    for name in violations:
+        print(f"FAIL: {name} is imported at startup; import it where it is used")
+    if total_ms > budget_ms:
+        print(f"FAIL: import time {total_ms:.1f} ms exceeds budget {budget_ms:.0f} ms")
+    
+    return not violations and total_ms <= budget_ms
@@ -0,0 +1,73 @@
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, literal, select, tuple_
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+def encode_cursor(last_key: Any, last_id: int) -> str:
+    """Opaque cursor pointing just past the row with sort value ``last_key`` and primary key ``last_id``"""
+    if isinstance(last_key, datetime):
+        last_key = last_key.isoformat()
+    return base64.urlsafe_b64encode(json.dumps({"key": last_key, "after": last_id}).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_column) -> Tuple[Any, int]:
+    """Inverse of ``encode_cursor`` for a listing sorted on ``sort_column``; malformed cursors are a client error"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_key, last_id = payload["key"], payload["after"]
+        if not isinstance(last_id, int):
+            raise ValueError("cursor id must be an integer")
+        python_type = sort_column.type.python_type
+        if python_type is datetime:
+            last_key = datetime.fromisoformat(last_key)
+        elif not isinstance(last_key, python_type):
+            raise ValueError(f"cursor sort value must be {python_type.__name__}")
+        return last_key, last_id
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+def keyset_page_query(stmt, model, sort_column, cursor: Optional[str], limit: int, descending: bool = True):
+    """Restrict ``stmt`` to the page after ``cursor``, ordered by (sort_column, id).
+
+    The cursor carries the last row's sort value and id. While that row is
+    still in the listing its sort value is read back from the table inside
+    the same statement, so the comparison uses the stored representation;
+    if it was deleted, or the cursor came from another listing, the cursor's
+    own copy is used. One extra row is fetched to detect a following page.
+    """
+    id_column = model.id
+    if cursor is not None:
+        last_key, last_id = decode_cursor(cursor, sort_column)
+        anchor = select(sort_column).where(id_column == last_id)
+        if stmt.whereclause is not None:
+            anchor = anchor.where(stmt.whereclause)
+        anchor_key = func.coalesce(anchor.correlate(None).scalar_subquery(), literal(last_key, sort_column.type))
+        position = tuple_(sort_column, id_column)
+        bound = tuple_(anchor_key, last_id)
+        stmt = stmt.where(position < bound if descending else position > bound)
+
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), id_column.asc())
+    return stmt.limit(limit + 1)
+
+def split_page(rows: List[Any], limit: int, sort_column) -> Tuple[List[Any], Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page, if any"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(getattr(rows[-1], sort_column.key), rows[-1].id)
+
+def page(items: List[Any], next_cursor: Optional[str]) -> Dict[str, Any]:
+    return {"items": items, "next_cursor": next_cursor}
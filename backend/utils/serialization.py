@@ -0,0 +1,32 @@
+from typing import Any, Dict, Iterable, List, Type
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Handlers that return one of these bypass FastAPI's response_model
+    validation and re-serialization; the route's response_model is still used
+    for the OpenAPI schema, so the payload must keep that shape. Datetimes
+    render as ISO 8601 (UTC as "Z") like Pydantic's own output.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        )
+
+def schema_columns(schema: Type[BaseModel], model) -> List[Any]:
+    """Mapped columns for every field of ``schema``, for Core selects that skip ORM rows"""
+    return [getattr(model, name) for name in schema.model_fields]
+
+def serialize_row(obj: Any, schema: Type[BaseModel]) -> Dict[str, Any]:
+    """Plain dict of ``schema``'s fields read straight off an ORM object"""
+    return {name: getattr(obj, name) for name in schema.model_fields}
+
+def serialize_rows(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Plain dicts from Core result rows selected with ``schema_columns``"""
+    return [dict(row._mapping) for row in rows]
@@ -43,17 +43,23 @@ export const creditAPI = {
   assessCredit: (userId, options = {}) =>
     api.post('/api/v1/credit/assess', { user_id: userId, ...options }),
 
-  // Get user assessments
-  getUserAssessments: (userId) =>
-    api.get(`/api/v1/credit/assessments/${userId}`),
+  // Get user assessments (paginated: pass next_cursor from the previous page)
+  getUserAssessments: (userId, { cursor, limit } = {}) =>
+    api.get(`/api/v1/credit/assessments/${userId}`, { params: { cursor, limit } }),
 
   // Create transaction
   createTransaction: (transaction) =>
     api.post('/api/v1/credit/transactions', transaction),
 
-  // Get user transactions
-  getUserTransactions: (userId) =>
-    api.get(`/api/v1/credit/transactions/${userId}`),
+  // Bulk-load transactions from an NDJSON or CSV body
+  ingestTransactions: (body, format = 'ndjson') =>
+    api.post('/api/v1/credit/transactions/bulk', body, {
+      headers: { 'Content-Type': format === 'csv' ? 'text/csv' : 'application/x-ndjson' },
+    }),
+
+  // Get user transactions (paginated: pass next_cursor from the previous page)
+  getUserTransactions: (userId, { cursor, limit } = {}) =>
+    api.get(`/api/v1/credit/transactions/${userId}`, { params: { cursor, limit } }),
 
   // Create/update user profile
   createUserProfile: (profile) =>
@@ -70,9 +76,51 @@ export const simulationAPI = {
   runSimulation: (simulation) =>
     api.post('/api/v1/simulation/scenario', simulation),
 
-  // Get simulation history
-  getSimulationHistory: (userId) =>
-    api.get(`/api/v1/simulation/history/${userId}`),
+  // Run several scenarios (each a list of chained steps) in one batched call
+  runSimulations: (request) =>
+    api.post('/api/v1/simulation/scenarios', request),
+
+  // Score curve (one axis) or heatmap (two axes) over a parameter grid; nothing is saved
+  runSweep: (request) =>
+    api.post('/api/v1/simulation/sweep', request),
+
+  // Monte Carlo score distribution, streamed as NDJSON: onSnapshot is called with each
+  // running snapshot (the last one has done: true); resolves with the final snapshot
+  streamMonteCarlo: async (request, onSnapshot) => {
+    const token = localStorage.getItem('authToken');
+    const response = await fetch(`${API_BASE_URL}/api/v1/simulation/monte-carlo`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      },
+      body: JSON.stringify(request),
+    });
+    if (!response.ok) {
+      throw new Error((await response.json()).detail || `Monte Carlo request failed (${response.status})`);
+    }
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    let snapshot = null;
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffered += decoder.decode(value, { stream: true });
+      const lines = buffered.split('\n');
+      buffered = lines.pop();
+      for (const line of lines.filter(Boolean)) {
+        snapshot = JSON.parse(line);
+        if (snapshot.error) throw new Error(snapshot.error);
+        onSnapshot(snapshot);
+      }
+    }
+    return snapshot;
+  },
+
+  // Get simulation history (paginated: pass next_cursor from the previous page)
+  getSimulationHistory: (userId, { cursor, limit } = {}) =>
+    api.get(`/api/v1/simulation/history/${userId}`, { params: { cursor, limit } }),
 };
 
 // Recommendations API
@@ -84,12 +132,22 @@ export const recommendationsAPI = {
   // Get improvement plan
   getImprovementPlan: (userId) =>
     api.get(`/api/v1/recommendations/${userId}/improvement-plan`),
+
+  // Cheapest set of actionable changes that reaches a target score
+  getCounterfactual: (userId, { targetScore, budgetMs } = {}) =>
+    api.get(`/api/v1/recommendations/${userId}/counterfactual`, {
+      params: { target_score: targetScore, budget_ms: budgetMs },
+    }),
+
+  // Projected monthly score curves for alternative action plans
+  projectTrajectory: (userId, request) =>
+    api.post(`/api/v1/recommendations/${userId}/trajectory`, request),
 };
 
 // Users API
 export const usersAPI = {
-  // Get all users
-  getUsers: () => api.get('/api/v1/users'),
+  // Get users (paginated: pass next_cursor from the previous page)
+  getUsers: ({ cursor, limit } = {}) => api.get('/api/v1/users', { params: { cursor, limit } }),
 
   // Get specific user
   getUser: (userId) => api.get(`/api/v1/users/${userId}`),
@@ -12,6 +12,10 @@ mkdir -p models
 echo "🐍 Installing Python dependencies..."
 pip install -r requirements.txt
 
+# Build model artifacts ahead of time
+echo "🤖 Building AI model artifacts..."
+python -m backend.cli build-models
+
 # Install Node.js dependencies
 echo "📦 Installing Node.js dependencies..."
 cd frontend
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from backend.services.ai_models import CreditScoringModel
+
+@pytest.fixture(scope="session")
+def models_dir(tmp_path_factory):
+    """Model artifacts trained once per session on the synthetic data, outside the repo"""
+    path = str(tmp_path_factory.mktemp("models"))
+    _load_model(path).close()
+    return path
+
+def _load_model(models_dir: str, backend: str = "xgboost") -> CreditScoringModel:
+    previous = os.environ.get("MODELS_DIR"), os.environ.get("CREDIT_MODEL_BACKEND")
+    os.environ["MODELS_DIR"], os.environ["CREDIT_MODEL_BACKEND"] = models_dir, backend
+    try:
+        model = CreditScoringModel()
+    finally:
+        for key, value in zip(("MODELS_DIR", "CREDIT_MODEL_BACKEND"), previous):
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    model.load_models()
+    return model
+
+@pytest.fixture(scope="session")
+def load_model(models_dir):
+    """Factory for models on a given scoring backend, closed at the end of the session"""
+    models = []
+    def load(backend: str, directory: str = models_dir) -> CreditScoringModel:
+        models.append(_load_model(directory, backend))
+        return models[-1]
+    yield load
+    for model in models:
+        model.close()
+
+@pytest.fixture(scope="session")
+def credit_model(load_model):
+    return load_model("xgboost")
@@ -0,0 +1,27 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.utils import admin
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.post("/reload", dependencies=[Depends(admin.require_admin_token)])
+    def reload():
+        return {"reloaded": True}
+
+    return TestClient(app)
+
+def test_admin_endpoints_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", None)
+    assert client.post("/reload", headers={"X-Admin-Token": ""}).status_code == 403
+
+def test_admin_token_required(client, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "s3cret")
+    assert client.post("/reload").status_code == 401
+    assert client.post("/reload", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    response = client.post("/reload", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert response.json() == {"reloaded": True}
@@ -0,0 +1,122 @@
+import os
+import shutil
+import time
+
+import joblib
+import numpy as np
+import pytest
+
+from backend.services.ai_models import CreditScoringModel
+
+def _users(n: int, seed: int = 1):
+    """Applicants spread over every input, including unknown labels and out-of-range values"""
+    rng = np.random.default_rng(seed)
+    users = [{
+        'monthly_income': float(rng.uniform(0, 9000)), 'monthly_expenses': float(rng.uniform(0, 9000)),
+        'savings_balance': float(rng.uniform(-1000, 50000)), 'credit_card_balance': float(rng.uniform(0, 9000)),
+        'credit_card_limit': float(rng.choice([1, 5000, 10000])), 'loan_balance': float(rng.uniform(0, 40000)),
+        'late_payments': int(rng.integers(0, 4)), 'missed_payments': int(rng.integers(0, 3)),
+        'years_experience': int(rng.integers(0, 21)), 'salary': float(rng.uniform(0, 150000)),
+        'job_stability_score': float(rng.random()), 'housing_status': str(rng.choice(['renting', 'owned', 'mortgaged', 'x'])),
+        'property_value': float(rng.uniform(0, 600000)), 'education_level': str(rng.choice(['bachelors', 'phd', 'zz'])),
+        'age': int(rng.integers(18, 81)), 'social_score': float(rng.random()),
+    } for _ in range(n)]
+    return users + [{}]
+
+USERS = _users(200)
+
+def _legacy_scores(credit_model: CreditScoringModel, users) -> np.ndarray:
+    """Scores through the original sklearn path: scaler.transform + model.predict"""
+    features = credit_model._prepare_features_matrix(users)
+    return np.clip(credit_model.model.predict(credit_model.scaler.transform(features)), 300, 850)
+
+def test_single_row_paths_match_model_predict(credit_model):
+    credit_model.prediction_cache.clear()
+    for user_data, expected in zip(USERS, _legacy_scores(credit_model, USERS)):
+        assert credit_model.predict_score(user_data) == float(expected)
+        assert credit_model.predict_credit_score(user_data)['credit_score'] == float(expected)
+
+def test_batch_predictions_match_single_predictions(credit_model):
+    credit_model.prediction_cache.clear()
+    batch = credit_model.predict_credit_scores_batch(USERS)
+    credit_model.prediction_cache.clear()
+    assert batch == [credit_model.predict_credit_score(user_data) for user_data in USERS]
+
+def test_numpy_backend_matches_model_predict(load_model):
+    numpy_model = load_model("numpy")
+    assert numpy_model._tree_ensemble is not None
+    expected = _legacy_scores(numpy_model, USERS)
+
+    features = numpy_model._prepare_features_matrix(USERS)
+    # Scores are float32 sums of 100 leaves, so allow a few ULPs
+    np.testing.assert_allclose(numpy_model.score_feature_matrix(features), expected, atol=1e-3)
+    single = [numpy_model.predict_credit_score(user_data)['credit_score'] for user_data in USERS]
+    np.testing.assert_allclose(single, expected, atol=1e-3)
+
+def test_new_artifacts_do_not_overwrite_a_mapped_ensemble(load_model, models_dir, tmp_path):
+    directory = str(tmp_path / "models")
+    shutil.copytree(models_dir, directory)
+    old_model = load_model("numpy", directory)
+    features = old_model._prepare_features_matrix(USERS)
+    expected = old_model.score_feature_matrix(features)
+
+    # Same trees, different bytes: the new artifacts get their own export
+    joblib.dump(old_model.model, os.path.join(directory, "credit_model.pkl"), compress=3)
+    new_model = load_model("numpy", directory)
+    assert new_model._tree_ensemble_path() != old_model._tree_ensemble_path()
+    assert not os.path.exists(old_model._tree_ensemble_path())
+    np.testing.assert_array_equal(old_model.score_feature_matrix(features), expected)
+    np.testing.assert_array_equal(new_model.score_feature_matrix(features), expected)
+
+def test_contributions_add_up_to_the_score(credit_model):
+    credit_model.prediction_cache.clear()
+    prediction = credit_model.predict_credit_score(USERS[0], include_contributions=True)
+    contributions = prediction['factor_breakdown']['score_contributions']
+    assert sum(contributions.values()) == pytest.approx(prediction['credit_score'], abs=0.05)
+    assert 'score_contributions' not in credit_model.predict_credit_score(USERS[0])['factor_breakdown']
+
+def test_explained_predictions_match_model_predict(credit_model):
+    credit_model.prediction_cache.clear()
+    batch = credit_model.predict_credit_scores_batch(USERS, include_contributions=True)
+    credit_model.prediction_cache.clear()
+    assert batch == [credit_model.predict_credit_score(user_data, include_contributions=True) for user_data in USERS]
+    # Contribution sums match the booster's float32 prediction to a few ULPs
+    np.testing.assert_allclose(
+        [prediction['credit_score'] for prediction in batch], _legacy_scores(credit_model, USERS), atol=1e-3
+    )
+
+def _best_time(fn, calls: int = 200, repeats: int = 5) -> float:
+    fn()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / calls
+
+def test_uncached_prediction_stays_on_the_fast_path(credit_model):
+    features = credit_model._prepare_features(USERS[0])
+
+    def uncached():
+        credit_model.prediction_cache.clear()
+        return credit_model.predict_credit_score(USERS[0])
+
+    # A full prediction costs the fast-path score plus its Python bookkeeping, well under one
+    # legacy scaler.transform + model.predict call
+    legacy = _best_time(lambda: credit_model.model.predict(credit_model.scaler.transform([features])))
+    assert _best_time(uncached) < legacy
+
+def test_cached_predictions_are_independent_copies(credit_model):
+    credit_model.prediction_cache.clear()
+    first = credit_model.predict_credit_score(USERS[1], include_contributions=True)
+    expected = credit_model.predict_credit_score(USERS[1], include_contributions=True)
+    assert expected == first
+
+    # Callers that modify a prediction must not change what later hits return
+    first['factor_breakdown']['score_contributions']['financial'] = 0.0
+    first['recommendations'].append("modified")
+    hit = credit_model.predict_credit_score(USERS[1], include_contributions=True)
+    hit['risk_factors'].clear()
+    assert credit_model.predict_credit_scores_batch([USERS[1]], include_contributions=True) == [expected]
+    assert credit_model.prediction_cache.stats()["hits"] >= 3
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+# Endpoint tests need the application's ORM models
+pytest.importorskip("backend.models.credit_models")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from backend.database import Base, get_async_db
+from backend.models import credit_models
+from backend.models.payload_models import AssessmentPayload
+from backend.routers import credit, recommendations
+from backend.services import assessment_payloads
+from backend.services.assessment_payloads import compact_assessment_rows, expand_payloads_sync, payload_cache
+
+FACTOR_BREAKDOWN = {
+    'financial_health': 71.5, 'career_stability': 64.0, 'housing_stability': 55.25,
+    'score_contributions': {'financial': 12.5, 'career': -3.25, 'housing': 1.0, 'social': 0.5, 'baseline': 650.0}
+}
+RECOMMENDATIONS = ["Reduce credit card utilization below 30%", "Build an emergency fund of three months of expenses"]
+RISK_FACTORS = ["High credit utilization", "Recent late payments on revolving accounts"]
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "payloads.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        rows = [{
+            'user_id': 7, 'credit_score': 702.5, 'risk_category': 'good', 'confidence_score': 0.9,
+            'financial_score': 71.5, 'career_score': 64.0, 'housing_score': 55.25, 'social_score': 50.0,
+            'factor_breakdown': FACTOR_BREAKDOWN, 'recommendations': RECOMMENDATIONS,
+            'risk_factors': RISK_FACTORS, 'model_version': '1.0.0'
+        }]
+        compact_assessment_rows(db, rows)
+        assert all(set(rows[0][column]) == {"$ref"} for column in ('factor_breakdown', 'recommendations', 'risk_factors'))
+        db.execute(insert(credit_models.CreditAssessment), rows)
+        db.commit()
+    engine.dispose()
+    # Force the readers to resolve references from storage
+    payload_cache.clear()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    async def get_test_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(credit.router, prefix="/api/v1/credit")
+    app.include_router(recommendations.router, prefix="/api/v1/recommendations")
+    app.dependency_overrides[get_async_db] = get_test_db
+    with TestClient(app) as test_client:
+        yield test_client
+    asyncio.run(async_engine.dispose())
+
+def test_assessment_history_expands_compacted_payloads(client):
+    response = client.get("/api/v1/credit/assessments/7")
+    assert response.status_code == 200
+    [item] = response.json()["items"]
+    assert item["factor_breakdown"] == FACTOR_BREAKDOWN
+    assert item["recommendations"] == RECOMMENDATIONS
+    assert item["risk_factors"] == RISK_FACTORS
+
+def test_recommendations_expand_compacted_payloads(client):
+    response = client.get("/api/v1/recommendations/7")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["specific_recommendations"] == RECOMMENDATIONS
+    assert body["risk_factors"] == RISK_FACTORS
+
+def test_portable_payload_storage_skips_stored_hashes(tmp_path, monkeypatch):
+    # As on a dialect without INSERT ... ON CONFLICT
+    monkeypatch.setattr(assessment_payloads, "_insert_payloads", lambda dialect_name: None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'portable.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        for _ in range(2):
+            rows = [{'factor_breakdown': FACTOR_BREAKDOWN, 'recommendations': RECOMMENDATIONS, 'risk_factors': RISK_FACTORS}]
+            compact_assessment_rows(db, rows)
+            db.commit()
+        assert db.execute(select(func.count()).select_from(AssessmentPayload)).scalar() == 3
+
+        payload_cache.clear()
+        [expanded] = expand_payloads_sync(db, rows)
+        assert expanded == {'factor_breakdown': FACTOR_BREAKDOWN, 'recommendations': RECOMMENDATIONS, 'risk_factors': RISK_FACTORS}
+    engine.dispose()
@@ -0,0 +1,46 @@
+import os
+import shutil
+
+import joblib
+import numpy as np
+
+from backend.services.ai_models import FEATURE_INDEX, WARMUP_PROFILE, CreditScoringModel
+from backend.services.counterfactuals import (
+    EFFORT_WEIGHTS, _lever_ladders, counterfactual_cache, counterfactual_cache_key, search_counterfactual
+)
+from backend.services.model_registry import ModelRegistry
+
+def _features(**overrides) -> np.ndarray:
+    return np.asarray(CreditScoringModel._prepare_features({**WARMUP_PROFILE, **overrides}), dtype=np.float64)
+
+def test_card_pay_down_is_limited_by_savings():
+    ladders = _lever_ladders(_features(credit_card_balance=6000, savings_balance=1500), EFFORT_WEIGHTS)
+    assert ladders['pay_down_card']['amounts'].max() == 1500
+
+    ladders = _lever_ladders(_features(credit_card_balance=6000, savings_balance=0), EFFORT_WEIGHTS)
+    assert ladders['pay_down_card']['amounts'].tolist() == [0.0]
+
+def test_search_never_spends_more_than_savings(credit_model):
+    base_features = _features(credit_card_balance=9000, credit_card_limit=10000, savings_balance=800)
+    result = search_counterfactual(credit_model, base_features, target_score=850, budget_ms=10_000)
+    assert result["complete"]
+    pay_down = sum(change["amount"] for change in result["changes"] if change["lever"] == "pay_down_card")
+    assert pay_down <= base_features[FEATURE_INDEX['savings_balance']]
+
+def test_reloaded_artifacts_do_not_reuse_cached_searches(models_dir, tmp_path, monkeypatch):
+    directory = str(tmp_path / "models")
+    shutil.copytree(models_dir, directory)
+    monkeypatch.setenv("MODELS_DIR", directory)
+    registry = ModelRegistry()
+    base_features = _features(credit_card_balance=4000)
+
+    old_model = registry.load(train_if_missing=False)
+    counterfactual_cache.put(counterfactual_cache_key(old_model, 1, base_features, 750), {"changes": []})
+    assert counterfactual_cache.get(counterfactual_cache_key(registry.reload(), 1, base_features, 750)) is not None
+
+    # New artifacts under the same model_version must miss the old model's entries
+    joblib.dump(old_model.model, os.path.join(directory, "credit_model.pkl"), compress=3)
+    new_model = registry.reload()
+    assert new_model.model_version == old_model.model_version
+    assert counterfactual_cache.get(counterfactual_cache_key(new_model, 1, base_features, 750)) is None
+    new_model.close()
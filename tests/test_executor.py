@@ -0,0 +1,63 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.utils.executor import BoundedExecutor, ExecutorSaturatedError
+
+async def _running(executor: BoundedExecutor, fn):
+    """Start ``fn`` on the executor and wait until a worker thread is running it"""
+    task = asyncio.ensure_future(executor.run(fn))
+    while executor.stats()["running"] == 0:
+        await asyncio.sleep(0.01)
+    return task
+
+async def _drained(executor: BoundedExecutor):
+    while executor._pending:
+        await asyncio.sleep(0.01)
+
+def test_cancelled_caller_keeps_its_running_task_counted():
+    executor = BoundedExecutor(max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        waiter = await _running(executor, release.wait)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        # The worker thread is still busy, so there is still no room
+        with pytest.raises(ExecutorSaturatedError):
+            await asyncio.wait_for(executor.run(lambda: None), 5)
+
+        release.set()
+        await asyncio.wait_for(_drained(executor), 5)
+        assert await asyncio.wait_for(executor.run(lambda: 42), 5) == 42
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        executor.shutdown()
+
+def test_cancelled_queued_task_frees_its_place():
+    executor = BoundedExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = await _running(executor, release.wait)
+        queued = asyncio.ensure_future(executor.run(lambda: "never"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert executor._pending == 1
+
+        admitted = asyncio.ensure_future(executor.run(lambda: "ran"))
+        release.set()
+        assert await asyncio.wait_for(admitted, 5) == "ran"
+        assert await asyncio.wait_for(running, 5) is True
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        executor.shutdown()
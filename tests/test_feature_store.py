@@ -0,0 +1,91 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+# The store reads the application's ORM models
+pytest.importorskip("backend.models.credit_models")
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from backend.database import Base
+from backend.models import credit_models, user_models
+from backend.services import feature_store as feature_store_module
+from backend.services.ai_models import FEATURE_NAMES
+from backend.services.feature_store import FeatureStore, load_users_data
+
+def _vector(value: float) -> np.ndarray:
+    return np.full(len(FEATURE_NAMES), value)
+
+def test_rows_are_served_only_at_their_version():
+    store = FeatureStore("unused.npz")
+    with store.loading() as generation:
+        store.put(1, _vector(1.0), version=10, generation=generation)
+    assert np.array_equal(store.get(1, 10), _vector(1.0))
+    assert store.get(1, 11) is None
+    assert store.stats()["stale"] == 1
+
+def test_load_does_not_write_back_over_a_newer_invalidation():
+    store = FeatureStore("unused.npz")
+    with store.loading() as generation:
+        # A profile update lands while this load is reading the old inputs
+        store.invalidate([1])
+        store.put(1, _vector(1.0), version=10, generation=generation)
+        store.put(2, _vector(2.0), version=20, generation=generation)
+    assert store.get(1, 10) is None
+    assert np.array_equal(store.get(2, 20), _vector(2.0))
+
+    # Invalidations from before a load began don't block it
+    with store.loading() as generation:
+        store.put(1, _vector(1.5), version=11, generation=generation)
+    assert np.array_equal(store.get(1, 11), _vector(1.5))
+
+def test_save_and_load_keep_versions(tmp_path):
+    store = FeatureStore(str(tmp_path / "features.npz"))
+    with store.loading() as generation:
+        store.put(1, _vector(1.0), version=-5, generation=generation)
+    store.save()
+
+    loaded = FeatureStore(store.path)
+    assert loaded.load()
+    assert np.array_equal(loaded.get(1, -5), _vector(1.0))
+    assert loaded.get(1, 0) is None
+
+def test_credit_history_written_elsewhere_is_picked_up(tmp_path, monkeypatch):
+    path = tmp_path / "features.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        db.add(user_models.UserProfile(user_id=1, monthly_income=5000, monthly_expenses=3000, salary=60000, age=35))
+        db.add(credit_models.CreditHistory(
+            user_id=1, credit_card_balance=500, credit_card_limit=5000, loan_balance=0, late_payments=0, missed_payments=0
+        ))
+        db.commit()
+
+    store = FeatureStore(str(tmp_path / "features.npz"))
+    monkeypatch.setattr(feature_store_module, "feature_store", store)
+    monkeypatch.setattr(feature_store_module, "FEATURE_STORE_ENABLED", True)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def load():
+        async with sessions() as db:
+            return (await load_users_data(db, [1, 2]))
+
+    try:
+        first = asyncio.run(load())
+        assert list(first) == [1] and first[1]['late_payments'] == 0
+        assert asyncio.run(load()) == first
+        assert store.stats()["hits"] == 1
+
+        # Another process (or a loader outside the API) updates the credit history
+        with Session(engine) as db:
+            db.execute(update(credit_models.CreditHistory).values(late_payments=3))
+            db.commit()
+        assert asyncio.run(load())[1]['late_payments'] == 3
+        assert store.stats()["stale"] == 1
+    finally:
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from backend.utils.import_time import DEFAULT_FORBIDDEN_MODULES, measure_import_time
+
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+def _imported(module: str, runs: int = 1):
+    """Best cold-import time of ``module`` over ``runs`` fresh interpreters, and the top-level packages it imported"""
+    best_ms, imported = float("inf"), set()
+    for _ in range(runs):
+        entries = measure_import_time(module)
+        total_ms = next(e["cumulative_us"] for e in reversed(entries) if e["module"] == module) / 1000
+        best_ms = min(best_ms, total_ms)
+        imported |= {e["module"].split(".")[0] for e in entries}
+    return best_ms, imported
+
+def test_scoring_model_imports_without_training_packages():
+    _, imported = _imported("backend.services.ai_models")
+    assert imported.isdisjoint(DEFAULT_FORBIDDEN_MODULES)
+
+def test_app_import_time_within_budget():
+    # The application imports its ORM models
+    pytest.importorskip("backend.models.credit_models")
+    total_ms, imported = _imported("backend.main", runs=3)
+    assert imported.isdisjoint(DEFAULT_FORBIDDEN_MODULES)
+    assert total_ms <= IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,47 @@
+import time
+
+import numpy as np
+import pytest
+
+from backend.services.inference_pool import InferencePool
+
+@pytest.fixture
+def pool(load_model):
+    ensemble_model = load_model("numpy")
+    inference_pool = InferencePool(ensemble_model._tree_ensemble_path(), workers=2, slot_rows=64, n_slots=4)
+    inference_pool.start()
+    yield inference_pool, ensemble_model._tree_ensemble
+    inference_pool.close()
+
+def _rows(n: int, n_features: int) -> np.ndarray:
+    return np.random.default_rng(0).normal(size=(n, n_features)).astype(np.float32)
+
+def test_pool_scores_match_the_ensemble(pool):
+    inference_pool, tree_ensemble = pool
+    rows = _rows(1000, inference_pool.n_features)
+    np.testing.assert_array_equal(inference_pool.predict(rows), tree_ensemble.predict(rows))
+
+def test_failed_split_leaves_no_slot_in_flight(pool):
+    inference_pool, tree_ensemble = pool
+    rows = _rows(200, inference_pool.n_features)
+
+    # The last piece cannot be copied into its slot; the pieces before it were already posted
+    ragged = np.zeros((200, inference_pool.n_features), dtype=object)
+    ragged[:] = rows
+    ragged[-1, 0] = "not a number"
+    with pytest.raises(ValueError):
+        inference_pool.predict(ragged)
+    assert inference_pool._free_slots.qsize() == inference_pool.n_slots
+    assert not inference_pool._pending
+    np.testing.assert_array_equal(inference_pool.predict(rows), tree_ensemble.predict(rows))
+
+def test_collector_survives_results_for_failed_slots(pool):
+    inference_pool, _ = pool
+    slot = inference_pool._acquire_slot()
+    inference_pool._results.put((slot, None))
+
+    deadline = time.monotonic() + 10
+    while inference_pool._free_slots.qsize() < inference_pool.n_slots and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert inference_pool._free_slots.qsize() == inference_pool.n_slots
+    assert inference_pool._collector.is_alive()
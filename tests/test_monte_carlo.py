@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import numpy as np
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from backend.schemas.credit_schemas import MonteCarloRequest
+from backend.services.ai_models import WARMUP_PROFILE, CreditScoringModel
+from backend.services.monte_carlo import run_monte_carlo
+from backend.services.scoring_workers import ScoringProcessPool
+
+CONFIG = {
+    'months': 6, 'threshold': 650, 'job_loss_probability': 0.05, 'reemployment_probability': 0.25,
+    'rate_shock_probability': 0.05, 'rate_shock_expense_increase': 0.1, 'income_volatility': 0.02,
+}
+
+def _run(credit_model, seed=None):
+    base_features = np.asarray(CreditScoringModel._prepare_features(WARMUP_PROFILE), dtype=np.float64)
+    async def collect():
+        return [snapshot async for snapshot in run_monte_carlo(credit_model, base_features, CONFIG, 500, 200, seed)]
+    return asyncio.run(collect())
+
+def test_unseeded_run_reports_a_json_safe_seed_that_reproduces_it(credit_model):
+    snapshots = _run(credit_model)
+    assert snapshots[-1]["done"] and snapshots[-1]["paths"] == 500
+    for snapshot in snapshots:
+        orjson.dumps(snapshot)
+
+    seed = snapshots[-1]["seed"]
+    assert 0 <= seed < 2 ** 53
+    assert all(snapshot["seed"] == seed for snapshot in snapshots)
+    assert _run(credit_model, seed)[-1] == snapshots[-1]
+
+def test_request_rejects_chunks_over_the_path_month_budget():
+    MonteCarloRequest(user_id=1, months=120, chunk_size=8000)
+    with pytest.raises(ValidationError):
+        MonteCarloRequest(user_id=1, months=120, chunk_size=50000)
+    MonteCarloRequest(user_id=1, seed=2 ** 53 - 1)
+    with pytest.raises(ValidationError):
+        MonteCarloRequest(user_id=1, seed=2 ** 53)
+
+def test_replacing_the_pool_lets_queued_work_finish(credit_model, load_model, models_dir, monkeypatch):
+    monkeypatch.setenv("MODELS_DIR", models_dir)
+    pool = ScoringProcessPool(1)
+    reloaded = load_model("xgboost")
+    reloaded.model_version = "2.0.0"
+    try:
+        queued = [pool.executor(credit_model).submit(time.sleep, 0.1) for _ in range(3)]
+        replacement = pool.executor(reloaded)
+        assert all(future.result(timeout=60) is None for future in queued)
+        assert replacement.submit(time.sleep, 0).result(timeout=60) is None
+    finally:
+        pool.shutdown()
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, create_engine, delete, select
+from sqlalchemy.orm import Session, declarative_base
+
+from backend.utils.pagination import encode_cursor, keyset_page_query, split_page
+
+Base = declarative_base()
+
+class Event(Base):
+    __tablename__ = "events"
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with Session(engine) as session:
+        # Pairs of rows share a timestamp so the id tie-break matters
+        session.add_all(
+            Event(id=i, owner_id=i % 2, created_at=start + timedelta(hours=i // 2)) for i in range(1, 21)
+        )
+        session.commit()
+        yield session
+
+def _page(db: Session, owner_id: int, cursor=None, limit: int = 3):
+    stmt = select(Event.id, Event.created_at).where(Event.owner_id == owner_id)
+    rows = db.execute(keyset_page_query(stmt, Event, Event.created_at, cursor, limit)).all()
+    rows, next_cursor = split_page(rows, limit, Event.created_at)
+    return [row.id for row in rows], next_cursor
+
+def _all_ids(db: Session, owner_id: int):
+    return [row.id for row in db.execute(
+        select(Event.id).where(Event.owner_id == owner_id).order_by(Event.created_at.desc(), Event.id.desc())
+    )]
+
+def test_pages_walk_the_listing_in_order(db):
+    ids, cursor = [], None
+    while True:
+        page_ids, cursor = _page(db, 0, cursor)
+        ids += page_ids
+        if cursor is None:
+            break
+    assert ids == _all_ids(db, 0)
+
+def test_deleted_anchor_still_continues_the_listing(db):
+    first, cursor = _page(db, 0)
+    db.execute(delete(Event).where(Event.id == first[-1]))
+    assert _page(db, 0, cursor)[0] == _all_ids(db, 0)[len(first) - 1:len(first) + 2]
+
+def test_cursor_from_another_listing_only_positions_by_its_own_values(db):
+    anchor = db.get(Event, 15)
+    cursor = encode_cursor(anchor.created_at, anchor.id)
+    expected = [i for i in _all_ids(db, 0) if (db.get(Event, i).created_at, i) < (anchor.created_at, anchor.id)]
+    assert _page(db, 0, cursor, limit=20)[0] == expected
+
+@pytest.mark.parametrize("cursor", ["garbage", encode_cursor("yesterday", 3), "eyJhZnRlciI6IDJ9"])
+def test_malformed_cursors_are_rejected(db, cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        _page(db, 0, cursor)
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,23 @@
+import numpy as np
+
+from backend.services.ai_models import WARMUP_PROFILE, CreditScoringModel
+from backend.services.trajectories import plan_from_changes, project_trajectories
+
+def _features(**overrides) -> np.ndarray:
+    return np.asarray(CreditScoringModel._prepare_features({**WARMUP_PROFILE, **overrides}), dtype=np.float64)
+
+def test_avoided_late_payments_carry_into_the_projection(credit_model):
+    base_features = _features(late_payments=3, credit_card_balance=1000, credit_card_limit=8000)
+    changes = [{"lever": "avoid_late_payments", "amount": 2.0, "description": "Avoid 2 of your 3 late payments"}]
+    steps = plan_from_changes(changes, months=12)
+    assert steps == [{"action": "late_payment_reduction", "amount": 2.0, "start_month": 1}]
+
+    projection = project_trajectories(credit_model, base_features, [steps, []], 12)
+    assert [state['late_payments'] for state in projection["final_states"]] == [1.0, 3.0]
+
+def test_over_limit_months_still_add_late_payments_after_a_reduction(credit_model):
+    base_features = _features(late_payments=1, credit_card_balance=9000, credit_card_limit=1000)
+    steps = [{"action": "late_payment_reduction", "amount": 5.0, "start_month": 1}]
+    projection = project_trajectories(credit_model, base_features, [steps], 3)
+    # The reduction never goes below zero; each over-limit month adds one
+    assert projection["final_states"][0]['late_payments'] == 3.0
@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+import pytest
+
+# The ingest service inserts into the application's transactions table
+pytest.importorskip("backend.models.credit_models")
+
+from fastapi import HTTPException
+
+from backend.services.transaction_ingest import _iter_lines
+
+async def _stream(chunks):
+    for chunk in chunks:
+        yield chunk
+
+def _lines(chunks, **kwargs):
+    async def collect():
+        return [line async for line in _iter_lines(_stream(chunks), **kwargs)]
+    return asyncio.run(collect())
+
+def test_lines_split_across_chunks():
+    chunks = [b"\xef\xbb\xbfa,b\r\n1,", b"2\n", b"\n3", b",4", b"\xc3", b"\xa9"]
+    assert _lines(chunks) == [(1, "a,b"), (2, "1,2"), (3, ""), (4, "3,4é")]
+
+def test_over_long_line_is_rejected():
+    with pytest.raises(HTTPException) as excinfo:
+        _lines([b"ok\n", b"x" * 6, b"x" * 6, b"\n"], max_line_length=10)
+    assert excinfo.value.status_code == 413
+    assert "Line 2" in excinfo.value.detail
+
+    with pytest.raises(HTTPException):
+        _lines([b"x" * 11 + b"\nok\n"], max_line_length=10)
+    with pytest.raises(HTTPException):
+        _lines([b"ok\n" + b"x" * 11], max_line_length=10)
+
+def test_body_without_newlines_is_linear():
+    chunks = [b"x" * 64] * 20000
+    started = time.perf_counter()
+    assert _lines(chunks, max_line_length=len(chunks) * 64) == [(1, "x" * len(chunks) * 64)]
+    assert time.perf_counter() - started < 2.0
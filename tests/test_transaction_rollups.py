@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+
+# Rollups are rebuilt from the application's transactions table
+pytest.importorskip("backend.models.credit_models")
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from backend.database import Base
+from backend.models import credit_models
+from backend.models.rollup_models import TransactionRollup
+from backend.schemas.credit_schemas import TransactionType
+from backend.services import transaction_rollups
+from backend.services.transaction_rollups import apply_rollups, rebuild_rollups
+
+def _transactions(day: int):
+    return [
+        {"user_id": 1, "amount": 100.0, "transaction_type": TransactionType.INCOME, "category": "salary",
+         "transaction_date": datetime(2024, 1, day)},
+        {"user_id": 1, "amount": 20.0, "transaction_type": TransactionType.EXPENSE, "category": "",
+         "transaction_date": datetime(2024, 1, day)},
+        {"user_id": 1, "amount": 5.0, "transaction_type": "expense", "category": None,
+         "transaction_date": datetime(2024, 2, day)},
+        {"user_id": 2, "amount": 7.5, "transaction_type": "expense", "category": "food",
+         "transaction_date": datetime(2024, 2, day)},
+    ]
+
+def _rollups(db: Session):
+    return db.execute(select(
+        TransactionRollup.user_id, TransactionRollup.month, TransactionRollup.transaction_type,
+        TransactionRollup.category, TransactionRollup.total_amount, TransactionRollup.transaction_count
+    ).order_by(TransactionRollup.user_id, TransactionRollup.month, TransactionRollup.transaction_type)).all()
+
+@pytest.mark.parametrize("upsert", ["native", "portable"])
+def test_incremental_rollups_match_a_rebuild(tmp_path, monkeypatch, upsert):
+    if upsert == "portable":
+        monkeypatch.setattr(transaction_rollups, "_upsert", lambda dialect_name, deltas: None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'rollups.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        # Two batches, so the second increments existing rollup rows
+        for day in (1, 2):
+            rows = _transactions(day)
+            db.execute(insert(credit_models.Transaction), [
+                {**row, "transaction_type": transaction_rollups._type_value(row["transaction_type"])} for row in rows
+            ])
+            apply_rollups(db, rows)
+            db.commit()
+        incremental = _rollups(db)
+
+        rebuild_rollups(db)
+        assert _rollups(db) == incremental
+    engine.dispose()
+
+    assert [tuple(row[1:]) for row in incremental if row[0] == 1] == [
+        ("2024-01", "expense", "uncategorized", 40.0, 2),
+        ("2024-01", "income", "salary", 200.0, 2),
+        ("2024-02", "expense", "uncategorized", 10.0, 2),
+    ]